@@ -3,14 +3,18 @@ The Break-down Breakdown
 A Real-Time Industry Health Dashboard for Appliance Repair Professionals
 """
 import streamlit as st
+from datetime import timedelta
 from components.gauge import render_gauge
 from components.error_codes import render_error_codes
 from components.trend_sparkline import render_sparkline
 from components.survey import render_survey_cta
 from components.appliance_icons import render_header_with_icons, render_appliance_strip
-from components.news_feed import render_news_feed
+from components.news_feed import render_news_feed, render_news_search
 from data.index_calculator import get_current_index, get_index_history
 from data.error_code_engine import get_active_error_codes
+from data.metrics_assembler import get_current_metrics
+from data.storage import refresh_data_version
+from static_export import enable_auto_export
 
 # Page config
 st.set_page_config(
@@ -24,41 +28,95 @@ st.set_page_config(
 with open("styles/main.css") as f:
     st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
 
+# Refresh the static dashboard export after reports saved by this server
+enable_auto_export()
+
 # Header with appliance icons
 render_header_with_icons()
 
-# Main layout
-col1, col2 = st.columns([2, 1])
+# News refresh interval; matches the feed cache TTL
+NEWS_REFRESH = timedelta(hours=1)
+# How often each session checks for newly saved data
+DATA_VERSION_POLL = timedelta(seconds=30)
 
-with col1:
-    # The Main Gauge
-    current_index = get_current_index()
-    render_gauge(current_index['score'], current_index['change'])
+
+# Each panel is a fragment: an interaction inside one reruns only that
+# panel, leaving the others' computations and rendered output untouched.
+
+@st.fragment(run_every=DATA_VERSION_POLL)
+def watch_data_version():
+    """
+    Rerun the dashboard when a field report or backfill changes the data,
+    whichever process or replica wrote it
+    """
+    version = refresh_data_version()
+    if st.session_state.setdefault('data_version', version) != version:
+        st.session_state['data_version'] = version
+        st.rerun()
+
+
+@st.fragment
+def gauge_panel():
+    """The main gauge and its trend sparkline"""
+    current_index = get_current_index(get_current_metrics())
+    render_gauge(current_index['score'], current_index['change'], current_index['band'])
     
     # Sparkline trend
     history = get_index_history()
     render_sparkline(history)
 
-with col2:
-    # Error Codes Panel
-    error_codes = get_active_error_codes()
+
+@st.fragment
+def diagnostics_panel():
+    """Error codes panel"""
+    error_codes = get_active_error_codes(get_current_metrics())
     render_error_codes(error_codes)
-    
-    # Survey CTA
+
+
+@st.fragment
+def survey_panel():
+    """Field report call-to-action"""
     render_survey_cta()
 
+
+@st.fragment(run_every=NEWS_REFRESH)
+def news_panel():
+    """Latest headlines, refreshed hourly"""
+    render_news_feed()
+
+
+@st.fragment
+def news_search_panel():
+    """Archive search; typing reruns only this panel"""
+    render_news_search()
+
+
+watch_data_version()
+
+# Main layout
+col1, col2 = st.columns([2, 1])
+
+with col1:
+    gauge_panel()
+
+with col2:
+    diagnostics_panel()
+    survey_panel()
+
 # Appliance strip divider
 st.markdown("<div style='margin: 2rem 0;'></div>", unsafe_allow_html=True)
 render_appliance_strip()
 
 # News Feed Section
 st.markdown("<div style='margin: 2rem 0;'></div>", unsafe_allow_html=True)
-render_news_feed()
+news_panel()
+news_search_panel()
 
-# Footer
-st.markdown("""
+# Footer (memoized per data version, so this is not a second fetch)
+metrics = get_current_metrics()
+st.markdown(f"""
 <div class="footer">
-    <p>Based on data from <strong>147</strong> field reports this month</p>
+    <p>Based on data from <strong>{metrics['report_count']}</strong> field reports this month</p>
     <p class="last-updated">Last updated: December 18, 2025</p>
 </div>
 """, unsafe_allow_html=True)
@@ -78,12 +78,17 @@ APPLIANCES = {
 
 def render_appliance_strip():
     """Render a decorative strip of appliance icons"""
+    st.markdown(appliance_strip_html(), unsafe_allow_html=True)
+
+
+def appliance_strip_html() -> str:
+    """Markup for the decorative appliance strip"""
     icons_html = ''.join([APPLIANCES[a] for a in ['washer', 'dryer', 'fridge', 'dishwasher', 'oven', 'microwave']])
-    st.markdown(f'''
+    return f'''
     <div class="appliance-strip">
         {icons_html}
     </div>
-    ''', unsafe_allow_html=True)
+    '''
 
 
 def render_appliance_icon(appliance: str, size: int = 48):
@@ -98,10 +103,15 @@ def render_appliance_icon(appliance: str, size: int = 48):
 
 def render_header_with_icons():
     """Render the header with appliance icons flanking the title"""
+    st.markdown(header_with_icons_html(), unsafe_allow_html=True)
+
+
+def header_with_icons_html() -> str:
+    """Markup for the header with appliance icons flanking the title"""
     icons_left = APPLIANCES['washer'] + APPLIANCES['fridge'] + APPLIANCES['oven']
     icons_right = APPLIANCES['dryer'] + APPLIANCES['dishwasher'] + APPLIANCES['microwave']
     
-    st.markdown(f'''
+    return f'''
     <div class="header-with-icons">
         <div class="header-icons left">{icons_left}</div>
         <div class="header-content">
@@ -110,5 +120,5 @@ def render_header_with_icons():
         </div>
         <div class="header-icons right">{icons_right}</div>
     </div>
-    ''', unsafe_allow_html=True)
+    '''
 
@@ -3,6 +3,7 @@ Error Codes Panel Component
 Displays current "diagnostic codes" affecting the industry
 """
 import streamlit as st
+from html import escape
 from typing import List, Dict
 
 
@@ -23,20 +24,25 @@ def render_error_codes(codes: List[Dict]):
     """, unsafe_allow_html=True)
     
     for code in codes:
-        icon = "⚠️" if code['severity'] == "warning" else "✓"
-        icon_class = code['severity']
-        
-        st.markdown(f"""
-        <div class="error-code">
-            <span class="error-code-icon {icon_class}">{icon}</span>
-            <span class="error-code-id">{code['code']}:</span>
-            <span class="error-code-desc">{code['name']}</span>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(error_code_html(code), unsafe_allow_html=True)
     
     st.markdown("</div>", unsafe_allow_html=True)
 
 
+def error_code_html(code: Dict) -> str:
+    """Markup for one error code row"""
+    icon = "⚠️" if code['severity'] == "warning" else "✓"
+    icon_class = code['severity']
+    
+    return f"""
+    <div class="error-code">
+        <span class="error-code-icon {icon_class}">{icon}</span>
+        <span class="error-code-id">{escape(code['code'])}:</span>
+        <span class="error-code-desc">{escape(code['name'])}</span>
+    </div>
+    """
+
+
 def render_error_code_detail(code: Dict):
     """
     Render expanded detail for a single error code
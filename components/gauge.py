@@ -3,7 +3,12 @@ The Breakdown Index Gauge Component
 A vintage-style dial displaying the composite industry health score
 """
 import streamlit as st
-import plotly.graph_objects as go
+from typing import Dict, Optional
+
+
+# 'svg' draws the dial as inline SVG; 'plotly' uses an interactive
+# Plotly indicator (and loads plotly.js in the browser)
+RENDER_MODE = 'svg'
 
 
 def get_zone_info(score: float) -> dict:
@@ -20,16 +25,36 @@ def get_zone_info(score: float) -> dict:
         return {"name": "Total Breakdown", "color": "#B7410E", "class": "breakdown"}
 
 
-def render_gauge(score: float, change: float = 0):
+def render_gauge(
+    score: float,
+    change: float = 0,
+    band: Optional[Dict] = None,
+    mode: str = RENDER_MODE
+):
     """
     Render the main Breakdown Index gauge
     
     Args:
         score: Current index score (0-100)
         change: Change from last month (positive or negative)
+        band: Optional confidence band from get_index_band
+        mode: 'svg' or 'plotly'
     """
     zone = get_zone_info(score)
     
+    if mode == 'svg':
+        from components.svg_charts import gauge_svg
+        st.markdown(f'<div class="gauge-svg">{gauge_svg(score)}</div>', unsafe_allow_html=True)
+    else:
+        _render_plotly_gauge(score)
+    
+    render_score_display(zone, change, band)
+
+
+def _render_plotly_gauge(score: float):
+    """Render the dial as a Plotly indicator"""
+    import plotly.graph_objects as go
+    
     # Create the gauge using Plotly
     fig = go.Figure(go.Indicator(
         mode="gauge+number",
@@ -78,18 +103,34 @@ def render_gauge(score: float, change: float = 0):
     
     # Render the gauge
     st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
-    
-    # Zone label and change indicator
+
+
+def render_score_display(zone: Dict, change: float, band: Optional[Dict]):
+    """Render the zone label, change indicator and confidence band"""
+    st.markdown(score_display_html(zone, change, band), unsafe_allow_html=True)
+
+
+def score_display_html(zone: Dict, change: float, band: Optional[Dict]) -> str:
+    """Markup for the zone label, change indicator and confidence band"""
     change_class = "up" if change >= 0 else "down"
     change_symbol = "↑" if change >= 0 else "↓"
     change_text = f"{change_symbol} {abs(change):.1f} from last month"
     
-    st.markdown(f"""
+    band_html = ""
+    if band:
+        band_html = (
+            f'<div class="score-band">{band["confidence"]:.0%} range: '
+            f'{band["score_low"]:.1f}–{band["score_high"]:.1f} · '
+            f'change {band["change_low"]:+.1f} to {band["change_high"]:+.1f}</div>'
+        )
+    
+    return f"""
     <div class="score-display">
         <div class="score-label">
             <span class="zone-label {zone['class']}">{zone['name']}</span>
         </div>
         <div class="score-change {change_class}">{change_text}</div>
+        {band_html}
     </div>
-    """, unsafe_allow_html=True)
+    """
 
@@ -0,0 +1,76 @@
+"""
+History Chart Component
+Full-history indicator charts, downsampled server-side and drawn with WebGL
+"""
+import streamlit as st
+import plotly.graph_objects as go
+from datetime import date
+from typing import Optional
+
+from data.downsample import CHART_WIDTH_PX, downsample_history
+from data.indicator_adapters import to_model_units
+
+
+# Range label -> years shown (None for the full history)
+HISTORY_RANGES = {
+    '1Y': 1,
+    '5Y': 5,
+    '10Y': 10,
+    'Max': None,
+}
+
+
+def _range_start(years: Optional[int]) -> Optional[str]:
+    if years is None:
+        return None
+    today = date.today()
+    return today.replace(year=today.year - years, day=min(today.day, 28)).isoformat()
+
+
+def render_history_chart(name: str, series_id: str, label: str, key: str):
+    """
+    Render an indicator's history with a range selector.
+
+    Changing the range reruns only this chart and re-downsamples the raw
+    observations for the new window, so zooming in reveals real detail
+    while every view stays within the point budget.
+
+    Args:
+        name: Indicator name (for unit conversion)
+        series_id: FRED series identifier
+        label: Axis title
+        key: Unique widget key
+    """
+    years = HISTORY_RANGES[st.radio(
+        "Range",
+        options=list(HISTORY_RANGES),
+        index=len(HISTORY_RANGES) - 1,
+        horizontal=True,
+        label_visibility="collapsed",
+        key=f"{key}_range",
+    )]
+
+    history = downsample_history(series_id, start=_range_start(years), points=CHART_WIDTH_PX)
+    if not history['dates']:
+        st.caption("No history available yet.")
+        return
+
+    values = to_model_units(name, history['values']).tolist()
+
+    fig = go.Figure(go.Scattergl(
+        x=history['dates'],
+        y=values,
+        mode='lines',
+        line=dict(color='#8B0000', width=1.5),
+        hovertemplate='%{x|%b %d, %Y}<br>%{y:.2f}<extra></extra>'
+    ))
+    fig.update_layout(
+        height=250,
+        margin=dict(l=20, r=20, t=20, b=40),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        yaxis=dict(title=label),
+        xaxis=dict(showgrid=False),
+    )
+    st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+    st.caption(f"{len(values):,} of {history['total']:,} observations shown")
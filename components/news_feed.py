@@ -3,11 +3,17 @@ News Feed Component
 Industry news from RSS feeds
 """
 import streamlit as st
+import html
 from typing import List, Dict
 from datetime import datetime
-import feedparser
 import requests
-from urllib.parse import quote
+from urllib.parse import quote, urlparse
+
+from data.async_client import load_inputs
+from data.circuit_breaker import CircuitOpenError, get_breaker
+from data.feed_reader import FEED_TTL, fetch_feed_entries
+from data.news_archive import archive_in_background, get_news_archive
+from data.singleflight import get_singleflight
 
 # RSS Feed sources for appliance repair industry
 RSS_FEEDS = [
@@ -37,6 +43,17 @@ GOOGLE_NEWS_TOPICS = [
     ('right to repair appliance', '⚖️'),
     ('appliance technician shortage', '👷'),
 ]
+# Archive category for Google News items
+GOOGLE_NEWS_CATEGORY = 'news'
+
+NEWS_HEADER_HTML = '''
+<div class="news-section">
+    <div class="news-header">
+        <h2 class="news-title">📰 Industry Wire</h2>
+        <span class="news-subtitle">Live headlines from the appliance repair world</span>
+    </div>
+</div>
+'''
 
 
 def get_google_news_rss(query: str) -> str:
@@ -45,52 +62,101 @@ def get_google_news_rss(query: str) -> str:
     return f"https://news.google.com/rss/search?q={encoded_query}&hl=en-US&gl=US&ceid=US:en"
 
 
-@st.cache_data(ttl=3600)  # Cache for 1 hour
+def _feed_entries(url: str) -> List[Dict]:
+    """Fetch a feed's entries, falling back to the last good ones"""
+    key = f"rss:{url}"
+    flight = get_singleflight()
+    breaker = get_breaker(url)
+    try:
+        # Sessions and processes missing the cache together share one
+        # fetch, which the breaker judges once; an unhealthy feed host
+        # fails immediately
+        entries = flight.do(
+            key,
+            lambda: breaker.call(lambda: fetch_feed_entries(url)),
+        )
+    except Exception as e:
+        if not isinstance(e, CircuitOpenError):
+            print(f"Error fetching {url}: {e}")
+        # Serve the last good entries any process fetched
+        entries = flight.last_result(key) or []
+    
+    return entries
+
+
+@st.cache_data(ttl=FEED_TTL)
 def fetch_rss_feed(url: str, source_name: str, icon: str) -> List[Dict]:
     """Fetch and parse an RSS feed"""
-    try:
-        feed = feedparser.parse(url)
-        items = []
-        
-        for entry in feed.entries[:3]:  # Get top 3 from each source
-            # Parse date
-            if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                date = datetime(*entry.published_parsed[:6])
-                date_str = date.strftime('%b %d')
-            else:
-                date_str = 'Recent'
-            
-            items.append({
-                'title': entry.title[:80] + '...' if len(entry.title) > 80 else entry.title,
-                'url': entry.link,
-                'source': source_name,
-                'date': date_str,
-                'icon': icon
-            })
+    return _to_news_items(_feed_entries(url), source_name, icon)
+
+
+def _to_news_items(entries: List[Dict], source_name: str, icon: str) -> List[Dict]:
+    """Turn feed entries into news card items"""
+    items = []
+    
+    for entry in entries:
+        # Parse date
+        if entry['published']:
+            date = datetime.fromisoformat(entry['published'])
+            date_str = date.strftime('%b %d')
+        else:
+            date_str = 'Recent'
         
-        return items
-    except Exception as e:
-        print(f"Error fetching {url}: {e}")
-        return []
+        title = entry['title']
+        items.append({
+            'title': title[:80] + '...' if len(title) > 80 else title,
+            'url': entry['link'],
+            'source': source_name,
+            'date': date_str,
+            'icon': icon
+        })
+    
+    return items
 
 
-@st.cache_data(ttl=3600)
+@st.cache_data(ttl=FEED_TTL)
 def get_news_items() -> List[Dict]:
     """
     Get news items from multiple RSS feeds
     """
-    all_items = []
+    # (url, source, icon, category, item limit): configured RSS feeds, then
+    # Google News for industry topics
+    sources = [
+        (feed['url'], feed['name'], feed['icon'], feed['category'], None)
+        for feed in RSS_FEEDS
+    ]
+    sources += [
+        (get_google_news_rss(topic), 'Industry News', icon, GOOGLE_NEWS_CATEGORY, 2)  # Limit Google News items
+        for topic, icon in GOOGLE_NEWS_TOPICS
+    ]
+    urls = [url for url, _, _, _, _ in sources]
     
-    # Fetch from configured RSS feeds
-    for feed in RSS_FEEDS:
-        items = fetch_rss_feed(feed['url'], feed['name'], feed['icon'])
-        all_items.extend(items)
+    # Fetch every feed concurrently in one pass
+    try:
+        feeds = load_inputs(feeds=urls)['feeds']
+    except Exception as e:
+        print(f"Error loading feeds asynchronously: {e}")
+        feeds = {url: _feed_entries(url) for url in urls}
     
-    # Fetch from Google News for industry topics
-    for topic, icon in GOOGLE_NEWS_TOPICS:
-        url = get_google_news_rss(topic)
-        items = fetch_rss_feed(url, 'Industry News', icon)
-        all_items.extend(items[:2])  # Limit Google News items
+    all_items = []
+    archive_items = []
+    for url, source_name, icon, category, limit in sources:
+        entries = feeds.get(url, [])
+        all_items.extend(_to_news_items(entries, source_name, icon)[:limit])
+        archive_items.extend(
+            {
+                'title': entry['title'],
+                'summary': entry.get('summary'),
+                'url': entry['link'],
+                'source': source_name,
+                'category': category,
+                'published': entry['published'],
+            }
+            for entry in entries
+        )
+    
+    # Archive every headline for search, off the render path
+    archive_in_background(archive_items)
     
     # If no items fetched, return fallback
     if not all_items:
@@ -139,36 +205,83 @@ def render_news_feed():
     """Render the industry news feed section"""
     news_items = get_news_items()
     
-    st.markdown('''
-    <div class="news-section">
-        <div class="news-header">
-            <h2 class="news-title">📰 Industry Wire</h2>
-            <span class="news-subtitle">Live headlines from the appliance repair world</span>
-        </div>
-    </div>
-    ''', unsafe_allow_html=True)
+    st.markdown(NEWS_HEADER_HTML, unsafe_allow_html=True)
     
     # News grid
     cols = st.columns(len(news_items))
     
     for i, item in enumerate(news_items):
         with cols[i]:
-            st.markdown(f'''
-            <a href="{item['url']}" target="_blank" class="news-card-link">
-                <div class="news-card">
-                    <div class="news-icon">{item['icon']}</div>
-                    <div class="news-date">{item['date']}</div>
-                    <div class="news-card-title">{item['title']}</div>
-                    <div class="news-source">{item['source']}</div>
-                </div>
-            </a>
-            ''', unsafe_allow_html=True)
+            st.markdown(news_card_html(item), unsafe_allow_html=True)
+
+
+def _safe_url(url: str) -> str:
+    """Escaped link target, or '#' for anything but an http(s) URL"""
+    if urlparse(url or '').scheme.lower() not in ('http', 'https'):
+        return '#'
+    return html.escape(url, quote=True)
+
+
+def news_card_html(item: Dict) -> str:
+    """Markup for one headline card; feed fields are escaped"""
+    return f'''
+    <a href="{_safe_url(item['url'])}" target="_blank" rel="noopener noreferrer" class="news-card-link">
+        <div class="news-card">
+            <div class="news-icon">{html.escape(item['icon'])}</div>
+            <div class="news-date">{html.escape(item['date'])}</div>
+            <div class="news-card-title">{html.escape(item['title'])}</div>
+            <div class="news-source">{html.escape(item['source'])}</div>
+        </div>
+    </a>
+    '''
+
+
+def render_news_search():
+    """Render a search box over every archived headline"""
+    archive = get_news_archive()
+    facets = archive.facets()
+    
+    query_col, category_col, source_col = st.columns([3, 1, 1])
+    with query_col:
+        query = st.text_input(
+            "Search the news archive",
+            placeholder="e.g. right to repair",
+            key="news_search_query",
+        )
+    with category_col:
+        category = st.selectbox("Category", ['All'] + facets['category'], key="news_search_category")
+    with source_col:
+        source = st.selectbox("Source", ['All'] + facets['source'], key="news_search_source")
+    
+    if not query and category == 'All' and source == 'All':
+        return
+    
+    results = archive.search(
+        query,
+        category=None if category == 'All' else category,
+        source=None if source == 'All' else source,
+        limit=10,
+    )
+    if not results:
+        st.caption(f"No archived stories match among {len(archive):,} headlines.")
+        return
+    
+    rows = []
+    for item in results:
+        date_str = item['published'][:10] if item.get('published') else ''
+        rows.append(f'''
+        <div class="news-search-result">
+            <a href="{_safe_url(item['url'])}" target="_blank" rel="noopener noreferrer">{html.escape(item['title'])}</a>
+            <div class="news-search-meta">{html.escape(item['source'])} · {html.escape(item['category'])} · {html.escape(date_str)}</div>
+        </div>
+        ''')
+    st.markdown(''.join(rows), unsafe_allow_html=True)
 
 
 def render_news_ticker():
     """Render a scrolling news ticker"""
     news_items = get_news_items()
-    ticker_items = ' • '.join([f"{n['icon']} {n['title']}" for n in news_items])
+    ticker_items = ' • '.join([html.escape(f"{n['icon']} {n['title']}") for n in news_items])
     
     st.markdown(f'''
     <div class="news-ticker-container">
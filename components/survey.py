@@ -3,22 +3,28 @@ Survey/Field Report Components
 CTA button and embedded survey form
 """
 import streamlit as st
+from html import escape
 
 
 def render_survey_cta():
     """Render the call-to-action to submit a field report"""
-    st.markdown("""
-    <div class="survey-cta" onclick="window.location.href='Survey'">
-        <h3>📋 Submit Your Field Report</h3>
-        <p>Takes 60 seconds. Help track the real state of the industry.</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(survey_cta_html(), unsafe_allow_html=True)
     
     # Streamlit button fallback for navigation
     if st.button("Submit Field Report →", key="survey_cta_btn", use_container_width=True):
         st.switch_page("pages/1_Survey.py")
 
 
+def survey_cta_html(survey_url: str = 'Survey') -> str:
+    """Markup for the field report call-to-action card"""
+    return f"""
+    <div class="survey-cta" onclick="window.location.href='{escape(survey_url, quote=True)}'">
+        <h3>📋 Submit Your Field Report</h3>
+        <p>Takes 60 seconds. Help track the real state of the industry.</p>
+    </div>
+    """
+
+
 def render_survey_stats(total_reports: int, this_month: int):
     """Show survey participation stats"""
     st.markdown(f"""
@@ -0,0 +1,156 @@
+"""
+SVG Chart Rendering
+Pure-Python inline SVG for the gauge and sparkline, styled to match the
+Plotly versions without shipping plotly.js to the browser
+"""
+import math
+from html import escape
+from typing import Dict, List
+
+from components.gauge import get_zone_info
+from data.cache import LRUCache
+
+
+# Theme colors from main.css
+ALMOST_BLACK = '#2D2D2D'
+INDUSTRIAL_GRAY = '#4A4A4A'
+OFF_WHITE = '#F5F2EB'
+NEEDLE_RED = '#8B0000'
+
+# Dial geometry in viewBox units: a half circle from 0 (left) to 100 (right)
+GAUGE_WIDTH = 300
+GAUGE_HEIGHT = 215
+GAUGE_CX = 150
+GAUGE_CY = 150
+GAUGE_OUTER = 130
+GAUGE_INNER = 92
+
+# Zone band edges; colors come from get_zone_info
+GAUGE_BANDS = [0, 20, 40, 60, 80, 100]
+
+SPARKLINE_WIDTH = 600
+SPARKLINE_HEIGHT = 90
+SPARKLINE_TOP = 8
+SPARKLINE_BOTTOM = 68
+
+# Rendered SVG by score / by history points
+_gauge_cache = LRUCache(maxsize=128)
+_sparkline_cache = LRUCache(maxsize=32)
+
+
+def _point(value: float, radius: float) -> tuple:
+    """Dial coordinates of a score at a radius"""
+    angle = math.pi * (1 - max(0.0, min(100.0, value)) / 100)
+    return GAUGE_CX + radius * math.cos(angle), GAUGE_CY - radius * math.sin(angle)
+
+
+def _band_path(low: float, high: float) -> str:
+    """Annular sector between two scores"""
+    x1, y1 = _point(low, GAUGE_OUTER)
+    x2, y2 = _point(high, GAUGE_OUTER)
+    x3, y3 = _point(high, GAUGE_INNER)
+    x4, y4 = _point(low, GAUGE_INNER)
+    return (
+        f'M{x1:.1f},{y1:.1f} A{GAUGE_OUTER},{GAUGE_OUTER} 0 0 1 {x2:.1f},{y2:.1f} '
+        f'L{x3:.1f},{y3:.1f} A{GAUGE_INNER},{GAUGE_INNER} 0 0 0 {x4:.1f},{y4:.1f} Z'
+    )
+
+
+def _gauge_svg(score: float) -> str:
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {GAUGE_WIDTH} {GAUGE_HEIGHT}" '
+        f'width="100%" role="img" aria-label="Breakdown Index {score:.1f}">',
+        # Dial face and rim
+        f'<path d="{_band_path(0, 100)}" fill="{OFF_WHITE}" stroke="{INDUSTRIAL_GRAY}" stroke-width="3"/>',
+    ]
+    for low, high in zip(GAUGE_BANDS, GAUGE_BANDS[1:]):
+        zone = get_zone_info(low)
+        parts.append(f'<path d="{_band_path(low, high)}" fill="{zone["color"]}"><title>{zone["name"]}</title></path>')
+
+    for tick in GAUGE_BANDS:
+        x1, y1 = _point(tick, GAUGE_OUTER)
+        x2, y2 = _point(tick, GAUGE_OUTER + 6)
+        lx, ly = _point(tick, GAUGE_OUTER + 14)
+        parts.append(
+            f'<line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}" stroke="{INDUSTRIAL_GRAY}" stroke-width="2"/>'
+            f'<text x="{lx:.1f}" y="{ly + 4:.1f}" text-anchor="middle" font-family="Barlow Condensed, sans-serif" '
+            f'font-size="14" fill="{INDUSTRIAL_GRAY}">{tick}</text>'
+        )
+
+    nx, ny = _point(score, GAUGE_OUTER - 8)
+    parts += [
+        f'<line x1="{GAUGE_CX}" y1="{GAUGE_CY}" x2="{nx:.1f}" y2="{ny:.1f}" stroke="{NEEDLE_RED}" '
+        f'stroke-width="6" stroke-linecap="round"/>',
+        f'<circle cx="{GAUGE_CX}" cy="{GAUGE_CY}" r="10" fill="{NEEDLE_RED}" stroke="{INDUSTRIAL_GRAY}" stroke-width="2"/>',
+        f'<text x="{GAUGE_CX}" y="{GAUGE_HEIGHT - 8}" text-anchor="middle" font-family="IBM Plex Mono, monospace" '
+        f'font-size="48" fill="{ALMOST_BLACK}">{score:.1f}</text>',
+        '</svg>',
+    ]
+    return ''.join(parts)
+
+
+def gauge_svg(score: float) -> str:
+    """
+    Inline SVG for the main dial.
+
+    Args:
+        score: Index score (0-100)
+
+    Returns:
+        A self-contained <svg> element, cached per score
+    """
+    score = round(float(score), 1)
+    return _gauge_cache.get_or_compute(score, lambda: _gauge_svg(score))
+
+
+def _sparkline_svg(points: tuple) -> str:
+    months = [month for month, _ in points]
+    scores = [score for _, score in points]
+
+    if len(scores) >= 2:
+        color = "#6B8E23" if scores[-1] >= scores[-2] else "#B7410E"
+    else:
+        color = INDUSTRIAL_GRAY
+
+    step = SPARKLINE_WIDTH / max(len(scores), 1)
+    xs = [step * (i + 0.5) for i in range(len(scores))]
+    ys = [
+        SPARKLINE_BOTTOM - (SPARKLINE_BOTTOM - SPARKLINE_TOP) * max(0.0, min(100.0, s)) / 100
+        for s in scores
+    ]
+    line = ' '.join(f'{x:.1f},{y:.1f}' for x, y in zip(xs, ys))
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {SPARKLINE_WIDTH} {SPARKLINE_HEIGHT}" '
+        f'width="100%" role="img" aria-label="Index trend">',
+        # Area fill down to zero, then the line
+        f'<polygon points="{xs[0]:.1f},{SPARKLINE_BOTTOM} {line} {xs[-1]:.1f},{SPARKLINE_BOTTOM}" '
+        f'fill="{color}" fill-opacity="0.1"/>',
+        f'<polyline points="{line}" fill="none" stroke="{color}" stroke-width="2" stroke-linejoin="round"/>',
+        f'<circle cx="{xs[-1]:.1f}" cy="{ys[-1]:.1f}" r="5" fill="{color}"/>',
+    ]
+    for month, score, x, y in zip(months, scores, xs, ys):
+        label = escape(str(month))
+        parts.append(
+            f'<circle cx="{x:.1f}" cy="{y:.1f}" r="8" fill="transparent"><title>{label}: {score:.1f}</title></circle>'
+            f'<text x="{x:.1f}" y="{SPARKLINE_HEIGHT - 6}" text-anchor="middle" font-family="IBM Plex Mono, monospace" '
+            f'font-size="10" fill="{INDUSTRIAL_GRAY}">{label}</text>'
+        )
+    parts.append('</svg>')
+    return ''.join(parts)
+
+
+def sparkline_svg(history: List[Dict]) -> str:
+    """
+    Inline SVG for the index trend line.
+
+    Args:
+        history: List of dicts with 'month' and 'score' keys
+
+    Returns:
+        A self-contained <svg> element, cached per history
+    """
+    if not history:
+        return ''
+    points = tuple((h['month'], round(float(h['score']), 1)) for h in history)
+    return _sparkline_cache.get_or_compute(points, lambda: _sparkline_svg(points))
@@ -3,20 +3,32 @@ Trend Sparkline Component
 Shows 12-month index history as a compact line chart
 """
 import streamlit as st
-import plotly.graph_objects as go
 from typing import List, Dict
 
 
-def render_sparkline(history: List[Dict]):
+# 'svg' draws the line as inline SVG; 'plotly' uses an interactive Plotly
+# chart (and loads plotly.js in the browser)
+RENDER_MODE = 'svg'
+
+
+def render_sparkline(history: List[Dict], mode: str = RENDER_MODE):
     """
     Render a sparkline showing index trend over time
     
     Args:
         history: List of dicts with 'month' and 'score' keys
+        mode: 'svg' or 'plotly'
     """
     if not history:
         return
     
+    if mode == 'svg':
+        from components.svg_charts import sparkline_svg
+        st.markdown(f'<div class="sparkline-container">{sparkline_svg(history)}</div>', unsafe_allow_html=True)
+        return
+    
+    import plotly.graph_objects as go
+    
     months = [h['month'] for h in history]
     scores = [h['score'] for h in history]
     
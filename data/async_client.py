@@ -0,0 +1,316 @@
+"""
+Async Data Layer
+asyncio-native FRED, feed and storage access sharing one HTTP connection
+pool, plus a sync facade so Streamlit code can gather every input it needs
+in a single event-loop pass
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from data.circuit_breaker import CircuitOpenError, get_breaker
+from data.feed_reader import (
+    CHUNK_SIZE,
+    FEED_ENTRY_LIMIT,
+    FEED_HEADERS,
+    FEED_TIMEOUT,
+    StreamingFeedReader,
+)
+from data.fred_client import FREDClient, _is_fred_failure, get_fred_client
+from data.rate_limiter import (
+    INTERACTIVE,
+    MAX_INTERACTIVE_WAIT,
+    THROTTLED_BACKOFF,
+    get_fred_bucket,
+)
+from data.singleflight import get_singleflight
+from data.storage import get_storage
+
+
+HTTP_TIMEOUT = 10
+# One pool serves every FRED and feed request in a pass
+MAX_CONNECTIONS = 20
+
+LATEST_TTL = timedelta(hours=24)
+
+
+def _http_client():
+    import httpx
+
+    return httpx.AsyncClient(
+        timeout=HTTP_TIMEOUT,
+        limits=httpx.Limits(max_connections=MAX_CONNECTIONS),
+        headers=FEED_HEADERS,
+        follow_redirects=True,
+    )
+
+
+class _Coalescer:
+    """Shares one task between concurrent awaits of the same key"""
+
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(factory())
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        return await task
+
+
+class AsyncFREDClient:
+    """
+    Async counterpart of FREDClient.
+
+    Shares the sync client's API key, value cache, breaker, rate limit
+    bucket and fallbacks, so both paths see the same state.
+    """
+
+    def __init__(self, http, client: Optional[FREDClient] = None):
+        self.http = http
+        self.sync = client or get_fred_client()
+        self.base_url = self.sync.base_url
+        self._coalescer = _Coalescer()
+
+    async def _request(self, params: Dict, timeout: int = 10, lane: str = INTERACTIVE) -> Dict:
+        """Query series/observations within the shared rate limit (see FREDClient._request)"""
+        bucket = get_fred_bucket(self.sync.api_key)
+        wait = MAX_INTERACTIVE_WAIT if lane == INTERACTIVE else None
+        url = f"{self.base_url}/series/observations"
+        params = dict(params, api_key=self.sync.api_key, file_type='json')
+
+        for attempt in range(2):
+            await bucket.acquire_async(lane, timeout=wait)
+            response = await self.http.get(url, params=params, timeout=timeout)
+            if response.status_code == 429 and attempt == 0:
+                retry_after = response.headers.get('Retry-After', '')
+                await asyncio.to_thread(
+                    bucket.throttle, float(retry_after) if retry_after.isdigit() else THROTTLED_BACKOFF
+                )
+                continue
+            response.raise_for_status()
+            return response.json()
+
+    async def _fetch_latest(self, series_id: str) -> Optional[float]:
+        data = await self._request({'series_id': series_id, 'sort_order': 'desc', 'limit': 1})
+        if data.get('observations'):
+            return float(data['observations'][0]['value'])
+        return None
+
+    async def get_series_latest(self, series_id: str) -> Optional[float]:
+        """
+        Get the latest value for a FRED series.
+
+        Args:
+            series_id: FRED series identifier
+
+        Returns:
+            Latest value, the last good value if FRED is unavailable, or mock
+            data as a last resort
+        """
+        entry = self.sync._cache.get(series_id)
+        if entry is not None and datetime.now() < entry[1]:
+            return entry[0]
+
+        if not self.sync.api_key:
+            return self.sync._get_mock_value(series_id)
+
+        # Same flight and key as the sync client, so sync and async misses
+        # across threads and processes share one request
+        key = f"fred:{series_id}"
+        flight = get_singleflight()
+        breaker = get_breaker(self.base_url)
+        try:
+            value = await flight.do_async(
+                key,
+                lambda: breaker.call_async(lambda: self._fetch_latest(series_id), is_failure=_is_fred_failure),
+            )
+        except CircuitOpenError:
+            value = None
+        except Exception as e:
+            print(f"Error fetching FRED series {series_id}: {e}")
+            value = None
+
+        if value is not None:
+            self.sync._cache.set(series_id, (value, datetime.now() + LATEST_TTL))
+            return value
+
+        if entry is not None:
+            return entry[0]
+        stale = flight.last_result(key)
+        return stale if stale is not None else self.sync._get_mock_value(series_id)
+
+    async def get_series_history(
+        self,
+        series_id: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        use_store: bool = True,
+        lane: str = INTERACTIVE
+    ) -> List[Dict]:
+        """
+        Get historical values for a FRED series (see FREDClient.get_series_history).
+
+        Returns:
+            List of dicts with 'date' and 'value' keys
+        """
+        if use_store:
+            stored = self.sync._get_stored_history(series_id, start_date, end_date)
+            if stored is not None:
+                return stored
+
+        if not self.sync.api_key:
+            return []
+
+        params = {'series_id': series_id}
+        if start_date:
+            params['observation_start'] = start_date
+        if end_date:
+            params['observation_end'] = end_date
+
+        try:
+            data = await self._coalescer.do(
+                f"history:{series_id}:{start_date}:{end_date}",
+                lambda: get_breaker(self.base_url).call_async(
+                    lambda: self._request(params, lane=lane), is_failure=_is_fred_failure
+                ),
+            )
+            return [
+                {'date': obs['date'], 'value': float(obs['value'])}
+                for obs in data.get('observations', [])
+                if obs['value'] != '.'
+            ]
+        except CircuitOpenError:
+            pass
+        except Exception as e:
+            print(f"Error fetching FRED history {series_id}: {e}")
+
+        stored = self.sync._get_stored_history(series_id, start_date, end_date, allow_stale=True)
+        return stored or []
+
+
+async def fetch_feed(http, url: str, limit: int = FEED_ENTRY_LIMIT) -> List[Dict]:
+    """
+    Fetch a feed's entries asynchronously.
+
+    Concurrent fetches of a feed share one download across threads and
+    processes; while the host's breaker is open or on error, the last good
+    entries are served.
+
+    Returns:
+        List of dicts with 'title', 'link' and 'published'
+    """
+    key = f"rss:{url}"
+    flight = get_singleflight()
+    breaker = get_breaker(url)
+
+    async def download() -> List[Dict]:
+        # Parse as the body streams in and stop reading once enough entries
+        # are in hand
+        reader = StreamingFeedReader(limit)
+        async with http.stream('GET', url, timeout=FEED_TIMEOUT) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                if reader.feed(chunk):
+                    break
+        if reader.malformed:
+            return await asyncio.to_thread(reader.result)
+        return reader.result()
+
+    try:
+        return await flight.do_async(key, lambda: breaker.call_async(download))
+    except CircuitOpenError:
+        pass
+    except Exception as e:
+        print(f"Error fetching {url}: {e}")
+    return flight.last_result(key) or []
+
+
+class AsyncStorage:
+    """
+    Async facade over the configured storage backend.
+
+    Calls run in worker threads, so they overlap with network I/O without
+    a second implementation of each backend.
+    """
+
+    def __init__(self, storage=None):
+        self._storage = storage or get_storage()
+
+    async def save_field_report(self, report: Dict) -> bool:
+        return await asyncio.to_thread(self._storage.save_field_report, report)
+
+    async def get_field_reports(self, month: Optional[str] = None, region: Optional[str] = None) -> List[Dict]:
+        return await asyncio.to_thread(self._storage.get_field_reports, month, region)
+
+    async def get_report_count(self, month: Optional[str] = None, region: Optional[str] = None) -> int:
+        return await asyncio.to_thread(self._storage.get_report_count, month, region)
+
+    async def get_aggregated_metrics(self, month: Optional[str] = None, region: Optional[str] = None) -> Dict:
+        return await asyncio.to_thread(self._storage.get_aggregated_metrics, month, region)
+
+    async def get_index_snapshots(self) -> List[Dict]:
+        return await asyncio.to_thread(self._storage.get_index_snapshots)
+
+
+async def gather_inputs(
+    histories: Optional[Dict[str, str]] = None,
+    history_start: Optional[str] = None,
+    latest: Sequence[str] = (),
+    field_month: Optional[str] = None,
+    feeds: Sequence[str] = ()
+) -> Dict:
+    """
+    Fetch every requested input concurrently over one connection pool.
+
+    Args:
+        histories: Name -> FRED series ID to fetch history for
+        history_start: First history date (YYYY-MM-DD)
+        latest: FRED series IDs to fetch latest values for
+        field_month: Month to aggregate field reports for; omitted to skip
+        feeds: Feed URLs to fetch
+
+    Returns:
+        Dict with 'histories' (name -> raw observations), 'latest'
+        (series ID -> value), 'field' (aggregates or None) and 'feeds'
+        (URL -> entries)
+    """
+    histories = histories or {}
+    async with _http_client() as http:
+        fred = AsyncFREDClient(http)
+        storage = AsyncStorage()
+
+        async def field():
+            return await storage.get_aggregated_metrics(field_month) if field_month else None
+
+        history_results, latest_results, field_metrics, feed_results = await asyncio.gather(
+            asyncio.gather(*(fred.get_series_history(sid, start_date=history_start) for sid in histories.values())),
+            asyncio.gather(*(fred.get_series_latest(sid) for sid in latest)),
+            field(),
+            asyncio.gather(*(fetch_feed(http, url) for url in feeds)),
+        )
+
+    return {
+        'histories': dict(zip(histories, history_results)),
+        'latest': dict(zip(latest, latest_results)),
+        'field': field_metrics,
+        'feeds': dict(zip(feeds, feed_results)),
+    }
+
+
+def run_sync(coro: Awaitable[Any]) -> Any:
+    """Run a coroutine to completion from synchronous code"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # Already inside an event loop: finish on a helper thread
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
+def load_inputs(**kwargs) -> Dict:
+    """Sync facade for gather_inputs, for Streamlit callers"""
+    return run_sync(gather_inputs(**kwargs))
@@ -0,0 +1,181 @@
+"""
+Historical Index Backfill
+Rebuilds monthly index snapshots from full FRED history and stored field
+reports, writing only months that are missing or changed, and refreshes
+the shared binary series store.
+
+Usage:
+    python -m data.backfill [--start YYYY-MM] [--dry-run] [--vintages]
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from data.fred_client import FRED_SERIES, get_fred_client
+from data.indicator_adapters import adapt_observations, monthly_values
+from data.monthly_index import COMPARE_DIGITS, build_inputs, score_months
+from data.range_engine import get_normalization_ranges
+from data.rate_limiter import BACKFILL
+from data.series_store import INDEX_SERIES, from_day, get_series_store, write_series_store
+from data.storage import aggregate_by_month, get_storage
+
+
+DEFAULT_START = '2000-01'
+
+# History pulls share the key's rate limit (see data/rate_limiter.py) in the
+# backfill lane; a few parallel workers keep it busy
+FRED_MAX_WORKERS = 3
+
+
+def fetch_fred_history(start: str) -> Dict[str, List[Dict]]:
+    """
+    Pull raw history for every FRED series concurrently from the API.
+
+    Args:
+        start: First month to fetch (YYYY-MM)
+
+    Returns:
+        Indicator name -> raw observations
+    """
+    client = get_fred_client()
+
+    def fetch(name: str) -> List[Dict]:
+        return client.get_series_history(
+            FRED_SERIES[name], start_date=f'{start}-01', use_store=False, lane=BACKFILL
+        )
+
+    with ThreadPoolExecutor(max_workers=FRED_MAX_WORKERS) as pool:
+        results = pool.map(fetch, FRED_SERIES)
+        return dict(zip(FRED_SERIES, results))
+
+
+def align_to_month_end(raw: Dict[str, List[Dict]]) -> Dict[str, Dict[str, float]]:
+    """Indicator name -> {'YYYY-MM': month-end value in model units}"""
+    return {name: monthly_values(adapt_observations(name, obs)) for name, obs in raw.items()}
+
+
+def write_store(raw: Dict[str, List[Dict]], fred: Dict[str, Dict[str, float]], rows: List[Dict]):
+    """
+    Rewrite the shared series store with raw FRED history, derived
+    year-over-year series and the monthly index.
+
+    Series from a previous run that this run did not fetch are kept.
+    """
+    store = get_series_store()
+    series = {}
+    for key in store.keys():
+        records = store.get_range(key)
+        series[key] = ([from_day(d) for d in records['day'].tolist()], records['value'].tolist())
+
+    for name, observations in raw.items():
+        if observations:
+            series[FRED_SERIES[name]] = (
+                [obs['date'] for obs in observations],
+                [obs['value'] for obs in observations],
+            )
+
+    for name, monthly in fred.items():
+        yoy = pd.Series(monthly, dtype=float).sort_index().pct_change(12, fill_method=None).dropna()
+        if not yoy.empty:
+            series[f'{name}_yoy'] = (list(yoy.index), yoy.tolist())
+
+    index = {s['month']: float(s['score']) for s in get_storage().get_index_snapshots()}
+    index.update((row['month'], row['score']) for row in rows)
+    if index:
+        months = sorted(index)
+        series[INDEX_SERIES] = (months, [index[month] for month in months])
+
+    write_series_store(series)
+
+
+def field_history() -> Dict[str, Dict]:
+    """Field report aggregates for every month with reports"""
+    return aggregate_by_month(get_storage().get_field_reports())
+
+
+def _comparable(snapshot: Dict) -> tuple:
+    metrics = snapshot.get('metrics') or {}
+    return (
+        round(float(snapshot['score']), 1),
+        int(snapshot.get('report_count') or 0),
+        tuple(sorted((k, round(float(v), COMPARE_DIGITS)) for k, v in metrics.items())),
+    )
+
+
+def changed_rows(rows: List[Dict], existing: List[Dict]) -> List[Dict]:
+    """Rows whose month is missing from existing snapshots or differs"""
+    stored = {s['month']: _comparable(s) for s in existing}
+    return [row for row in rows if stored.get(row['month']) != _comparable(row)]
+
+
+def backfill(start: str = DEFAULT_START, end: Optional[str] = None, dry_run: bool = False) -> List[Dict]:
+    """
+    Recompute monthly index snapshots and upsert the missing or changed ones.
+
+    Re-running with unchanged inputs writes nothing.
+
+    Args:
+        start: First month (YYYY-MM)
+        end: Last month (YYYY-MM), default current month
+        dry_run: Compute and report changes without writing
+
+    Returns:
+        The rows that were (or, for a dry run, would be) written
+    """
+    end = end or datetime.now().strftime('%Y-%m')
+    storage = get_storage()
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        fred_future = pool.submit(fetch_fred_history, start)
+        field_future = pool.submit(field_history)
+        raw, field = fred_future.result(), field_future.result()
+
+    fred = align_to_month_end(raw)
+    inputs = build_inputs(fred, field, start, end)
+    if inputs.empty:
+        return []
+
+    rows = score_months(inputs, get_normalization_ranges())
+    pending = changed_rows(rows, storage.get_index_snapshots())
+
+    if not dry_run:
+        if pending and not storage.upsert_index_snapshots(pending):
+            raise RuntimeError("Failed to write index snapshots")
+        write_store(raw, fred, rows)
+    return pending
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Backfill monthly Breakdown Index snapshots")
+    parser.add_argument('--start', default=DEFAULT_START, help="First month, YYYY-MM")
+    parser.add_argument('--end', default=None, help="Last month, YYYY-MM (default: current)")
+    parser.add_argument('--dry-run', action='store_true', help="Show changes without writing")
+    parser.add_argument('--vintages', action='store_true', help="Also refresh stored FRED vintages")
+    args = parser.parse_args(argv)
+
+    pending = backfill(args.start, args.end, dry_run=args.dry_run)
+    action = "Would write" if args.dry_run else "Wrote"
+    print(f"{action} {len(pending)} snapshot(s)")
+    for row in pending:
+        print(f"  {row['month']}: {row['score']:.1f}")
+
+    if args.vintages and not args.dry_run:
+        from data.vintage_store import refresh_vintages
+        for series_id, count in refresh_vintages().items():
+            print(f"Stored {count} vintage record(s) for {series_id}")
+
+    if pending and not args.dry_run:
+        # Publish the rewritten history to the static dashboard
+        from static_export import export_snapshot
+        try:
+            if export_snapshot():
+                print("Exported static dashboard")
+        except Exception as e:
+            print(f"Error exporting static dashboard: {e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,268 @@
+"""
+Shared Caches
+Process-wide caches shared by every Streamlit session, and in-process
+request coalescing
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+_MISSING = object()
+
+
+class _Call:
+    """One in-flight call and its outcome"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key within a process"""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn unless a call for key is already in flight, in which case
+        wait for it and share its result (or exception).
+
+        Args:
+            key: Coalescing key, e.g. a FRED series ID or feed URL
+            fn: Zero-argument callable doing the actual fetch
+
+        Returns:
+            fn's result
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """Number of keys currently being fetched"""
+        with self._lock:
+            return len(self._calls)
+
+
+class LRUCache:
+    """Thread-safe, size-bounded least-recently-used cache"""
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a cached value and mark it as recently used"""
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entry if full"""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key, computing and storing it on a miss.
+
+        Args:
+            key: Cache key
+            compute: Zero-argument callable producing the value
+
+        Returns:
+            Cached or freshly computed value
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def invalidate(self, predicate: Optional[Callable[[Hashable], bool]] = None) -> int:
+        """
+        Drop cached entries.
+
+        Args:
+            predicate: Called with each key; matching keys are removed.
+                If omitted, the whole cache is cleared.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            if predicate is None:
+                removed = len(self._data)
+                self._data.clear()
+                return removed
+
+            stale = [key for key in self._data if predicate(key)]
+            for key in stale:
+                del self._data[key]
+            return len(stale)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+class StripedCache:
+    """
+    Thread-safe cache split into independently locked LRU stripes.
+
+    Keys hash to one of `stripes` shards, so threads working on different
+    keys rarely contend. get_or_compute coalesces concurrent misses for a
+    key into one compute, run outside the stripe lock so slow computes
+    (e.g. database queries) never block other keys or invalidate. Each
+    stripe counts its invalidations, and a result whose compute overlapped
+    an invalidate is returned but not stored, so a save can't be
+    overtaken by an aggregate computed before it.
+    """
+
+    def __init__(self, maxsize: int = 128, stripes: int = 16):
+        self.stripes = stripes
+        self._maxsize = max(1, -(-maxsize // stripes))
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._data = [OrderedDict() for _ in range(stripes)]
+        self._generations = [0] * stripes
+        self._flight = SingleFlight()
+
+    def _stripe(self, key: Hashable) -> int:
+        return hash(key) % self.stripes
+
+    def _store(self, data: OrderedDict, key: Hashable, value: Any):
+        data[key] = value
+        data.move_to_end(key)
+        while len(data) > self._maxsize:
+            data.popitem(last=False)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a cached value and mark it as recently used"""
+        i = self._stripe(key)
+        with self._locks[i]:
+            data = self._data[i]
+            if key not in data:
+                return default
+            data.move_to_end(key)
+            return data[key]
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting the stripe's least recently used entry if full"""
+        i = self._stripe(key)
+        with self._locks[i]:
+            self._store(self._data[i], key, value)
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Any],
+        valid: Optional[Callable[[Any], bool]] = None
+    ) -> Any:
+        """
+        Return the cached value for key, computing it once on a miss.
+
+        Args:
+            key: Cache key
+            compute: Zero-argument callable producing the value
+            valid: Optional check on a cached value; when it returns False
+                the value is recomputed (e.g. for expiring entries)
+
+        Returns:
+            Cached or freshly computed value
+        """
+        i = self._stripe(key)
+
+        def cached() -> Any:
+            with self._locks[i]:
+                data = self._data[i]
+                value = data.get(key, _MISSING)
+                if value is not _MISSING and (valid is None or valid(value)):
+                    data.move_to_end(key)
+                    return value
+                return _MISSING
+
+        value = cached()
+        if value is not _MISSING:
+            return value
+
+        def fill() -> Any:
+            # Another thread may have stored the value since the check above
+            value = cached()
+            if value is not _MISSING:
+                return value
+            with self._locks[i]:
+                generation = self._generations[i]
+            value = compute()
+            with self._locks[i]:
+                if self._generations[i] == generation:
+                    self._store(self._data[i], key, value)
+            return value
+
+        return self._flight.do(key, fill)
+
+    def invalidate(self, predicate: Optional[Callable[[Hashable], bool]] = None) -> int:
+        """
+        Drop cached entries.
+
+        Args:
+            predicate: Called with each key; matching keys are removed.
+                If omitted, the whole cache is cleared.
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        for i, (lock, data) in enumerate(zip(self._locks, self._data)):
+            with lock:
+                self._generations[i] += 1
+                stale = [key for key in data if predicate is None or predicate(key)]
+                for key in stale:
+                    del data[key]
+                removed += len(stale)
+        return removed
+
+    def __contains__(self, key: Hashable) -> bool:
+        i = self._stripe(key)
+        with self._locks[i]:
+            return key in self._data[i]
+
+    def __len__(self) -> int:
+        total = 0
+        for lock, data in zip(self._locks, self._data):
+            with lock:
+                total += len(data)
+        return total
@@ -0,0 +1,300 @@
+"""
+Circuit Breakers
+Per-host breakers for upstream APIs and feeds, so an unhealthy host fails
+fast instead of costing every rerun a full network timeout
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# Failure rate is measured over calls in this sliding window (seconds)
+FAILURE_WINDOW = 60.0
+# No decision is made on fewer calls than this within the window
+MIN_CALLS = 4
+# Open once this share of windowed calls failed
+FAILURE_RATE_THRESHOLD = 0.5
+# Wait before the first probe; doubles on each failed probe up to MAX_COOLDOWN
+COOLDOWN = 30.0
+MAX_COOLDOWN = 600.0
+# Concurrent probe calls allowed while half-open
+HALF_OPEN_PROBES = 1
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose breaker is open"""
+
+
+# Transport exception classes, resolved on first use (HTTP clients are
+# optional imports)
+_transport_errors: Optional[Tuple[type, ...]] = None
+
+
+def _get_transport_errors() -> Tuple[type, ...]:
+    """Timeout and connection errors from the builtins and any installed HTTP client"""
+    global _transport_errors
+    if _transport_errors is None:
+        errors = [ConnectionError, TimeoutError]
+        try:
+            import requests
+            errors += [
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+                requests.exceptions.ChunkedEncodingError,
+            ]
+        except ImportError:
+            pass
+        try:
+            import httpx
+            errors.append(httpx.TransportError)
+        except ImportError:
+            pass
+        _transport_errors = tuple(errors)
+    return _transport_errors
+
+
+def is_upstream_failure(error: BaseException) -> bool:
+    """
+    Whether an error says the host is unhealthy.
+
+    Only timeouts, connection errors and 5xx or 429 responses count.
+    Other 4xx responses mean the request was wrong, not the host, and
+    errors like ValueError or KeyError from handling a response are bugs
+    or bad payloads, so neither counts against the breaker.
+    """
+    status = getattr(getattr(error, 'response', None), 'status_code', None)
+    if status is not None:
+        return status >= 500 or status == 429
+    return isinstance(error, _get_transport_errors())
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker with a sliding failure-rate window"""
+
+    def __init__(
+        self,
+        name: str,
+        window: float = FAILURE_WINDOW,
+        min_calls: int = MIN_CALLS,
+        failure_rate: float = FAILURE_RATE_THRESHOLD,
+        cooldown: float = COOLDOWN,
+        max_cooldown: float = MAX_COOLDOWN,
+        probes: int = HALF_OPEN_PROBES
+    ):
+        self.name = name
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.probes = probes
+
+        self._state = CLOSED
+        self._calls: Deque[Tuple[float, bool]] = deque()
+        self._opened_at = 0.0
+        self._current_cooldown = cooldown
+        self._probes_in_flight = 0
+        self._last_failure: Optional[str] = None
+        # Re-entrant so state listeners may call snapshot()
+        self._lock = threading.RLock()
+
+    def _trim(self, now: float):
+        while self._calls and now - self._calls[0][0] > self.window:
+            self._calls.popleft()
+
+    def _transition(self, state: str):
+        previous, self._state = self._state, state
+        if previous != state:
+            _notify(self.name, previous, state)
+
+    def _open(self, now: float):
+        self._opened_at = now
+        self._probes_in_flight = 0
+        self._transition(OPEN)
+
+    def allow(self) -> bool:
+        """
+        Reserve a call. Returns False without side effects while open; a
+        True while half-open reserves one probe slot, which must be released
+        with record_success or record_failure.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._state == OPEN:
+                if now - self._opened_at < self._current_cooldown:
+                    return False
+                self._transition(HALF_OPEN)
+            if self._state == HALF_OPEN:
+                if self._probes_in_flight >= self.probes:
+                    return False
+                self._probes_in_flight += 1
+            return True
+
+    def record_success(self):
+        now = time.monotonic()
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._calls.clear()
+                self._current_cooldown = self.cooldown
+                self._probes_in_flight = 0
+                self._transition(CLOSED)
+            self._calls.append((now, True))
+            self._trim(now)
+
+    def record_failure(self, error: Optional[BaseException] = None):
+        now = time.monotonic()
+        with self._lock:
+            self._last_failure = repr(error) if error is not None else None
+            if self._state == HALF_OPEN:
+                self._current_cooldown = min(self._current_cooldown * 2, self.max_cooldown)
+                self._open(now)
+                return
+            self._calls.append((now, False))
+            self._trim(now)
+            failures = sum(1 for _, ok in self._calls if not ok)
+            if len(self._calls) >= self.min_calls and failures / len(self._calls) >= self.failure_rate:
+                self._open(now)
+
+    def release(self):
+        """Give back a reserved call that ended without a verdict"""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes_in_flight:
+                self._probes_in_flight -= 1
+
+    def call(
+        self,
+        fn: Callable[[], Any],
+        is_failure: Callable[[BaseException], bool] = is_upstream_failure
+    ) -> Any:
+        """
+        Run fn through the breaker.
+
+        Args:
+            fn: Zero-argument callable making the upstream request
+            is_failure: Decides whether an exception counts against the host
+
+        Returns:
+            fn's result
+
+        Raises:
+            CircuitOpenError: Immediately, while the breaker is open
+        """
+        if not self.allow():
+            raise CircuitOpenError(f"Circuit open for {self.name}")
+        try:
+            result = fn()
+        except Exception as e:
+            if is_failure(e):
+                self.record_failure(e)
+            else:
+                self.release()
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self.record_success()
+        return result
+
+    async def call_async(
+        self,
+        fn: Callable[[], Awaitable[Any]],
+        is_failure: Callable[[BaseException], bool] = is_upstream_failure
+    ) -> Any:
+        """Like call, for a zero-argument coroutine function"""
+        if not self.allow():
+            raise CircuitOpenError(f"Circuit open for {self.name}")
+        try:
+            result = await fn()
+        except Exception as e:
+            if is_failure(e):
+                self.record_failure(e)
+            else:
+                self.release()
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self.record_success()
+        return result
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self._current_cooldown:
+                return HALF_OPEN
+            return self._state
+
+    def snapshot(self) -> Dict:
+        """Current state and window statistics, for instrumentation"""
+        now = time.monotonic()
+        state = self.state
+        with self._lock:
+            self._trim(now)
+            calls = len(self._calls)
+            failures = sum(1 for _, ok in self._calls if not ok)
+            retry_in = (
+                max(0.0, self._current_cooldown - (now - self._opened_at))
+                if self._state == OPEN else 0.0
+            )
+            return {
+                'name': self.name,
+                'state': state,
+                'calls': calls,
+                'failures': failures,
+                'failure_rate': failures / calls if calls else 0.0,
+                'retry_in': round(retry_in, 1),
+                'last_failure': self._last_failure,
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+# Callables notified with (breaker name, old state, new state)
+_state_listeners: List[Callable[[str, str, str], None]] = []
+
+
+def _notify(name: str, previous: str, state: str):
+    print(f"Circuit {name}: {previous} -> {state}")
+    for listener in list(_state_listeners):
+        try:
+            listener(name, previous, state)
+        except Exception as e:
+            print(f"Breaker listener error: {e}")
+
+
+def add_state_listener(listener: Callable[[str, str, str], None]):
+    """Register a callable to be notified of every breaker state change"""
+    if listener not in _state_listeners:
+        _state_listeners.append(listener)
+
+
+def get_breaker(url: str) -> CircuitBreaker:
+    """
+    Get the process-wide breaker for a URL's host.
+
+    Args:
+        url: Any URL on the host (or a bare host name)
+
+    Returns:
+        Breaker shared by every request to that host
+    """
+    host = urlparse(url).netloc or url
+    breaker = _breakers.get(host)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(host, CircuitBreaker(host))
+    return breaker
+
+
+def get_breaker_states() -> List[Dict]:
+    """Snapshot of every breaker, for instrumentation"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return [breaker.snapshot() for breaker in breakers]
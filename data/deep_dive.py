@@ -0,0 +1,121 @@
+"""
+Deep Dive Data
+One batched load of everything the Deep Dive page shows: latest FRED
+values with their changes, industry metrics and the field report cube
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from data.cache import LRUCache
+from data.fred_client import FRED_SERIES
+from data.indicator_adapters import cached_history
+from data.metrics_assembler import ASSEMBLY_TTL, INDUSTRY_INPUTS, get_current_metrics
+from data.rollup_cube import get_rollup_cube
+from data.storage import get_data_version, get_storage
+
+
+# (data version, month) -> (expires_at, deep dive data)
+_loaded = LRUCache(maxsize=4)
+
+
+def _previous_month(month: str) -> str:
+    first = datetime.strptime(month, '%Y-%m')
+    return (first - timedelta(days=1)).strftime('%Y-%m')
+
+
+def _previous_snapshot(snapshots: List[Dict], month: str) -> Optional[Dict]:
+    """Latest stored index snapshot from before month"""
+    earlier = [s for s in snapshots if s.get('month', '') < month]
+    return max(earlier, key=lambda s: s['month']) if earlier else None
+
+
+def _change(value: Optional[float], date: Optional[str], previous: Optional[float], previous_date: Optional[str]) -> Optional[Dict]:
+    if value is None:
+        return None
+    return {
+        'value': value,
+        'date': date,
+        'previous': previous,
+        'previous_date': previous_date,
+        'delta': value - previous if previous is not None else None,
+    }
+
+
+def _fred_change(name: str, metrics: Dict, snapshot: Optional[Dict]) -> Optional[Dict]:
+    """
+    Latest value of a FRED indicator and its change since the previous
+    observation, falling back to the previous month's stored snapshot when
+    there is no history (e.g. without an API key).
+
+    Only reads histories the metrics assembler already cached in its
+    batched fetch, so a missing history never costs a request here.
+    """
+    observations = cached_history(name) or []
+    if len(observations) >= 2:
+        latest, previous = observations[-1], observations[-2]
+        return _change(latest['value'], latest['date'], previous['value'], previous['date'])
+
+    stored = (snapshot or {}).get('metrics', {})
+    return _change(
+        metrics.get(name),
+        metrics.get(f'{name}_date'),
+        stored.get(name),
+        snapshot['month'] if name in stored else None,
+    )
+
+
+def _stored_change(name: str, metrics: Dict, snapshot: Optional[Dict]) -> Optional[Dict]:
+    """Current value of a hand-maintained input and its change since the previous snapshot"""
+    stored = (snapshot or {}).get('metrics', {})
+    return _change(
+        metrics.get(name),
+        None,
+        stored.get(name),
+        snapshot['month'] if name in stored else None,
+    )
+
+
+def load_deep_dive(month: Optional[str] = None) -> Dict:
+    """
+    Load the Deep Dive inputs, memoized per data version.
+
+    FRED histories and field report aggregates come from the metrics
+    assembler's single async pass; changes are read from indicator
+    history and stored monthly snapshots rather than fetched again.
+
+    Args:
+        month: Month (YYYY-MM), default current
+
+    Returns:
+        Dict with 'month', 'last_month', 'metrics' (assembled metrics),
+        'indicators' (name -> dict with 'value', 'date', 'previous',
+        'previous_date' and 'delta', or None if unavailable) and 'field'
+        ('current' and 'previous' cube slices)
+    """
+    month = month or datetime.now().strftime('%Y-%m')
+    key = (get_data_version(), month)
+
+    cached = _loaded.get(key)
+    if cached is not None and datetime.now() < cached[0]:
+        return cached[1]
+
+    metrics = get_current_metrics(month)
+    snapshot = _previous_snapshot(get_storage().get_index_snapshots(), month)
+    last_month = _previous_month(month)
+
+    indicators = {name: _fred_change(name, metrics, snapshot) for name in FRED_SERIES}
+    indicators.update((name, _stored_change(name, metrics, snapshot)) for name in INDUSTRY_INPUTS)
+
+    cube = get_rollup_cube()
+    data = {
+        'month': month,
+        'last_month': last_month,
+        'metrics': metrics,
+        'indicators': indicators,
+        'field': {
+            'current': cube.slice(month=month),
+            'previous': cube.slice(month=last_month),
+        },
+    }
+    _loaded.set(key, (datetime.now() + ASSEMBLY_TTL, data))
+    return data
@@ -0,0 +1,146 @@
+"""
+History Downsampling
+Largest-Triangle-Three-Buckets (LTTB) reduction of long FRED histories to
+a fixed number of chart points, read straight from the series store
+"""
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from data.cache import LRUCache
+from data.fred_client import get_fred_client
+from data.series_store import from_day, get_series_store, to_day
+
+
+# Most points any history chart sends, whatever the history length
+CHART_POINT_BUDGET = 1000
+# Nominal plot width in CSS pixels; one point per pixel is all a line can show
+CHART_WIDTH_PX = 720
+
+# History fetched from FRED when the series store doesn't have it
+FETCHED_TTL = timedelta(hours=24)
+
+# Series ID -> (expires_at, days, values)
+_fetched = LRUCache(maxsize=16)
+
+# (series ID, start, end, points, length, last day) -> (days, values)
+_downsampled = LRUCache(maxsize=64)
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Select the indices of threshold points that best preserve the shape of
+    a line with Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept. The points between them are
+    split into threshold - 2 buckets, and from each bucket the point forming
+    the largest triangle with the previously selected point and the next
+    bucket's average is kept, so peaks and troughs survive.
+
+    Args:
+        x: Increasing x values
+        y: y values
+        threshold: Number of points to keep
+
+    Returns:
+        Sorted indices into x and y
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    sizes = np.diff(edges)
+    # Bucket averages in one pass; the last bucket stops before the final point
+    avg_x = np.add.reduceat(x[:n - 1], edges[:-1]) / sizes
+    avg_y = np.add.reduceat(y[:n - 1], edges[:-1]) / sizes
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 1 < threshold - 2:
+            next_x, next_y = avg_x[i + 1], avg_y[i + 1]
+        else:
+            next_x, next_y = x[-1], y[-1]
+        area = np.abs(
+            (x[a] - next_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (next_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def load_full_history(series_id: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Full history of a FRED series as (days since epoch, values).
+
+    Reads a zero-copy view of the series store when the series was
+    backfilled, otherwise fetches it from FRED once a day.
+    """
+    records = get_series_store().get_range(series_id)
+    if records is not None and len(records):
+        return records['day'], records['value']
+
+    cached = _fetched.get(series_id)
+    if cached is not None and datetime.now() < cached[0]:
+        return cached[1], cached[2]
+
+    observations = get_fred_client().get_series_history(series_id, use_store=False)
+    days = np.array([to_day(obs['date']) for obs in observations], dtype=np.int32)
+    values = np.array([obs['value'] for obs in observations], dtype=float)
+    if len(days):
+        _fetched.set(series_id, (datetime.now() + FETCHED_TTL, days, values))
+    return days, values
+
+
+def downsample_history(
+    series_id: str,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    points: int = CHART_WIDTH_PX
+) -> Dict:
+    """
+    Get a chart-ready, downsampled slice of a series' history.
+
+    Each range is reduced from the raw observations, so a narrower range
+    shows finer detail rather than a crop of the full-history reduction.
+
+    Args:
+        series_id: FRED series identifier
+        start: First date (inclusive), 'YYYY-MM-DD'
+        end: Last date (inclusive)
+        points: Target points, usually the plot width in pixels; capped at
+            CHART_POINT_BUDGET
+
+    Returns:
+        Dict with 'dates' (ISO strings), 'values' (array) and 'total'
+        (observations in the range before downsampling)
+    """
+    points = min(points, CHART_POINT_BUDGET)
+    days, values = load_full_history(series_id)
+    lo = np.searchsorted(days, to_day(start), side='left') if start else 0
+    hi = np.searchsorted(days, to_day(end), side='right') if end else len(days)
+    days, values = days[lo:hi], values[lo:hi]
+
+    if not len(days):
+        return {'dates': [], 'values': np.array([]), 'total': 0}
+
+    key = (series_id, start, end, points, len(days), int(days[-1]))
+    cached = _downsampled.get(key)
+    if cached is None:
+        keep = lttb(days, values, points)
+        cached = (days[keep], np.array(values[keep], dtype=float))
+        _downsampled.set(key, cached)
+
+    kept_days, kept_values = cached
+    return {
+        'dates': [from_day(day) for day in kept_days.tolist()],
+        'values': kept_values,
+        'total': len(days),
+    }
@@ -2,7 +2,7 @@
 Error Code Engine
 Evaluates current conditions and triggers diagnostic codes
 """
-from typing import List, Dict, Callable
+from typing import List, Dict, Callable, Optional
 
 
 # Error code definitions
@@ -116,25 +116,18 @@ def evaluate_error_codes(data: Dict) -> List[Dict]:
     return triggered
 
 
-def get_active_error_codes() -> List[Dict]:
+def get_active_error_codes(metrics: Optional[Dict] = None) -> List[Dict]:
     """
     Get currently active error codes based on latest data.
     
+    Args:
+        metrics: Assembled metrics; fetched via get_current_metrics if omitted
+    
     Returns:
         List of active error code dictionaries
     """
-    # TODO: Replace with actual data fetching
-    # Mock data for development
-    mock_data = {
-        'hiring_difficulty_avg': 3.8,
-        'parts_lead_time_avg': 8.5,
-        'call_volume_sentiment_avg': 3.4,
-        'tariff_alert_active': True,
-        'existing_home_sales_change': 0.01,
-        'r2r_laws_passed_this_year': 2,
-        'appliance_cpi_change': 0.03,
-        'business_sentiment_avg': 3.2,
-    }
+    if metrics is None:
+        from data.metrics_assembler import get_current_metrics
+        metrics = get_current_metrics()
     
-    return evaluate_error_codes(mock_data)
-
+    return evaluate_error_codes(metrics)
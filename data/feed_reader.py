@@ -0,0 +1,197 @@
+"""
+Feed Reader
+Downloads RSS/Atom feeds and reduces them to plain title/link/date entries
+
+Feeds are parsed incrementally as the body streams in, and the download
+stops as soon as enough entries have been read. feedparser is only used
+for documents the strict XML parser rejects.
+"""
+import html
+import re
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, List, Optional
+
+
+# Entries kept per feed
+FEED_ENTRY_LIMIT = 3
+# feedparser has no timeout of its own, so feeds are downloaded first
+FEED_TIMEOUT = 5
+FEED_HEADERS = {'User-Agent': 'BreakdownIndex/1.0'}
+# How long a process reuses a fetched feed
+FEED_TTL = timedelta(hours=1)
+# Bytes read from the response per step
+CHUNK_SIZE = 8192
+
+# RSS/RDF items and Atom entries
+ENTRY_TAGS = {'item', 'entry'}
+# Publication date elements, most preferred first (dc:date is 'date')
+DATE_TAGS = ('pubDate', 'published', 'updated', 'date')
+# Summary elements, most preferred first
+SUMMARY_TAGS = ('description', 'summary', 'content')
+# Summaries are stripped of markup and cut to this length
+SUMMARY_CHARS = 300
+
+_TAG_PATTERN = re.compile(r'<[^>]+>')
+_SPACE_PATTERN = re.compile(r'\s+')
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def _parse_date(text: Optional[str]) -> Optional[str]:
+    """RFC 822 (RSS) or ISO 8601 (Atom) date as a naive UTC ISO string"""
+    if not text:
+        return None
+    text = text.strip()
+    try:
+        parsed = parsedate_to_datetime(text)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(text.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.isoformat()
+
+
+def _clean_summary(text: Optional[str]) -> str:
+    """Plain-text summary without markup, cut to SUMMARY_CHARS"""
+    if not text:
+        return ''
+    text = html.unescape(_TAG_PATTERN.sub(' ', text))
+    return _SPACE_PATTERN.sub(' ', text).strip()[:SUMMARY_CHARS]
+
+
+def _entry_from_element(element: ET.Element) -> Optional[Dict]:
+    """Title, link, date and summary of an <item> or <entry> element"""
+    title, link, dates, summaries = None, None, {}, {}
+    for child in element:
+        name = _local_name(child.tag)
+        if name == 'title':
+            title = (child.text or '').strip()
+        elif name == 'link':
+            # RSS puts the URL in the text, Atom in href (rel defaults to alternate)
+            if child.get('href') and child.get('rel', 'alternate') == 'alternate':
+                link = link or child.get('href')
+            elif child.text and child.text.strip():
+                link = link or child.text.strip()
+        elif name in DATE_TAGS and child.text:
+            dates.setdefault(name, child.text)
+        elif name in SUMMARY_TAGS and child.text:
+            summaries.setdefault(name, child.text)
+
+    if not title or not link:
+        return None
+    published = next((_parse_date(dates[tag]) for tag in DATE_TAGS if tag in dates), None)
+    summary = next((summaries[tag] for tag in SUMMARY_TAGS if tag in summaries), None)
+    return {'title': title, 'link': link, 'published': published, 'summary': _clean_summary(summary)}
+
+
+class StreamingFeedReader:
+    """
+    Incremental feed parser fed with chunks of the response body.
+
+    Completed entry elements are cleared as they are read, so memory stays
+    flat however long the feed is. If the document is not well-formed XML
+    (or yields no entries), result() hands the raw bytes to feedparser.
+    """
+
+    def __init__(self, limit: int = FEED_ENTRY_LIMIT):
+        self.limit = limit
+        self.entries: List[Dict] = []
+        self.malformed = False
+        self._raw: List[bytes] = []
+        self._parser = ET.XMLPullParser(events=('end',))
+
+    def feed(self, chunk: bytes) -> bool:
+        """
+        Consume a chunk.
+
+        Returns:
+            True once enough entries have been read and the download can stop
+        """
+        self._raw.append(chunk)
+        if self.malformed:
+            return False
+        try:
+            self._parser.feed(chunk)
+            for _, element in self._parser.read_events():
+                if _local_name(element.tag) not in ENTRY_TAGS:
+                    continue
+                entry = _entry_from_element(element)
+                element.clear()
+                if entry:
+                    self.entries.append(entry)
+                    if len(self.entries) >= self.limit:
+                        return True
+        except ET.ParseError:
+            # Keep reading the body for the lenient fallback parser
+            self.malformed = True
+        return False
+
+    def result(self) -> List[Dict]:
+        """Entries read, falling back to feedparser for malformed feeds"""
+        if len(self.entries) >= self.limit:
+            return self.entries
+        if not self.malformed:
+            try:
+                self._parser.close()
+            except ET.ParseError:
+                self.malformed = True
+        if self.malformed or not self.entries:
+            return parse_feed(b''.join(self._raw), self.limit)
+        return self.entries
+
+
+def read_feed(chunks: Iterable[bytes], limit: int = FEED_ENTRY_LIMIT) -> List[Dict]:
+    """Parse a feed from an iterable of body chunks, stopping early when possible"""
+    reader = StreamingFeedReader(limit)
+    for chunk in chunks:
+        if reader.feed(chunk):
+            break
+    return reader.result()
+
+
+def parse_feed(content: bytes, limit: int = FEED_ENTRY_LIMIT) -> List[Dict]:
+    """
+    Parse a whole feed document with feedparser.
+
+    Args:
+        content: Raw feed document
+        limit: Maximum number of entries
+
+    Returns:
+        List of dicts with 'title', 'link', 'published' (ISO string or
+        None) and 'summary'
+    """
+    import feedparser
+
+    feed = feedparser.parse(content)
+    entries = []
+
+    for entry in feed.entries[:limit]:
+        published = None
+        if hasattr(entry, 'published_parsed') and entry.published_parsed:
+            published = datetime(*entry.published_parsed[:6]).isoformat()
+
+        entries.append({
+            'title': entry.title,
+            'link': entry.link,
+            'published': published,
+            'summary': _clean_summary(entry.get('summary')),
+        })
+
+    return entries
+
+
+def fetch_feed_entries(url: str, limit: int = FEED_ENTRY_LIMIT) -> List[Dict]:
+    """Stream and parse a feed, closing the connection once enough entries are read"""
+    import requests
+
+    with requests.get(url, timeout=FEED_TIMEOUT, headers=FEED_HEADERS, stream=True) as response:
+        response.raise_for_status()
+        return read_feed(response.iter_content(CHUNK_SIZE), limit)
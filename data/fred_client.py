@@ -3,9 +3,22 @@ FRED API Client
 Fetches economic indicators from Federal Reserve Economic Data
 """
 import os
+import threading
 from typing import Dict, Optional, List
 from datetime import datetime, timedelta
 
+from data.cache import StripedCache
+from data.circuit_breaker import CircuitOpenError, get_breaker, is_upstream_failure
+from data.rate_limiter import (
+    BACKFILL,
+    INTERACTIVE,
+    MAX_INTERACTIVE_WAIT,
+    THROTTLED_BACKOFF,
+    RateLimitTimeout,
+    get_fred_bucket,
+)
+from data.singleflight import get_singleflight
+
 def get_secret(key: str) -> Optional[str]:
     """Get secret from Streamlit secrets or env vars"""
     try:
@@ -25,6 +38,9 @@ FRED_SERIES = {
     'housing_inventory': 'ACTLISCOUUS',     # Active Listings Count
 }
 
+# Most observations FRED returns per request; longer vintage histories are paged
+VINTAGE_PAGE_SIZE = 100000
+
 
 class FREDClient:
     """Client for fetching data from FRED API"""
@@ -32,14 +48,8 @@ class FREDClient:
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or get_secret('FRED_API_KEY')
         self.base_url = 'https://api.stlouisfed.org/fred'
-        self._cache: Dict = {}
-        self._cache_expiry: Dict[str, datetime] = {}
-    
-    def _is_cache_valid(self, series_id: str, max_age_hours: int = 24) -> bool:
-        """Check if cached data is still valid"""
-        if series_id not in self._cache_expiry:
-            return False
-        return datetime.now() < self._cache_expiry[series_id]
+        # series_id -> (value, expires_at), shared by every session's threads
+        self._cache = StripedCache(maxsize=64, stripes=8)
     
     def get_series_latest(self, series_id: str) -> Optional[float]:
         """
@@ -51,96 +61,235 @@ class FREDClient:
         Returns:
             Latest value or None if unavailable
         """
-        if self._is_cache_valid(series_id):
-            return self._cache.get(series_id)
+        entry = self._cache.get(series_id)
+        if entry is not None and datetime.now() < entry[1]:
+            return entry[0]
         
         if not self.api_key:
             # Return mock data if no API key
             return self._get_mock_value(series_id)
         
+        # Concurrent misses for the same series share one request, across
+        # threads and processes; while FRED is unhealthy the breaker fails
+        # the call immediately. The breaker runs inside the flight so each
+        # request counts once, however many callers waited on it.
+        key = f"fred:{series_id}"
+        flight = get_singleflight()
+        breaker = get_breaker(self.base_url)
         try:
-            import requests
-            
-            url = f"{self.base_url}/series/observations"
-            params = {
-                'series_id': series_id,
-                'api_key': self.api_key,
-                'file_type': 'json',
-                'sort_order': 'desc',
-                'limit': 1,
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            if data.get('observations'):
-                value = float(data['observations'][0]['value'])
-                
-                # Cache the result
-                self._cache[series_id] = value
-                self._cache_expiry[series_id] = datetime.now() + timedelta(hours=24)
-                
-                return value
+            value = flight.do(
+                key,
+                lambda: breaker.call(lambda: self._fetch_latest(series_id), is_failure=_is_fred_failure),
+            )
+        except CircuitOpenError:
+            value = None
         except Exception as e:
             print(f"Error fetching FRED series {series_id}: {e}")
+            value = None
+        
+        if value is not None:
+            # Cache the result
+            self._cache.set(series_id, (value, datetime.now() + timedelta(hours=24)))
+            return value
+        
+        # Serve the last good value, from this process or any other
+        if entry is not None:
+            return entry[0]
+        stale = flight.last_result(key)
+        if stale is not None:
+            return stale
         
         return self._get_mock_value(series_id)
     
+    def _request(self, params: Dict, timeout: int = 10, lane: str = INTERACTIVE) -> Dict:
+        """
+        Query series/observations within the API key's shared rate limit.
+        
+        A 429 empties the shared bucket, so every process backs off, and
+        the request is retried once.
+        
+        Args:
+            params: Query parameters besides the API key and file type
+            timeout: Request timeout in seconds
+            lane: INTERACTIVE (waits at most MAX_INTERACTIVE_WAIT) or
+                BACKFILL (waits as long as needed, yields to interactive)
+        
+        Returns:
+            Decoded JSON response
+        """
+        import requests
+        
+        bucket = get_fred_bucket(self.api_key)
+        wait = MAX_INTERACTIVE_WAIT if lane == INTERACTIVE else None
+        url = f"{self.base_url}/series/observations"
+        params = dict(params, api_key=self.api_key, file_type='json')
+        
+        for attempt in range(2):
+            bucket.acquire(lane, timeout=wait)
+            response = requests.get(url, params=params, timeout=timeout)
+            if response.status_code == 429 and attempt == 0:
+                retry_after = response.headers.get('Retry-After', '')
+                bucket.throttle(float(retry_after) if retry_after.isdigit() else THROTTLED_BACKOFF)
+                continue
+            response.raise_for_status()
+            return response.json()
+    
+    def _fetch_latest(self, series_id: str) -> Optional[float]:
+        """Request the latest observation from the API"""
+        data = self._request({
+            'series_id': series_id,
+            'sort_order': 'desc',
+            'limit': 1,
+        })
+        if data.get('observations'):
+            return float(data['observations'][0]['value'])
+        return None
+    
     def get_series_history(
         self, 
         series_id: str, 
         start_date: Optional[str] = None,
-        end_date: Optional[str] = None
+        end_date: Optional[str] = None,
+        use_store: bool = True,
+        lane: str = INTERACTIVE
     ) -> List[Dict]:
         """
         Get historical values for a FRED series.
         
+        Served from the shared series store (written by data/backfill.py)
+        when it is fresh or when there is no API key.
+        
         Args:
             series_id: FRED series identifier
             start_date: Start date (YYYY-MM-DD format)
             end_date: End date (YYYY-MM-DD format)
+            use_store: Set False to always query the API
+            lane: Rate limit lane; bulk jobs pass BACKFILL
         
         Returns:
             List of dicts with 'date' and 'value' keys
         """
+        if use_store:
+            stored = self._get_stored_history(series_id, start_date, end_date)
+            if stored is not None:
+                return stored
+        
         if not self.api_key:
             return []
         
         try:
-            import requests
-            
-            url = f"{self.base_url}/series/observations"
-            params = {
-                'series_id': series_id,
-                'api_key': self.api_key,
-                'file_type': 'json',
-            }
+            params = {'series_id': series_id}
             
             if start_date:
                 params['observation_start'] = start_date
             if end_date:
                 params['observation_end'] = end_date
             
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = get_breaker(self.base_url).call(
+                lambda: self._request(params, lane=lane), is_failure=_is_fred_failure
+            )
             return [
                 {'date': obs['date'], 'value': float(obs['value'])}
                 for obs in data.get('observations', [])
                 if obs['value'] != '.'
             ]
+        except CircuitOpenError:
+            pass
         except Exception as e:
             print(f"Error fetching FRED history {series_id}: {e}")
         
+        # Fall back to stored history, however old
+        stored = self._get_stored_history(series_id, start_date, end_date, allow_stale=True)
+        return stored or []
+
+    def get_series_vintages(
+        self,
+        series_id: str,
+        start_date: Optional[str] = None,
+        lane: str = BACKFILL
+    ) -> List[Dict]:
+        """
+        Get every published vintage of a FRED (ALFRED) series.
+
+        Each row is one value as it stood during a real-time period, so a
+        revised observation appears once per revision. Histories longer
+        than one response are paged with offset.
+
+        Args:
+            series_id: FRED series identifier
+            start_date: First observation date (YYYY-MM-DD format)
+            lane: Rate limit lane
+
+        Returns:
+            List of dicts with 'date', 'value', 'realtime_start' and
+            'realtime_end' keys (open vintages end on '9999-12-31')
+        """
+        if not self.api_key:
+            return []
+
+        try:
+            params = {
+                'series_id': series_id,
+                'realtime_start': '1776-07-04',
+                'realtime_end': '9999-12-31',
+                'limit': VINTAGE_PAGE_SIZE,
+            }
+
+            if start_date:
+                params['observation_start'] = start_date
+
+            vintages = []
+            offset = 0
+            while True:
+                page_params = dict(params, offset=offset)
+                data = get_breaker(self.base_url).call(
+                    lambda: self._request(page_params, timeout=30, lane=lane), is_failure=_is_fred_failure
+                )
+                page = data.get('observations', [])
+                vintages.extend(
+                    {
+                        'date': obs['date'],
+                        'value': float(obs['value']),
+                        'realtime_start': obs['realtime_start'],
+                        'realtime_end': obs['realtime_end'],
+                    }
+                    for obs in page
+                    if obs['value'] != '.'
+                )
+                offset += len(page)
+                if not page or offset >= int(data.get('count', 0)):
+                    return vintages
+        except Exception as e:
+            print(f"Error fetching FRED vintages {series_id}: {e}")
+
         return []
+
+    def _get_stored_history(
+        self,
+        series_id: str,
+        start_date: Optional[str],
+        end_date: Optional[str],
+        allow_stale: bool = False
+    ) -> Optional[List[Dict]]:
+        """Read history from the series store, or None if it can't be used"""
+        try:
+            from data.series_store import get_series_store, STORE_MAX_AGE
+            store = get_series_store()
+            modified = store.modified_at()
+            if modified is None:
+                return None
+            if self.api_key and not allow_stale and datetime.now() - modified > STORE_MAX_AGE:
+                return None
+            return store.get_observations(series_id, start_date, end_date)
+        except Exception as e:
+            print(f"Error reading series store for {series_id}: {e}")
+            return None
     
     def _get_mock_value(self, series_id: str) -> float:
         """Return mock values for development"""
         mock_values = {
             'UMCSENT': 68.5,
-            'EXHOSLUSM495S': 4100,
+            'EXHOSLUSM495S': 4100000,
             'MORTGAGE30US': 6.8,
             'CUSR0000SEHK': 108.5,
             'DGORDER': 285000,
@@ -163,14 +312,22 @@ class FREDClient:
         return results
 
 
+def _is_fred_failure(error: BaseException) -> bool:
+    """Errors that count against the FRED breaker; waiting on our own rate limit doesn't"""
+    return not isinstance(error, RateLimitTimeout) and is_upstream_failure(error)
+
+
 # Singleton instance
 _client: Optional[FREDClient] = None
+_client_lock = threading.Lock()
 
 
 def get_fred_client() -> FREDClient:
     """Get or create FRED client instance"""
     global _client
     if _client is None:
-        _client = FREDClient()
+        with _client_lock:
+            if _client is None:
+                _client = FREDClient()
     return _client
 
@@ -2,9 +2,11 @@
 Breakdown Index Calculator
 Composite score calculation from multiple data sources
 """
-from typing import Dict, List
+from typing import Dict, List, Mapping, Optional, Tuple
 from datetime import datetime
 
+import numpy as np
+
 
 # Weights for each component
 WEIGHTS = {
@@ -27,6 +29,48 @@ WEIGHTS = {
     'business_sentiment': 0.05,
 }
 
+# Component groups, matching the index_snapshots component scores
+COMPONENTS = {
+    'economic': ['consumer_confidence', 'existing_home_sales', 'mortgage_rate', 'appliance_cpi'],
+    'industry': ['appliance_shipments', 'tech_wage_growth', 'job_posting_volume', 'parts_availability'],
+    'field': ['call_volume_sentiment', 'parts_lead_time', 'hiring_difficulty', 'business_sentiment'],
+}
+
+
+# Default historical ranges as (min, max, inverse) for each weighted indicator.
+# inverse=True means lower values produce a higher score.
+NORMALIZATION_RANGES = {
+    # Economic indicators (higher is generally good for repair)
+    # Consumer Confidence: 50-120 historical range
+    'consumer_confidence': (50, 120, False),
+    # Existing Home Sales: Low turnover = good for repair. 3M - 7M units annually
+    'existing_home_sales': (3.0, 7.0, True),
+    # Mortgage Rate: High rates keep people in homes = more repairs. 2% - 8%
+    'mortgage_rate': (2.0, 8.0, False),
+    # Appliance CPI: Higher new prices = more repair demand. 90 - 130 index
+    'appliance_cpi': (90, 130, False),
+    
+    # Industry indicators
+    # Appliance Shipments: Low = more repair demand
+    'appliance_shipments': (5, 15, True),
+    # Tech Wage Growth: Lower growth = easier to hire
+    'tech_wage_growth': (0, 10, True),
+    # Job Posting Volume: More postings = tighter labor
+    'job_posting_volume': (0, 100, True),
+    # Parts Availability: 1-5 scale, higher = better
+    'parts_availability': (1, 5, False),
+    
+    # Field report data
+    # Call Volume Sentiment: 1-5 scale, higher = better
+    'call_volume_sentiment': (1, 5, False),
+    # Parts Lead Time: Lower = better
+    'parts_lead_time': (1, 30, True),
+    # Hiring Difficulty: Lower = better
+    'hiring_difficulty': (1, 5, True),
+    # Business Sentiment: 1-5 scale, higher = better
+    'business_sentiment': (1, 5, False),
+}
+
 
 def normalize(value: float, min_val: float, max_val: float, inverse: bool = False) -> float:
     """
@@ -50,108 +94,102 @@ def normalize(value: float, min_val: float, max_val: float, inverse: bool = Fals
     return normalized
 
 
-def calculate_breakdown_index(data: Dict) -> float:
+def calculate_breakdown_index(
+    data: Dict,
+    ranges: Optional[Dict[str, Tuple[float, float]]] = None
+) -> float:
     """
     Calculate composite Breakdown Index score (0-100).
     Higher = better conditions for repair businesses.
     
     Args:
         data: Dictionary containing all indicator values
+        ranges: Optional (min, max) overrides per indicator, e.g. from
+            get_normalization_ranges(); NORMALIZATION_RANGES otherwise
     
     Returns:
         Composite score 0-100
     """
+    ranges = ranges or {}
     score = 0.0
     
-    # Economic indicators (higher is generally good for repair)
-    # Consumer Confidence: 50-120 historical range
-    if 'consumer_confidence' in data:
-        score += normalize(data['consumer_confidence'], 50, 120) * WEIGHTS['consumer_confidence']
-    
-    # Existing Home Sales: Low turnover = good for repair (inverse)
-    # Range: 3M - 7M units annually
-    if 'existing_home_sales' in data:
-        score += normalize(data['existing_home_sales'], 3.0, 7.0, inverse=True) * WEIGHTS['existing_home_sales']
-    
-    # Mortgage Rate: High rates = people stay put = good (inverse for high = good)
-    # Range: 2% - 8%
-    if 'mortgage_rate' in data:
-        # High rates keep people in homes = more repairs
-        score += normalize(data['mortgage_rate'], 2.0, 8.0) * WEIGHTS['mortgage_rate']
-    
-    # Appliance CPI: Higher new prices = more repair demand
-    # Range: 90 - 130 index
-    if 'appliance_cpi' in data:
-        score += normalize(data['appliance_cpi'], 90, 130) * WEIGHTS['appliance_cpi']
-    
-    # Industry indicators
-    # Appliance Shipments: Low = more repair demand (inverse)
-    if 'appliance_shipments' in data:
-        score += normalize(data['appliance_shipments'], 5, 15, inverse=True) * WEIGHTS['appliance_shipments']
-    
-    # Tech Wage Growth: Lower growth = easier to hire (inverse)
-    if 'tech_wage_growth' in data:
-        score += normalize(data['tech_wage_growth'], 0, 10, inverse=True) * WEIGHTS['tech_wage_growth']
-    
-    # Job Posting Volume: More postings = tighter labor (inverse)
-    if 'job_posting_volume' in data:
-        score += normalize(data['job_posting_volume'], 0, 100, inverse=True) * WEIGHTS['job_posting_volume']
+    for key, (min_val, max_val, inverse) in NORMALIZATION_RANGES.items():
+        if key in data:
+            min_val, max_val = ranges.get(key, (min_val, max_val))
+            score += normalize(data[key], min_val, max_val, inverse=inverse) * WEIGHTS[key]
     
-    # Parts Availability: 1-5 scale, higher = better
-    if 'parts_availability' in data:
-        score += normalize(data['parts_availability'], 1, 5) * WEIGHTS['parts_availability']
+    return round(score, 1)
+
+
+def calculate_breakdown_index_vectorized(
+    data: Mapping,
+    ranges: Optional[Dict[str, Tuple[float, float]]] = None
+) -> np.ndarray:
+    """
+    Vectorized calculate_breakdown_index over many rows at once.
     
-    # Field report data
-    # Call Volume Sentiment: 1-5 scale, higher = better
-    if 'call_volume_sentiment' in data:
-        score += normalize(data['call_volume_sentiment'], 1, 5) * WEIGHTS['call_volume_sentiment']
+    NaN values are skipped cell by cell, the way calculate_breakdown_index
+    skips missing keys, so a row with a gap scores exactly like the dict
+    without that key.
     
-    # Parts Lead Time: Lower = better (inverse)
-    if 'parts_lead_time' in data:
-        score += normalize(data['parts_lead_time'], 1, 30, inverse=True) * WEIGHTS['parts_lead_time']
+    Args:
+        data: Mapping of indicator name to array-like values (a DataFrame
+            works); all arrays must broadcast to the same shape
+        ranges: Optional (min, max) overrides per indicator
     
-    # Hiring Difficulty: Lower = better (inverse)
-    if 'hiring_difficulty' in data:
-        score += normalize(data['hiring_difficulty'], 1, 5, inverse=True) * WEIGHTS['hiring_difficulty']
+    Returns:
+        Array of composite scores 0-100, rounded to one decimal
+    """
+    ranges = ranges or {}
+    score = 0.0
     
-    # Business Sentiment: 1-5 scale, higher = better
-    if 'business_sentiment' in data:
-        score += normalize(data['business_sentiment'], 1, 5) * WEIGHTS['business_sentiment']
+    for key, (min_val, max_val, inverse) in NORMALIZATION_RANGES.items():
+        if key not in data:
+            continue
+        min_val, max_val = ranges.get(key, (min_val, max_val))
+        values = np.asarray(data[key], dtype=float)
+        if max_val == min_val:
+            normalized = np.full_like(values, 50.0)
+        else:
+            normalized = np.clip((values - min_val) / (max_val - min_val) * 100, 0, 100)
+            if inverse:
+                normalized = 100 - normalized
+        score = score + np.where(np.isnan(values), 0.0, normalized * WEIGHTS[key])
     
-    return round(score, 1)
+    return np.round(np.asarray(score, dtype=float), 1)
 
 
-def get_current_index() -> Dict:
+def get_current_index(metrics: Optional[Dict] = None) -> Dict:
     """
     Get the current Breakdown Index score and metadata.
     
+    Args:
+        metrics: Assembled metrics; fetched via get_current_metrics if omitted
+    
     Returns:
-        Dict with 'score', 'change', 'date', 'zone'
+        Dict with 'score', 'change', 'date', 'zone' and 'band' (bootstrap
+        confidence band, or None with too few field reports)
     """
-    # TODO: Replace with actual data fetching
-    # Mock data for development
-    mock_data = {
-        'consumer_confidence': 68.5,
-        'existing_home_sales': 4.1,
-        'mortgage_rate': 6.8,
-        'appliance_cpi': 108.5,
-        'appliance_shipments': 8.2,
-        'tech_wage_growth': 4.5,
-        'job_posting_volume': 62,
-        'parts_availability': 3.2,
-        'call_volume_sentiment': 3.4,
-        'parts_lead_time': 8.5,
-        'hiring_difficulty': 3.8,
-        'business_sentiment': 3.2,
-    }
+    if metrics is None:
+        from data.metrics_assembler import get_current_metrics
+        metrics = get_current_metrics()
+    
+    from data.range_engine import get_normalization_ranges
+    from data.uncertainty import get_index_band
+    ranges = get_normalization_ranges()
+    score = calculate_breakdown_index(metrics, ranges)
     
-    score = calculate_breakdown_index(mock_data)
+    # Compare against the latest snapshot from an earlier month
+    this_month = datetime.now().strftime('%Y-%m')
+    previous = [h for h in get_index_history() if h.get('period', '') < this_month]
+    change = round(score - previous[-1]['score'], 1) if previous else 0.0
     
     return {
         'score': score,
-        'change': 2.3,  # Mock: up 2.3 from last month
+        'change': change,
         'date': datetime.now().strftime('%B %Y'),
-        'zone': get_zone_name(score)
+        'zone': get_zone_name(score),
+        'band': get_index_band(score, change, metrics, ranges)
     }
 
 
@@ -169,15 +207,48 @@ def get_zone_name(score: float) -> str:
         return "Total Breakdown"
 
 
-def get_index_history() -> List[Dict]:
+def get_index_history(months: int = 12) -> List[Dict]:
     """
     Get historical index scores for sparkline display.
     
+    Reads the memory-mapped series store, then stored monthly snapshots
+    (both written by data/backfill.py); falls back to sample data until a
+    backfill has been run.
+    
+    Args:
+        months: Number of most recent months to return
+    
     Returns:
-        List of dicts with 'month' and 'score' keys
+        List of dicts with 'month' (short label), 'period' (YYYY-MM) and
+        'score' keys, oldest first
     """
-    # TODO: Replace with actual historical data
-    # Mock 12-month history
+    from data.series_store import INDEX_SERIES, from_day, get_series_store
+    stored = get_series_store().get_range(INDEX_SERIES)
+    if stored is not None and len(stored):
+        recent = stored[-months:]
+        return [
+            {
+                'month': datetime.strptime(from_day(day), '%Y-%m-%d').strftime('%b'),
+                'period': from_day(day)[:7],
+                'score': float(score),
+            }
+            for day, score in zip(recent['day'].tolist(), recent['value'].tolist())
+        ]
+    
+    from data.storage import get_storage
+    snapshots = get_storage().get_index_snapshots()[-months:]
+    
+    if snapshots:
+        return [
+            {
+                'month': datetime.strptime(s['month'], '%Y-%m').strftime('%b'),
+                'period': s['month'],
+                'score': float(s['score']),
+            }
+            for s in snapshots
+        ]
+    
+    # Sample 12-month history until snapshots exist
     return [
         {'month': 'Jan', 'score': 52},
         {'month': 'Feb', 'score': 54},
@@ -191,5 +262,4 @@ def get_index_history() -> List[Dict]:
         {'month': 'Oct', 'score': 55},
         {'month': 'Nov', 'score': 54},
         {'month': 'Dec', 'score': 56},
-    ]
-
+    ][-months:]
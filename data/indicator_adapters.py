@@ -0,0 +1,228 @@
+"""
+Indicator Adapters
+Convert raw FRED observations into model units and precompute derived
+series (month-over-month / year-over-year change, rolling means)
+"""
+import calendar
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from data.cache import LRUCache
+from data.fred_client import FRED_SERIES, get_fred_client
+
+
+# How much history to pull per series: enough for YoY plus a rolling window
+HISTORY_MONTHS = 15
+HISTORY_TTL = timedelta(hours=24)
+ROLLING_MONTHS = 3
+
+
+# Indicator name -> factor from native FRED units to the units
+# calculate_breakdown_index expects. Each series has one fixed unit, so the
+# factor never depends on the value. Indicators not listed pass through.
+UNIT_SCALES: Dict[str, float] = {
+    # EXHOSLUSM495S is a raw annual rate in units; the model uses millions
+    'existing_home_sales': 1e-6,
+}
+
+# Indicator name -> (expires_at, observations in model units)
+_history_cache = LRUCache(maxsize=32)
+
+# (indicator name, latest observation date) -> derived values
+_derived_cache = LRUCache(maxsize=64)
+
+
+def to_model_units(name: str, value):
+    """
+    Convert a raw FRED value, or a numpy array of them, for an indicator to
+    model units
+    """
+    scale = UNIT_SCALES.get(name)
+    return value * scale if scale is not None else value
+
+
+def adapt_observations(name: str, observations: List[Dict]) -> List[Dict]:
+    """
+    Convert raw FRED observations to model units.
+
+    Args:
+        name: Indicator name (a FRED_SERIES key)
+        observations: List of dicts with 'date' and 'value' keys
+
+    Returns:
+        Observations sorted by date with values in model units
+    """
+    adapted = [
+        {'date': obs['date'], 'value': to_model_units(name, obs['value'])}
+        for obs in observations
+    ]
+    adapted.sort(key=lambda obs: obs['date'])
+    return adapted
+
+
+def monthly_values(observations: List[Dict]) -> Dict[str, float]:
+    """
+    Align observations to month-end: the last observation in each month.
+
+    Args:
+        observations: Date-sorted observations
+
+    Returns:
+        Dict mapping 'YYYY-MM' to the month's last value
+    """
+    return {obs['date'][:7]: obs['value'] for obs in observations}
+
+
+def _months_before(day: date, months: int) -> date:
+    """Same day-of-month `months` earlier, clamped to the end of short months"""
+    year, month = divmod(day.year * 12 + day.month - 1 - months, 12)
+    month += 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def _pct_change(current: float, previous: Optional[float]) -> Optional[float]:
+    if previous is None or previous == 0:
+        return None
+    return (current - previous) / previous
+
+
+def compute_derived(name: str, observations: List[Dict]) -> Dict:
+    """
+    Compute the latest value and derived series for one indicator.
+
+    Changes are measured against the last observation on or before the
+    same date one (MoM) and twelve (YoY) months earlier, so weekly and
+    monthly series are handled alike.
+
+    Args:
+        name: Indicator name
+        observations: Date-sorted observations in model units
+
+    Returns:
+        Dict with keys '<name>', '<name>_date', '<name>_mom', '<name>_yoy',
+        '<name>_change' (alias of YoY) and '<name>_rolling_mean'
+    """
+    if not observations:
+        return {}
+
+    dates = [datetime.strptime(obs['date'], '%Y-%m-%d').date() for obs in observations]
+    values = [obs['value'] for obs in observations]
+    latest_date, latest = dates[-1], values[-1]
+
+    def value_as_of(day: date) -> Optional[float]:
+        i = bisect_right(dates, day)
+        return values[i - 1] if i else None
+
+    window_start = bisect_right(dates, _months_before(latest_date, ROLLING_MONTHS))
+    window = values[window_start:]
+
+    yoy = _pct_change(latest, value_as_of(_months_before(latest_date, 12)))
+    derived = {
+        name: latest,
+        f'{name}_date': observations[-1]['date'],
+        f'{name}_mom': _pct_change(latest, value_as_of(_months_before(latest_date, 1))),
+        f'{name}_yoy': yoy,
+        f'{name}_change': yoy,
+        f'{name}_rolling_mean': sum(window) / len(window),
+    }
+    return {k: v for k, v in derived.items() if v is not None}
+
+
+def history_start() -> str:
+    """First date (YYYY-MM-DD) of the history window"""
+    return _months_before(date.today(), HISTORY_MONTHS).isoformat()
+
+
+def stale_histories() -> Dict[str, str]:
+    """Indicator name -> FRED series ID for histories not cached or expired"""
+    now = datetime.now()
+    stale = {}
+    for name, series_id in FRED_SERIES.items():
+        cached = _history_cache.get(name)
+        if cached is None or now >= cached[0]:
+            stale[name] = series_id
+    return stale
+
+
+def prime_history(name: str, raw: List[Dict]) -> List[Dict]:
+    """
+    Adapt raw FRED history and cache it, e.g. after a batched fetch.
+
+    Returns:
+        Observations in model units
+    """
+    observations = adapt_observations(name, raw)
+
+    # Don't pin a failed or keyless fetch for a whole day
+    if observations:
+        _history_cache.set(name, (datetime.now() + HISTORY_TTL, observations))
+    return observations
+
+
+def cached_history(name: str) -> Optional[List[Dict]]:
+    """
+    Get an indicator's history only if it is cached, never fetching.
+
+    Returns:
+        Date-sorted observations in model units, or None if not cached or
+        expired
+    """
+    cached = _history_cache.get(name)
+    if cached and datetime.now() < cached[0]:
+        return cached[1]
+    return None
+
+
+def get_indicator_history(name: str) -> List[Dict]:
+    """
+    Get recent history for an indicator in model units (cached for 24h).
+
+    Args:
+        name: Indicator name (a FRED_SERIES key)
+
+    Returns:
+        Date-sorted observations, empty if no history is available
+    """
+    cached = cached_history(name)
+    if cached is not None:
+        return cached
+
+    raw = get_fred_client().get_series_history(FRED_SERIES[name], start_date=history_start())
+    return prime_history(name, raw)
+
+
+def get_indicator_values(name: str) -> Dict:
+    """
+    Get the latest model-unit value and derived series for an indicator.
+
+    Derived values are computed once per new observation and cached.
+    Without history (e.g. no API key) only the latest value is returned.
+
+    Args:
+        name: Indicator name (a FRED_SERIES key)
+
+    Returns:
+        Dict of values as described in compute_derived
+    """
+    observations = get_indicator_history(name)
+
+    if not observations:
+        latest = get_fred_client().get_series_latest(FRED_SERIES[name])
+        return {name: to_model_units(name, latest)} if latest is not None else {}
+
+    key = (name, observations[-1]['date'])
+    return dict(_derived_cache.get_or_compute(key, lambda: compute_derived(name, observations)))
+
+
+def get_all_indicator_values() -> Dict:
+    """
+    Get model-unit values and derived series for every FRED indicator.
+
+    Returns:
+        Flat dict merging get_indicator_values for each FRED_SERIES key
+    """
+    values: Dict = {}
+    for name in FRED_SERIES:
+        values.update(get_indicator_values(name))
+    return values
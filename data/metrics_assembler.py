@@ -0,0 +1,134 @@
+"""
+Metrics Assembler
+Gathers FRED indicators and field report aggregates into one metrics dict
+that feeds both the Breakdown Index and the error code engine
+"""
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from data.cache import LRUCache
+from data.async_client import load_inputs
+from data.indicator_adapters import (
+    get_all_indicator_values,
+    history_start,
+    prime_history,
+    stale_histories,
+)
+from data.storage import get_storage, get_data_version
+
+
+# How long an assembled snapshot is reused before FRED is consulted again.
+# FREDClient keeps its own 24h cache, so a refresh here is cheap.
+ASSEMBLY_TTL = timedelta(hours=1)
+
+# Field report aggregate key -> index input key
+FIELD_REPORT_KEYS = {
+    'call_volume_sentiment_avg': 'call_volume_sentiment',
+    'parts_lead_time_avg': 'parts_lead_time',
+    'hiring_difficulty_avg': 'hiring_difficulty',
+    'business_sentiment_avg': 'business_sentiment',
+}
+
+# Neutral field report values used before any reports arrive for the month
+FIELD_REPORT_DEFAULTS = {
+    'call_volume_sentiment_avg': 3.0,
+    'parts_lead_time_avg': 7.0,
+    'hiring_difficulty_avg': 3.0,
+    'business_sentiment_avg': 3.0,
+    'report_count': 0,
+}
+
+# Industry metrics without an automated source yet (AHAM, BLS, job boards).
+# Updated by hand each month.
+INDUSTRY_INPUTS = {
+    'appliance_shipments': 8.2,
+    'tech_wage_growth': 4.5,
+    'job_posting_volume': 62,
+    'parts_availability': 3.2,
+}
+
+# Editorial inputs for error codes that have no data feed
+EDITORIAL_INPUTS = {
+    'tariff_alert_active': True,
+    'r2r_laws_passed_this_year': 2,
+}
+
+# (data version, month) -> (expires_at, metrics)
+_assembled = LRUCache(maxsize=8)
+
+
+def _current_month() -> str:
+    return datetime.now().strftime('%Y-%m')
+
+
+def assemble_metrics(month: Optional[str] = None) -> Dict:
+    """
+    Fetch FRED indicators (in model units, with derived series) and field
+    report aggregates in one async pass and map them onto the index input
+    keys and the error code input keys.
+
+    Args:
+        month: Month to aggregate field reports for (YYYY-MM), default current
+
+    Returns:
+        Flat dict usable by both calculate_breakdown_index and
+        evaluate_error_codes
+    """
+    month = month or _current_month()
+
+    try:
+        inputs = load_inputs(
+            histories=stale_histories(),
+            history_start=history_start(),
+            field_month=month,
+        )
+        for name, raw in inputs['histories'].items():
+            prime_history(name, raw)
+        field_metrics = inputs['field']
+    except Exception as e:
+        # Fall back to the blocking clients
+        print(f"Error loading inputs asynchronously: {e}")
+        field_metrics = get_storage().get_aggregated_metrics(month)
+
+    # Histories are cached now; only series without history still fetch
+    indicators = get_all_indicator_values()
+
+    metrics: Dict = {}
+    metrics.update(INDUSTRY_INPUTS)
+    metrics.update(EDITORIAL_INPUTS)
+
+    metrics.update(indicators)
+
+    field = dict(FIELD_REPORT_DEFAULTS)
+    field.update(field_metrics)
+    metrics.update(field)
+    for aggregate_key, index_key in FIELD_REPORT_KEYS.items():
+        metrics[index_key] = field[aggregate_key]
+
+    metrics['month'] = month
+    return metrics
+
+
+def get_current_metrics(month: Optional[str] = None) -> Dict:
+    """
+    Get assembled metrics, memoized per data version.
+
+    The snapshot is rebuilt when a field report is saved or after
+    ASSEMBLY_TTL, whichever comes first.
+
+    Args:
+        month: Month (YYYY-MM), default current
+
+    Returns:
+        Assembled metrics dict (a copy, safe to mutate)
+    """
+    month = month or _current_month()
+    key = (get_data_version(), month)
+
+    cached = _assembled.get(key)
+    if cached is not None and datetime.now() < cached[0]:
+        return dict(cached[1])
+
+    metrics = assemble_metrics(month)
+    _assembled.set(key, (datetime.now() + ASSEMBLY_TTL, metrics))
+    return dict(metrics)
@@ -0,0 +1,113 @@
+"""
+Monthly Index Scoring
+Assembles one row of index inputs per month and scores every month in one
+vectorized pass; shared by the backfill CLI and the vintage store
+"""
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from data.index_calculator import (
+    COMPONENTS,
+    WEIGHTS,
+    calculate_breakdown_index_vectorized,
+)
+from data.metrics_assembler import (
+    FIELD_REPORT_DEFAULTS,
+    FIELD_REPORT_KEYS,
+    INDUSTRY_INPUTS,
+)
+
+
+# Stored metrics are rounded (and compared) at this precision
+COMPARE_DIGITS = 4
+
+
+def build_inputs(
+    fred: Dict[str, Dict[str, float]],
+    field: Dict[str, Dict],
+    start: str,
+    end: str
+) -> pd.DataFrame:
+    """
+    Assemble one row of index inputs per month.
+
+    FRED values are carried forward to months without a new observation;
+    months without field reports use the neutral field defaults.
+
+    Returns:
+        DataFrame indexed by month with one column per index input plus
+        report_count
+    """
+    months = pd.period_range(start, end, freq='M').strftime('%Y-%m')
+    frame = pd.DataFrame(index=pd.Index(months, name='month'))
+
+    for name, monthly in fred.items():
+        if name not in WEIGHTS or not monthly:
+            continue
+        series = pd.Series(monthly, dtype=float)
+        all_months = series.index.union(frame.index).sort_values()
+        frame[name] = series.reindex(all_months).ffill().reindex(frame.index)
+
+    for name, value in INDUSTRY_INPUTS.items():
+        frame[name] = value
+
+    field_frame = pd.DataFrame.from_dict(field, orient='index').reindex(frame.index)
+    for aggregate_key, index_key in FIELD_REPORT_KEYS.items():
+        column = field_frame[aggregate_key] if aggregate_key in field_frame else np.nan
+        frame[index_key] = pd.Series(column, index=frame.index).fillna(FIELD_REPORT_DEFAULTS[aggregate_key])
+    counts = field_frame['report_count'] if 'report_count' in field_frame else 0
+    frame['report_count'] = pd.Series(counts, index=frame.index).fillna(0).astype(int)
+
+    # Months before any FRED series starts can't be scored meaningfully
+    fred_columns = [name for name in fred if name in frame]
+    if not fred_columns:
+        return frame.iloc[0:0]
+    return frame.dropna(subset=fred_columns, how='all')
+
+
+def score_months(inputs: pd.DataFrame, ranges: Optional[Dict] = None) -> List[Dict]:
+    """
+    Score every month in one vectorized pass.
+
+    Months missing an input (e.g. before a FRED series starts) are scored
+    on the inputs they have, with the weights rescaled to the same total,
+    so early months are neither NaN nor biased low.
+
+    Returns:
+        index_snapshots rows with overall and component scores
+    """
+    inputs = inputs.copy()
+    input_columns = [key for key in WEIGHTS if key in inputs]
+
+    def present_weight(columns: List[str]) -> np.ndarray:
+        return sum(inputs[key].notna().to_numpy() * WEIGHTS[key] for key in columns)
+
+    total_weight = sum(WEIGHTS[key] for key in input_columns)
+    raw = calculate_breakdown_index_vectorized(inputs[input_columns], ranges)
+    scores = {'score': np.round(raw * total_weight / present_weight(input_columns), 1)}
+
+    for component, keys in COMPONENTS.items():
+        columns = [key for key in keys if key in inputs]
+        if not columns:
+            scores[f'{component}_score'] = np.zeros(len(inputs))
+            continue
+        partial = calculate_breakdown_index_vectorized(inputs[columns], ranges)
+        weight = present_weight(columns)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            scores[f'{component}_score'] = np.where(weight > 0, np.round(partial / weight, 1), 0.0)
+
+    rows = []
+    for i, (month, row) in enumerate(inputs.iterrows()):
+        metrics = {key: round(float(row[key]), COMPARE_DIGITS) for key in input_columns if pd.notna(row[key])}
+        rows.append({
+            'month': month,
+            'score': float(scores['score'][i]),
+            'economic_score': float(scores['economic_score'][i]),
+            'industry_score': float(scores['industry_score'][i]),
+            'field_score': float(scores['field_score'][i]),
+            'report_count': int(row['report_count']),
+            'metrics': metrics,
+        })
+    return rows
@@ -0,0 +1,385 @@
+"""
+News Archive
+Append-only archive of every headline the dashboard has fetched, with an
+incrementally maintained inverted index for BM25 search
+
+Items are stored one JSON object per line, so any process can append and
+every reader picks up new lines from its last file offset. Postings are
+append-only arrays of (doc id, term frequency); doc ids only grow, so
+postings stay sorted without any merging.
+
+Items older than ARCHIVE_RETENTION are dropped by periodically rewriting
+the file; readers notice the new file and rebuild their index from it.
+"""
+import hashlib
+import json
+import math
+import os
+import queue
+import re
+import tempfile
+import threading
+from array import array
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: compaction isn't coordinated across processes
+    fcntl = None
+
+import numpy as np
+
+from data.storage import DATA_DIR
+
+
+ARCHIVE_FILE = DATA_DIR / "news_archive.jsonl"
+
+# Items are kept this long after being archived, up to ARCHIVE_MAX_ITEMS
+ARCHIVE_RETENTION = timedelta(days=365)
+ARCHIVE_MAX_ITEMS = 20000
+# The file is rewritten once its oldest item is this far past retention, or
+# it holds this share more than ARCHIVE_MAX_ITEMS, so compaction is rare
+COMPACT_SLACK = timedelta(days=7)
+COMPACT_OVERFLOW = 0.25
+
+# Batches waiting for the background archiver; more are dropped, since
+# the same headlines come round again on the next feed fetch
+ARCHIVE_QUEUE_SIZE = 16
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Title terms count this many times, so headline matches outrank summaries
+TITLE_WEIGHT = 2
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has',
+    'in', 'is', 'it', 'its', 'of', 'on', 'or', 'that', 'the', 'to', 'was',
+    'were', 'will', 'with',
+}
+
+_TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords, with plural 's' folded"""
+    tokens = []
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def item_id(url: str) -> str:
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]
+
+
+class NewsArchive:
+    """Archive file plus an in-memory inverted index over it"""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or ARCHIVE_FILE
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        """Drop the in-memory index, to rebuild it from the start of the file"""
+        self.items: List[Dict] = []
+        self._ids = set()
+        self._postings: Dict[str, tuple] = {}
+        self._lengths = array('I')
+        self._total_length = 0
+        # Per-document category/source codes for filtering
+        self._codes = {'category': {}, 'source': {}}
+        self._doc_codes = {'category': array('H'), 'source': array('H')}
+        # Sorted non-empty categories and sources, None until next asked for
+        self._facets: Optional[Dict[str, List[str]]] = None
+        self._offset = 0
+        # Inode of the file the offset refers to; changes when compacted
+        self._inode: Optional[int] = None
+
+    def _index(self, item: Dict):
+        """Add one item to the in-memory index"""
+        doc = len(self.items)
+        self.items.append(item)
+        self._ids.add(item['id'])
+
+        counts: Dict[str, int] = {}
+        for token in tokenize(item.get('title', '')):
+            counts[token] = counts.get(token, 0) + TITLE_WEIGHT
+        for token in tokenize(item.get('summary', '')):
+            counts[token] = counts.get(token, 0) + 1
+
+        for token, tf in counts.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = (array('I'), array('H'))
+            postings[0].append(doc)
+            postings[1].append(min(tf, 65535))
+
+        length = sum(counts.values())
+        self._lengths.append(length)
+        self._total_length += length
+
+        for field, codes in self._codes.items():
+            value = item.get(field) or ''
+            if value not in codes:
+                codes[value] = len(codes)
+                self._facets = None
+            self._doc_codes[field].append(codes[value])
+
+    def _catch_up(self):
+        """
+        Index lines appended to the archive file since the last read.
+
+        A stat is all it costs when nothing changed. If the file was
+        compacted, the index is rebuilt from the new file.
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        if stat.st_ino != self._inode or stat.st_size < self._offset:
+            if self._inode is not None:
+                self._reset()
+            self._inode = stat.st_ino
+        elif stat.st_size == self._offset:
+            return
+
+        try:
+            with open(self.path, 'rb') as f:
+                if os.fstat(f.fileno()).st_ino != self._inode:
+                    return  # Replaced since the stat; pick it up next time
+                f.seek(self._offset)
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break  # A writer is mid-line; pick it up next time
+                    self._offset += len(line)
+                    try:
+                        item = json.loads(line)
+                    except ValueError:
+                        continue
+                    if item.get('id') not in self._ids:
+                        self._index(item)
+        except FileNotFoundError:
+            pass
+
+    def add(self, items: Iterable[Dict]) -> int:
+        """
+        Archive and index new items; items already archived are skipped.
+
+        Args:
+            items: Dicts with 'title', 'url', 'source', 'category' and
+                optionally 'summary' and 'published'
+
+        Returns:
+            Number of items added
+        """
+        with self._lock:
+            self._catch_up()
+            new, seen = [], set(self._ids)
+            for item in items:
+                if not item.get('url') or not item.get('title'):
+                    continue
+                record = {
+                    'id': item_id(item['url']),
+                    'title': item['title'],
+                    'summary': item.get('summary') or '',
+                    'url': item['url'],
+                    'source': item.get('source') or '',
+                    'category': item.get('category') or '',
+                    'published': item.get('published'),
+                    'archived_at': datetime.now().isoformat(timespec='seconds'),
+                }
+                if record['id'] in seen:
+                    continue
+                new.append(record)
+                seen.add(record['id'])
+            if not new:
+                return 0
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._file_lock():
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(''.join(json.dumps(record) + '\n' for record in new))
+                self._catch_up()
+                if self._needs_compaction():
+                    self._compact()
+            return len(new)
+
+    @contextmanager
+    def _file_lock(self):
+        """Serialize appends and compaction across processes"""
+        if fcntl is None:
+            yield
+            return
+        with open(self.path.with_suffix('.lock'), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _needs_compaction(self) -> bool:
+        if len(self.items) > ARCHIVE_MAX_ITEMS * (1 + COMPACT_OVERFLOW):
+            return True
+        if not self.items:
+            return False
+        cutoff = datetime.now() - ARCHIVE_RETENTION - COMPACT_SLACK
+        return self.items[0]['archived_at'] < cutoff.isoformat(timespec='seconds')
+
+    def _compact(self):
+        """
+        Rewrite the file without expired items, keeping at most
+        ARCHIVE_MAX_ITEMS, then rebuild the index from it.
+        Call with both locks held.
+        """
+        cutoff = (datetime.now() - ARCHIVE_RETENTION).isoformat(timespec='seconds')
+        kept = [item for item in self.items if item['archived_at'] >= cutoff][-ARCHIVE_MAX_ITEMS:]
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(''.join(json.dumps(item) + '\n' for item in kept))
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            os.unlink(tmp_path)
+            print(f"Error compacting news archive: {e}")
+            return
+        self._catch_up()
+
+    def search(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        source: Optional[str] = None,
+        limit: int = 20
+    ) -> List[Dict]:
+        """
+        Rank archived items against a query with BM25.
+
+        Args:
+            query: Free-text query; empty returns the most recent items
+            category: Only items in this RSS_FEEDS category
+            source: Only items from this source
+            limit: Maximum number of results
+
+        Returns:
+            Archived items, best match first, each with a 'score'
+        """
+        with self._lock:
+            self._catch_up()
+            n = len(self.items)
+            if not n:
+                return []
+
+            masks = []
+            for field, value in (('category', category), ('source', source)):
+                if value is None:
+                    continue
+                code = self._codes[field].get(value)
+                if code is None:
+                    return []
+                masks.append(np.array(self._doc_codes[field], dtype=np.uint16) == code)
+
+            terms = set(tokenize(query))
+            if not terms:
+                # No query: newest first within the filters
+                docs = np.arange(n)
+                for mask in masks:
+                    docs = docs[mask[docs]]
+                return [dict(self.items[i], score=0.0) for i in docs[::-1][:limit]]
+
+            lengths = np.array(self._lengths, dtype=float)
+            avg_length = self._total_length / n
+            scores = np.zeros(n)
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+                docs = np.array(postings[0], dtype=np.int64)
+                tf = np.array(postings[1], dtype=float)
+                idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[docs] / avg_length)
+                scores[docs] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+            for mask in masks:
+                scores[~mask] = 0.0
+            matched = np.flatnonzero(scores)
+            if not len(matched):
+                return []
+            if len(matched) > limit:
+                matched = matched[np.argpartition(-scores[matched], limit - 1)[:limit]]
+            # Best score first, newer items first on ties
+            ranked = sorted(matched.tolist(), key=lambda i: (-scores[i], -i))
+            return [dict(self.items[i], score=round(float(scores[i]), 3)) for i in ranked]
+
+    def facets(self) -> Dict[str, List[str]]:
+        """Categories and sources present in the archive"""
+        with self._lock:
+            self._catch_up()
+            if self._facets is None:
+                self._facets = {field: sorted(v for v in codes if v) for field, codes in self._codes.items()}
+            return {field: list(values) for field, values in self._facets.items()}
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._catch_up()
+            return len(self.items)
+
+
+_archive: Optional[NewsArchive] = None
+_archive_lock = threading.Lock()
+
+# Batches of items waiting for the background archiver
+_pending: "queue.Queue[List[Dict]]" = queue.Queue(maxsize=ARCHIVE_QUEUE_SIZE)
+_worker: Optional[threading.Thread] = None
+_worker_lock = threading.Lock()
+
+
+def get_news_archive() -> NewsArchive:
+    """Get the process-wide news archive"""
+    global _archive
+    if _archive is None:
+        with _archive_lock:
+            if _archive is None:
+                _archive = NewsArchive()
+    return _archive
+
+
+def _archive_worker():
+    while True:
+        items = _pending.get()
+        try:
+            get_news_archive().add(items)
+        except Exception as e:
+            print(f"Error archiving news: {e}")
+        finally:
+            _pending.task_done()
+
+
+def archive_in_background(items: List[Dict]):
+    """
+    Queue items for the single background archiver thread, so archiving
+    stays off the render path without a thread per call.
+
+    Args:
+        items: As for NewsArchive.add; dropped if the queue is full
+    """
+    global _worker
+    if _worker is None:
+        with _worker_lock:
+            if _worker is None:
+                _worker = threading.Thread(target=_archive_worker, name="news-archiver", daemon=True)
+                _worker.start()
+    try:
+        _pending.put_nowait(items)
+    except queue.Full:
+        print("News archive queue full; dropping a batch")
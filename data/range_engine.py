@@ -0,0 +1,300 @@
+"""
+Normalization Range Engine
+Data-driven (min, max) bounds for each index indicator, computed as rolling
+percentiles over FRED history and monthly field report averages
+"""
+import math
+import threading
+from bisect import bisect_left, insort
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from data.cache import SingleFlight
+from data.fred_client import FRED_SERIES, get_fred_client
+from data.index_calculator import NORMALIZATION_RANGES
+from data.indicator_adapters import adapt_observations, get_indicator_history
+from data.metrics_assembler import FIELD_REPORT_KEYS
+from data.storage import ANSWER_COUNT_KEYS, aggregate_by_month, get_data_version, get_storage
+
+
+# Rolling window and percentiles used as the normalization bounds
+FRED_WINDOW_YEARS = 20
+FIELD_WINDOW_YEARS = 5
+LOWER_PERCENTILE = 0.02
+UPPER_PERCENTILE = 0.98
+
+# Below these counts the static NORMALIZATION_RANGES are used instead
+MIN_FRED_OBSERVATIONS = 24
+MIN_FIELD_MONTHS = 12
+
+# How long a failed or empty FRED seed is remembered before retrying, so
+# reruns without an API key don't re-request the whole window every time
+SEED_RETRY = timedelta(minutes=10)
+
+# Bounds narrower than this fraction of the static range are widened around
+# their midpoint so a quiet period doesn't amplify noise into big swings
+MIN_SPAN_FRACTION = 0.25
+
+# FRED indicators that feed the index
+FRED_INDICATORS = [name for name in FRED_SERIES if name in NORMALIZATION_RANGES]
+
+
+class RangeTracker:
+    """
+    Rolling percentile bounds over a date-keyed series.
+
+    Values are kept in a sorted list so each update is a binary-search
+    insert and reading the bounds is an O(1) index lookup. Not thread-safe;
+    callers serialize access.
+    """
+
+    def __init__(self, window_years: int, min_points: int):
+        self.window = timedelta(days=365 * window_years)
+        self.min_points = min_points
+        self._points: Dict[str, float] = {}
+        self._dates: List[str] = []
+        self._sorted: List[float] = []
+
+    @property
+    def last_date(self) -> Optional[str]:
+        """Most recent observation date, or None if empty"""
+        return self._dates[-1] if self._dates else None
+
+    def update(self, day: str, value: float):
+        """
+        Add or revise the observation for a date (YYYY-MM-DD or YYYY-MM).
+
+        Observations older than the rolling window are evicted.
+        """
+        previous = self._points.get(day)
+        if previous == value:
+            return
+
+        if previous is None:
+            insort(self._dates, day)
+        else:
+            del self._sorted[bisect_left(self._sorted, previous)]
+
+        self._points[day] = value
+        insort(self._sorted, value)
+        self._evict()
+
+    def _evict(self):
+        cutoff = (_parse_day(self._dates[-1]) - self.window).isoformat()
+        while self._dates and self._dates[0] < cutoff:
+            old = self._dates.pop(0)
+            del self._sorted[bisect_left(self._sorted, self._points.pop(old))]
+
+    def bounds(self) -> Optional[Tuple[float, float]]:
+        """Percentile (min, max) bounds, or None with too little history"""
+        n = len(self._sorted)
+        if n < self.min_points:
+            return None
+        lower = self._sorted[int(LOWER_PERCENTILE * (n - 1))]
+        upper = self._sorted[math.ceil(UPPER_PERCENTILE * (n - 1))]
+        return lower, upper
+
+    def __len__(self) -> int:
+        return len(self._sorted)
+
+
+def _parse_day(day: str) -> date:
+    if len(day) == 7:  # YYYY-MM
+        day = f'{day}-01'
+    return datetime.strptime(day, '%Y-%m-%d').date()
+
+
+def _enforce_min_span(name: str, bounds: Tuple[float, float]) -> Tuple[float, float]:
+    """Widen bounds that are too narrow relative to the static range"""
+    default_min, default_max, _ = NORMALIZATION_RANGES[name]
+    min_span = (default_max - default_min) * MIN_SPAN_FRACTION
+    lower, upper = bounds
+    if upper - lower >= min_span:
+        return bounds
+    mid = (lower + upper) / 2
+    return mid - min_span / 2, mid + min_span / 2
+
+
+def _update_field_trackers(trackers: Dict[str, RangeTracker], month: str, aggregates: Dict):
+    """
+    Feed a month's field report aggregates to the trackers, skipping
+    questions nobody answered that month, whose averages are placeholders
+    """
+    for aggregate_key, index_key in FIELD_REPORT_KEYS.items():
+        if aggregates.get(ANSWER_COUNT_KEYS[aggregate_key]):
+            trackers[index_key].update(month, aggregates[aggregate_key])
+
+
+_fred_trackers: Dict[str, RangeTracker] = {}
+_field_trackers: Dict[str, RangeTracker] = {}
+_field_version: Optional[int] = None
+# Indicator name -> time before which a failed seed isn't retried
+_seed_failures: Dict[str, datetime] = {}
+
+# Guards the tracker dicts, the trackers themselves, _field_version and
+# _seed_failures; fetches happen outside it
+_trackers_lock = threading.Lock()
+# Coalesces concurrent seeds of the same trackers
+_seed_flight = SingleFlight()
+
+
+def _seed_fred_tracker(name: str) -> Optional[RangeTracker]:
+    """
+    Load the full rolling window of FRED history for an indicator once.
+
+    Returns:
+        The installed tracker, or None if the history couldn't be loaded
+    """
+    with _trackers_lock:
+        tracker = _fred_trackers.get(name)
+        retry_at = _seed_failures.get(name)
+    if tracker is not None:
+        return tracker
+    if retry_at is not None and datetime.now() < retry_at:
+        return None
+
+    tracker = RangeTracker(FRED_WINDOW_YEARS, MIN_FRED_OBSERVATIONS)
+    start = (date.today() - tracker.window).isoformat()
+    try:
+        raw = get_fred_client().get_series_history(FRED_SERIES[name], start_date=start)
+        for obs in adapt_observations(name, raw):
+            tracker.update(obs['date'], obs['value'])
+    except Exception as e:
+        print(f"Error seeding range for {name}: {e}")
+
+    with _trackers_lock:
+        if not len(tracker):
+            _seed_failures[name] = datetime.now() + SEED_RETRY
+            return None
+        _seed_failures.pop(name, None)
+        _fred_trackers[name] = tracker
+    return tracker
+
+
+def _refresh_fred_ranges():
+    """Seed each FRED tracker once, then append only new observations"""
+    for name in FRED_INDICATORS:
+        with _trackers_lock:
+            tracker = _fred_trackers.get(name)
+        if tracker is None:
+            tracker = _seed_flight.do(('fred', name), lambda: _seed_fred_tracker(name))
+            if tracker is None:
+                continue
+
+        observations = get_indicator_history(name)
+        with _trackers_lock:
+            last = tracker.last_date
+            for obs in observations:
+                if last is None or obs['date'] >= last:
+                    tracker.update(obs['date'], obs['value'])
+
+
+def _seed_field_trackers(version: int):
+    """Build the field report trackers from every stored report"""
+    with _trackers_lock:
+        if _field_trackers:
+            return
+
+    monthly = aggregate_by_month(get_storage().get_field_reports())
+    trackers = {
+        index_key: RangeTracker(FIELD_WINDOW_YEARS, MIN_FIELD_MONTHS)
+        for index_key in FIELD_REPORT_KEYS.values()
+    }
+    for month, aggregates in monthly.items():
+        _update_field_trackers(trackers, month, aggregates)
+
+    global _field_version
+    with _trackers_lock:
+        _field_trackers.update(trackers)
+        _field_version = version
+
+
+def _refresh_field_ranges():
+    """
+    Build field report trackers on first use, then re-aggregate only the
+    current month when the storage data version changes (reports are only
+    ever submitted for the current month).
+    """
+    global _field_version
+    version = get_data_version()
+    with _trackers_lock:
+        seeded = bool(_field_trackers)
+        if seeded and version == _field_version:
+            return
+
+    if not seeded:
+        _seed_flight.do('field', lambda: _seed_field_trackers(version))
+        return
+
+    month = datetime.now().strftime('%Y-%m')
+    aggregates = get_storage().get_aggregated_metrics(month)
+    with _trackers_lock:
+        if aggregates:
+            _update_field_trackers(_field_trackers, month, aggregates)
+        _field_version = version
+
+
+def ranges_from_history(
+    fred: Dict[str, List[Dict]],
+    field: Dict[str, Dict]
+) -> Dict[str, Tuple[float, float]]:
+    """
+    Compute normalization bounds from a given history rather than the live
+    trackers, e.g. to score a month with the ranges that applied back then.
+
+    Each window ends at the latest observation supplied, so passing only
+    what was published by a date gives the bounds as of that date.
+
+    Args:
+        fred: Indicator name -> adapted observations ('date', 'value')
+        field: Month (YYYY-MM) -> field report aggregates
+
+    Returns:
+        Dict mapping indicator names to (min, max) bounds, omitting
+        indicators without enough history
+    """
+    trackers: Dict[str, RangeTracker] = {}
+    for name, observations in fred.items():
+        if name not in FRED_INDICATORS:
+            continue
+        tracker = trackers[name] = RangeTracker(FRED_WINDOW_YEARS, MIN_FRED_OBSERVATIONS)
+        for obs in observations:
+            tracker.update(obs['date'], obs['value'])
+
+    for index_key in FIELD_REPORT_KEYS.values():
+        trackers[index_key] = RangeTracker(FIELD_WINDOW_YEARS, MIN_FIELD_MONTHS)
+    for month, aggregates in field.items():
+        if aggregates:
+            _update_field_trackers(trackers, month, aggregates)
+
+    ranges = {}
+    for name, tracker in trackers.items():
+        bounds = tracker.bounds()
+        if bounds is not None:
+            ranges[name] = _enforce_min_span(name, bounds)
+    return ranges
+
+
+def get_normalization_ranges() -> Dict[str, Tuple[float, float]]:
+    """
+    Get data-driven (min, max) bounds for every indicator with enough history.
+
+    Indicators without enough history are omitted, so
+    calculate_breakdown_index falls back to NORMALIZATION_RANGES for them.
+
+    Returns:
+        Dict mapping indicator names to (min, max) bounds
+    """
+    try:
+        _refresh_fred_ranges()
+        _refresh_field_ranges()
+    except Exception as e:
+        print(f"Error refreshing normalization ranges: {e}")
+
+    ranges = {}
+    with _trackers_lock:
+        for name, tracker in list(_fred_trackers.items()) + list(_field_trackers.items()):
+            bounds = tracker.bounds()
+            if bounds is not None:
+                ranges[name] = _enforce_min_span(name, bounds)
+    return ranges
@@ -0,0 +1,168 @@
+"""
+API Rate Limiting
+Token bucket shared by every process using the same API key, with priority
+lanes so interactive requests are served ahead of bulk jobs
+"""
+import asyncio
+import hashlib
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: the bucket is only shared within a process
+    fcntl = None
+
+from data.singleflight import LOCK_DIR
+
+
+# FRED allows ~120 requests per minute per key. A bucket can spend its full
+# burst and then a minute of refill inside one minute, so burst + 60 * rate
+# is kept at the quota.
+FRED_REQUESTS_PER_MINUTE = 120
+FRED_BURST = 10
+FRED_RATE = (FRED_REQUESTS_PER_MINUTE - FRED_BURST) / 60
+
+INTERACTIVE = 'interactive'
+BACKFILL = 'backfill'
+
+# Tokens each lane must leave in the bucket. Backfill traffic only spends
+# tokens above this reserve, so interactive fetches never queue behind it.
+LANE_RESERVE = {
+    INTERACTIVE: 0,
+    BACKFILL: FRED_BURST // 2,
+}
+
+# Longest an interactive request waits for a token before giving up
+MAX_INTERACTIVE_WAIT = 10.0
+
+# After a 429, every process backs off this long
+THROTTLED_BACKOFF = 30.0
+
+# Bucket file: tokens (f8), last refill wall-clock time (f8)
+BUCKET_STATE = struct.Struct('<dd')
+
+
+class RateLimitTimeout(Exception):
+    """Raised when no token became available within the allowed wait"""
+
+
+class TokenBucket:
+    """
+    Token bucket whose state lives in a small file, updated under an
+    exclusive flock, so every process with the same file shares one budget.
+    """
+
+    def __init__(self, path: Path, rate: float, capacity: float):
+        self.path = path
+        self.rate = rate
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._tokens = capacity
+        self._updated = time.time()
+
+    def _update(self, change) -> float:
+        """Refill, apply change(tokens) -> (tokens, result) atomically, return result"""
+        with self._lock:
+            if fcntl is None:
+                tokens, updated = self._tokens, self._updated
+                tokens, result = change(self._refill(tokens, updated))
+                self._tokens, self._updated = tokens, time.time()
+                return result
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                raw = os.pread(fd, BUCKET_STATE.size, 0)
+                if len(raw) == BUCKET_STATE.size:
+                    tokens, updated = BUCKET_STATE.unpack(raw)
+                else:
+                    tokens, updated = self.capacity, time.time()
+                tokens, result = change(self._refill(tokens, updated))
+                os.pwrite(fd, BUCKET_STATE.pack(tokens, time.time()), 0)
+                return result
+            finally:
+                os.close(fd)
+
+    def _refill(self, tokens: float, updated: float) -> float:
+        elapsed = max(0.0, time.time() - updated)
+        return min(self.capacity, tokens + elapsed * self.rate)
+
+    def try_acquire(self, reserve: float = 0) -> float:
+        """
+        Take one token if more than reserve are available.
+
+        Returns:
+            0 if a token was taken, else seconds until one should be
+        """
+        def change(tokens):
+            if tokens - 1 >= reserve:
+                return tokens - 1, 0.0
+            return tokens, (reserve + 1 - tokens) / self.rate
+
+        return self._update(change)
+
+    def acquire(self, lane: str = INTERACTIVE, timeout: Optional[float] = None):
+        """
+        Block until a token is available in the given lane.
+
+        Args:
+            lane: INTERACTIVE or BACKFILL
+            timeout: Longest wait in seconds, None to wait indefinitely
+
+        Raises:
+            RateLimitTimeout: If no token became available in time
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        reserve = LANE_RESERVE.get(lane, 0)
+        while True:
+            wait = self.try_acquire(reserve)
+            if not wait:
+                return
+            if deadline is not None and time.monotonic() + wait > deadline:
+                raise RateLimitTimeout(f"No {lane} token within {timeout}s")
+            time.sleep(wait)
+
+    async def acquire_async(self, lane: str = INTERACTIVE, timeout: Optional[float] = None):
+        """
+        Like acquire, yielding to the event loop while waiting. The bucket
+        is read under a file lock, so each attempt runs in a worker thread.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        reserve = LANE_RESERVE.get(lane, 0)
+        while True:
+            wait = await asyncio.to_thread(self.try_acquire, reserve)
+            if not wait:
+                return
+            if deadline is not None and time.monotonic() + wait > deadline:
+                raise RateLimitTimeout(f"No {lane} token within {timeout}s")
+            await asyncio.sleep(wait)
+
+    def throttle(self, seconds: float = THROTTLED_BACKOFF):
+        """Empty the bucket so every process pauses for about seconds"""
+        self._update(lambda tokens: (-seconds * self.rate, None))
+
+    def available(self) -> float:
+        """Tokens currently in the bucket"""
+        return self._update(lambda tokens: (tokens, tokens))
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_fred_bucket(api_key: str) -> TokenBucket:
+    """Get the shared bucket for a FRED API key"""
+    digest = hashlib.sha1(api_key.encode('utf-8')).hexdigest()[:16]
+    with _buckets_lock:
+        bucket = _buckets.get(digest)
+        if bucket is None:
+            bucket = _buckets[digest] = TokenBucket(
+                LOCK_DIR / f"fred-{digest}.bucket", FRED_RATE, FRED_BURST
+            )
+        return bucket
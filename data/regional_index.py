@@ -0,0 +1,153 @@
+"""
+Regional Breakdown Index
+Scores every region x month in one vectorized pass over field reports,
+joined with the national FRED and industry inputs
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from data.cache import LRUCache
+from data.index_calculator import (
+    NORMALIZATION_RANGES,
+    calculate_breakdown_index_vectorized,
+    get_zone_name,
+)
+from data.indicator_adapters import get_indicator_history, monthly_values
+from data.metrics_assembler import (
+    ASSEMBLY_TTL,
+    FIELD_REPORT_DEFAULTS,
+    FIELD_REPORT_KEYS,
+    get_current_metrics,
+)
+from data.range_engine import FRED_INDICATORS, get_normalization_ranges
+from data.storage import REGIONS, get_data_version, get_storage
+
+
+# Privacy threshold promised on the About page
+MIN_REGIONAL_RESPONSES = 10
+
+# Raw field report column -> index input key
+REPORT_COLUMNS = {
+    'call_volume': 'call_volume_sentiment',
+    'parts_lead_time': 'parts_lead_time',
+    'hiring_difficulty': 'hiring_difficulty',
+    'business_sentiment': 'business_sentiment',
+}
+
+MATRIX_COLUMNS = ['month', 'region', 'report_count', 'suppressed', 'score'] + list(REPORT_COLUMNS.values())
+
+# data version -> (expires_at, matrix frame, {(month, region): cell})
+_matrix_cache = LRUCache(maxsize=4)
+
+
+def _national_inputs(months: List[str]) -> pd.DataFrame:
+    """
+    National (non field report) inputs for each month.
+
+    FRED indicators use the month-end value from recent history, carried
+    forward to months without an observation; anything else falls back to
+    the current assembled metrics.
+    """
+    current = get_current_metrics()
+    field_keys = set(FIELD_REPORT_KEYS.values())
+    national_keys = [key for key in NORMALIZATION_RANGES if key not in field_keys and key in current]
+
+    frame = pd.DataFrame(index=pd.Index(months, name='month'))
+    for key in national_keys:
+        column = pd.Series(np.nan, index=frame.index)
+        if key in FRED_INDICATORS:
+            monthly = pd.Series(monthly_values(get_indicator_history(key)), dtype=float)
+            if not monthly.empty:
+                all_months = monthly.index.union(frame.index).sort_values()
+                column = monthly.reindex(all_months).ffill().reindex(frame.index)
+        frame[key] = column.fillna(current[key])
+    return frame
+
+
+def compute_regional_matrix() -> pd.DataFrame:
+    """
+    Compute the Breakdown Index for every (month, region) cell.
+
+    Cells with fewer than MIN_REGIONAL_RESPONSES reports are marked
+    suppressed and their score and field values are blanked.
+
+    Returns:
+        DataFrame indexed by (month, region) with report_count, suppressed,
+        score and the field report inputs
+    """
+    reports = pd.DataFrame(get_storage().get_field_reports())
+    if reports.empty or not {'month', 'region'} <= set(reports.columns):
+        return pd.DataFrame(columns=MATRIX_COLUMNS).set_index(['month', 'region'])
+
+    for column in REPORT_COLUMNS:
+        reports[column] = pd.to_numeric(reports[column], errors='coerce') if column in reports else np.nan
+
+    grouped = reports.groupby(['month', 'region'])
+    cells = grouped[list(REPORT_COLUMNS)].mean().rename(columns=REPORT_COLUMNS)
+    cells['report_count'] = grouped.size()
+    cells = cells.reset_index()
+
+    for aggregate_key, index_key in FIELD_REPORT_KEYS.items():
+        cells[index_key] = cells[index_key].fillna(FIELD_REPORT_DEFAULTS[aggregate_key])
+
+    national = _national_inputs(sorted(cells['month'].unique()))
+    cells = cells.join(national, on='month')
+
+    cells['score'] = calculate_breakdown_index_vectorized(cells, get_normalization_ranges())
+    cells['suppressed'] = cells['report_count'] < MIN_REGIONAL_RESPONSES
+    cells.loc[cells['suppressed'], ['score'] + list(REPORT_COLUMNS.values())] = np.nan
+
+    return cells[MATRIX_COLUMNS].set_index(['month', 'region']).sort_index()
+
+
+def _get_cached_matrix() -> tuple:
+    """Get (matrix, lookup) for the current data version, rebuilding if stale"""
+    key = get_data_version()
+    cached = _matrix_cache.get(key)
+    if cached is not None and datetime.now() < cached[0]:
+        return cached[1], cached[2]
+
+    matrix = compute_regional_matrix()
+    lookup = {
+        cell_key: dict(row, zone=None if row['suppressed'] else get_zone_name(row['score']))
+        for cell_key, row in zip(matrix.index, matrix.to_dict('records'))
+    }
+    _matrix_cache.set(key, (datetime.now() + ASSEMBLY_TTL, matrix, lookup))
+    return matrix, lookup
+
+
+def get_regional_index(month: str, region: str) -> Optional[Dict]:
+    """
+    Look up the precomputed regional index for one cell.
+
+    Args:
+        month: Month (YYYY-MM)
+        region: One of REGIONS
+
+    Returns:
+        Dict with 'score', 'zone', 'report_count', 'suppressed' and the field
+        inputs, or None if no reports exist for the cell
+    """
+    _, lookup = _get_cached_matrix()
+    cell = lookup.get((month, region))
+    return dict(cell) if cell is not None else None
+
+
+def get_regional_matrix(value: str = 'score') -> pd.DataFrame:
+    """
+    Get the precomputed region x month matrix for one column.
+
+    Args:
+        value: Matrix column to pivot, e.g. 'score' or 'report_count'
+
+    Returns:
+        DataFrame with months as rows and REGIONS as columns; suppressed or
+        empty cells are NaN
+    """
+    matrix, _ = _get_cached_matrix()
+    if matrix.empty:
+        return pd.DataFrame(columns=REGIONS)
+    return matrix[value].unstack('region').reindex(columns=REGIONS)
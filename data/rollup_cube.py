@@ -0,0 +1,230 @@
+"""
+Field Report Rollup Cube
+Precomputed counts, sums and answer histograms for every combination of
+month x region x company_size x trying_to_hire, maintained incrementally
+"""
+import threading
+from bisect import bisect_right
+from itertools import product
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+from data.storage import add_save_listener, get_storage
+
+
+DIMENSIONS = ('month', 'region', 'company_size', 'trying_to_hire')
+
+# Marker for a rolled-up ("all values") dimension in a cell key
+ALL = '*'
+
+# k-anonymity threshold, matching the regional privacy rule
+MIN_CELL_RESPONSES = 10
+
+# Histogram bucket left edges per survey question; the last edge is exclusive
+HISTOGRAM_BINS = {
+    'call_volume': [1, 2, 3, 4, 5, 6],
+    'parts_lead_time': [1, 4, 8, 15, 31, 61],
+    'hiring_difficulty': [1, 2, 3, 4, 5, 6],
+    'business_sentiment': [1, 2, 3, 4, 5, 6],
+}
+
+# Display labels for the parts lead time buckets
+LEAD_TIME_LABELS = ['1-3 days', '4-7 days', '8-14 days', '15-30 days', '31-60 days']
+
+
+def _new_cell() -> Dict:
+    return {
+        'count': 0,
+        'sums': {q: 0.0 for q in HISTOGRAM_BINS},
+        'answered': {q: 0 for q in HISTOGRAM_BINS},
+        'histograms': {q: [0] * (len(edges) - 1) for q, edges in HISTOGRAM_BINS.items()},
+    }
+
+
+class RollupCube:
+    """
+    Rollup cube over the field report dimensions.
+
+    Every report updates all 2^4 roll-up cells it belongs to, so any slice
+    (any mix of fixed and rolled-up dimensions) is a single dict lookup.
+
+    Cells under the k-anonymity threshold are suppressed, and so are enough
+    complementary cells that no suppressed cell can be recovered by
+    subtracting its visible siblings from their rolled-up total.
+    """
+
+    def __init__(self):
+        self._cells: Dict[Tuple, Dict] = {}
+        self._values: Dict[str, set] = {dim: set() for dim in DIMENSIONS}
+        # Ids of reports already added, so a report seen twice counts once
+        self._ids: Set[str] = set()
+        # min_count -> suppressed cell keys, dropped whenever a report is added
+        self._suppressed: Dict[int, Set[Tuple]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, report: Dict):
+        """Add one field report to every cell it rolls up into (once per id)"""
+        coords = tuple(report.get(dim) for dim in DIMENSIONS)
+        answers = {}
+        for question, edges in HISTOGRAM_BINS.items():
+            value = report.get(question)
+            if value is None:
+                continue
+            bucket = bisect_right(edges, value) - 1
+            if 0 <= bucket < len(edges) - 1:
+                answers[question] = (value, bucket)
+
+        with self._lock:
+            report_id = report.get('id')
+            if report_id is not None:
+                if report_id in self._ids:
+                    return
+                self._ids.add(report_id)
+            self._suppressed.clear()
+
+            for dim, value in zip(DIMENSIONS, coords):
+                self._values[dim].add(value)
+
+            for mask in product((False, True), repeat=len(DIMENSIONS)):
+                key = tuple(ALL if rolled else value for rolled, value in zip(mask, coords))
+                cell = self._cells.get(key)
+                if cell is None:
+                    cell = self._cells[key] = _new_cell()
+                cell['count'] += 1
+                for question, (value, bucket) in answers.items():
+                    cell['sums'][question] += value
+                    cell['answered'][question] += 1
+                    cell['histograms'][question][bucket] += 1
+
+    def _key(self, filters: Dict) -> Tuple:
+        unknown = set(filters) - set(DIMENSIONS)
+        if unknown:
+            raise ValueError(f"Unknown cube dimensions: {sorted(unknown)}")
+        return tuple(filters[dim] if filters.get(dim) is not None else ALL for dim in DIMENSIONS)
+
+    def _suppressed_cells(self, min_count: int) -> Set[Tuple]:
+        """
+        Keys of every cell to suppress at a threshold. Call with the lock held.
+
+        Starts from the cells under min_count. Then, for each rolled-up
+        total and the cells it breaks down into along one dimension, any
+        hidden cells must be at least two and hold at least min_count
+        reports between them; otherwise the smallest visible sibling is
+        hidden too. This repeats until no group changes, since a
+        complement can expose a cell in another dimension's breakdown.
+        """
+        suppressed = self._suppressed.get(min_count)
+        if suppressed is not None:
+            return suppressed
+
+        suppressed = {key for key, cell in self._cells.items() if cell['count'] < min_count}
+        # (total key, breakdown dimension) -> keys of the cells it sums
+        groups: Dict[Tuple, List[Tuple]] = {}
+        for key in self._cells:
+            for i, value in enumerate(key):
+                if value != ALL:
+                    total = key[:i] + (ALL,) + key[i + 1:]
+                    groups.setdefault((total, i), []).append(key)
+
+        changed = True
+        while changed:
+            changed = False
+            for (total, _), members in groups.items():
+                if total in suppressed:
+                    continue
+                hidden = [key for key in members if key in suppressed]
+                if not hidden:
+                    continue
+                hidden_count = sum(self._cells[key]['count'] for key in hidden)
+                if len(hidden) >= 2 and hidden_count >= min_count:
+                    continue
+                visible = [key for key in members if key not in suppressed]
+                if visible:
+                    suppressed.add(min(visible, key=lambda k: (self._cells[k]['count'], str(k))))
+                    changed = True
+
+        self._suppressed[min_count] = suppressed
+        return suppressed
+
+    def slice(self, min_count: int = MIN_CELL_RESPONSES, **filters) -> Dict:
+        """
+        Read one cube cell.
+
+        Args:
+            min_count: k-anonymity threshold; smaller cells are suppressed
+            **filters: Fixed dimension values, e.g. month='2025-12';
+                omitted dimensions are rolled up
+
+        Returns:
+            Dict with 'count' and 'suppressed'; unsuppressed cells also carry
+            'means' and 'histograms' per survey question
+        """
+        key = self._key(filters)
+        with self._lock:
+            cell = self._cells.get(key)
+            if cell is None:
+                return {'count': 0, 'suppressed': True}
+            if key in self._suppressed_cells(min_count):
+                return {'count': cell['count'], 'suppressed': True}
+            return {
+                'count': cell['count'],
+                'suppressed': False,
+                'means': {
+                    q: cell['sums'][q] / cell['answered'][q]
+                    for q in HISTOGRAM_BINS if cell['answered'][q]
+                },
+                'histograms': {q: list(h) for q, h in cell['histograms'].items()},
+            }
+
+    def drill_down(
+        self,
+        dimension: str,
+        min_count: int = MIN_CELL_RESPONSES,
+        **filters
+    ) -> Dict[Hashable, Dict]:
+        """
+        Slice every value of one dimension under the given filters.
+
+        Args:
+            dimension: Dimension to break out, e.g. 'region'
+            min_count: k-anonymity threshold
+            **filters: Other fixed dimension values
+
+        Returns:
+            Dict mapping each seen dimension value to its slice
+        """
+        with self._lock:
+            values = sorted(self._values[dimension], key=str)
+        return {
+            value: self.slice(min_count=min_count, **dict(filters, **{dimension: value}))
+            for value in values
+        }
+
+    def dimension_values(self, dimension: str) -> List:
+        """All values seen for a dimension"""
+        with self._lock:
+            return sorted(self._values[dimension], key=str)
+
+
+_cube: Optional[RollupCube] = None
+_cube_lock = threading.Lock()
+
+
+def get_rollup_cube() -> RollupCube:
+    """
+    Get the process-wide rollup cube.
+
+    Built from all stored reports on first use, then kept current by a
+    save listener so later reports are folded in as they are saved. The
+    listener is registered before the load, so a report saved meanwhile
+    is never missed; the cube ignores it if the load returns it too.
+    """
+    global _cube
+    if _cube is None:
+        with _cube_lock:
+            if _cube is None:
+                cube = RollupCube()
+                add_save_listener(cube.add)
+                for report in get_storage().get_field_reports():
+                    cube.add(report)
+                _cube = cube
+    return _cube
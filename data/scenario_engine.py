@@ -0,0 +1,158 @@
+"""
+Scenario Engine
+Vectorized what-if analysis on top of WEIGHTS and the normalization ranges
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data.index_calculator import NORMALIZATION_RANGES, calculate_breakdown_index_vectorized
+
+
+# Default tornado swing per indicator, as a fraction of its normalization range
+TORNADO_SWING = 0.10
+
+
+def _effective_range(name: str, ranges: Optional[Dict]) -> Tuple[float, float]:
+    min_val, max_val, _ = NORMALIZATION_RANGES[name]
+    return (ranges or {}).get(name, (min_val, max_val))
+
+
+def evaluate_scenarios(
+    base: Dict,
+    deltas: Dict[str, np.ndarray],
+    ranges: Optional[Dict[str, Tuple[float, float]]] = None
+) -> np.ndarray:
+    """
+    Score many perturbed copies of the base inputs in one pass.
+
+    Args:
+        base: Base indicator values (e.g. from get_current_metrics)
+        deltas: Indicator name -> array of absolute changes to apply; arrays
+            must broadcast to a common shape
+        ranges: Normalization range overrides
+
+    Returns:
+        Array of index scores, one per scenario
+
+    Raises:
+        KeyError: If a delta names an indicator the index doesn't use, or
+            one missing from base (there is nothing to change it from)
+    """
+    inputs = {key: base[key] for key in NORMALIZATION_RANGES if key in base}
+    for name, delta in deltas.items():
+        if name not in NORMALIZATION_RANGES:
+            raise KeyError(f"Unknown indicator: {name}")
+        if name not in inputs:
+            raise KeyError(f"No base value to apply a delta to: {name}")
+        inputs[name] = inputs[name] + np.asarray(delta, dtype=float)
+    return calculate_breakdown_index_vectorized(inputs, ranges)
+
+
+def sweep(
+    base: Dict,
+    indicator: str,
+    values: np.ndarray,
+    ranges: Optional[Dict[str, Tuple[float, float]]] = None
+) -> np.ndarray:
+    """
+    Score the index across absolute values of a single indicator.
+
+    Args:
+        base: Base indicator values
+        indicator: Indicator to vary
+        values: Values to set the indicator to
+        ranges: Normalization range overrides
+
+    Returns:
+        Array of index scores aligned with values
+
+    Raises:
+        KeyError: If the index doesn't use the indicator
+    """
+    if indicator not in NORMALIZATION_RANGES:
+        raise KeyError(f"Unknown indicator: {indicator}")
+    values = np.asarray(values, dtype=float)
+    # Values are absolute, so a missing base value can start from zero
+    return evaluate_scenarios(dict(base, **{indicator: 0.0}), {indicator: values}, ranges)
+
+
+def factorial_grid(
+    base: Dict,
+    axes: Dict[str, np.ndarray],
+    ranges: Optional[Dict[str, Tuple[float, float]]] = None
+) -> pd.DataFrame:
+    """
+    Score every combination of deltas across several indicators.
+
+    Args:
+        base: Base indicator values
+        axes: Indicator name -> 1-D array of absolute deltas
+        ranges: Normalization range overrides
+
+    Returns:
+        DataFrame with one delta column per indicator plus 'score', one row
+        per combination
+    """
+    names = list(axes)
+    mesh = np.meshgrid(*(np.asarray(axes[name], dtype=float) for name in names), indexing='ij')
+    flat = {name: grid.ravel() for name, grid in zip(names, mesh)}
+    grid = pd.DataFrame(flat)
+    grid['score'] = evaluate_scenarios(base, flat, ranges)
+    return grid
+
+
+def tornado(
+    base: Dict,
+    swings: Optional[Dict[str, float]] = None,
+    ranges: Optional[Dict[str, Tuple[float, float]]] = None
+) -> List[Dict]:
+    """
+    One-at-a-time sensitivity of the index to each indicator.
+
+    Every indicator is moved down and up by its swing while the others stay
+    at base; all 2k scenarios are scored in a single vectorized call.
+
+    Args:
+        base: Base indicator values
+        swings: Indicator name -> absolute swing; defaults to TORNADO_SWING
+            of each indicator's normalization range
+        ranges: Normalization range overrides
+
+    Returns:
+        List of dicts with 'indicator', 'swing', 'low_score', 'high_score'
+        and 'impact', sorted by impact (largest first)
+    """
+    names = [key for key in NORMALIZATION_RANGES if key in base]
+    if swings is None:
+        swings = {}
+        for name in names:
+            min_val, max_val = _effective_range(name, ranges)
+            swings[name] = (max_val - min_val) * TORNADO_SWING
+    names = [name for name in names if name in swings]
+    if not names:
+        return []
+
+    # Rows 0..k-1 move each indicator down, rows k..2k-1 move it up
+    k = len(names)
+    deltas = {}
+    for i, name in enumerate(names):
+        column = np.zeros(2 * k)
+        column[i] = -swings[name]
+        column[k + i] = swings[name]
+        deltas[name] = column
+    scores = evaluate_scenarios(base, deltas, ranges)
+
+    results = [
+        {
+            'indicator': name,
+            'swing': swings[name],
+            'low_score': float(scores[i]),
+            'high_score': float(scores[k + i]),
+            'impact': float(abs(scores[k + i] - scores[i])),
+        }
+        for i, name in enumerate(names)
+    ]
+    results.sort(key=lambda r: r['impact'], reverse=True)
+    return results
@@ -0,0 +1,212 @@
+"""
+Binary Time-Series Store
+Compact, memory-mapped file of fixed-width (day, value) records per series,
+shared through the page cache by every process that reads it
+
+File layout (little-endian):
+    header   magic b'BKTS', format version (u4), series count (u4)
+    index    per series: key (32 bytes, UTF-8, NUL padded), first record (u8),
+             record count (u8)
+    records  (day i4 = days since 1970-01-01, value f8), sorted by day
+"""
+import os
+import struct
+import tempfile
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from data.storage import DATA_DIR
+
+
+STORE_FILE = DATA_DIR / "series_store.bin"
+
+# Key of the monthly Breakdown Index series
+INDEX_SERIES = 'breakdown_index'
+
+# Stored history older than this is only used when the FRED API is unavailable
+STORE_MAX_AGE = timedelta(days=2)
+
+MAGIC = b'BKTS'
+FORMAT_VERSION = 1
+KEY_BYTES = 32
+HEADER = struct.Struct('<4sII')
+INDEX_ENTRY = struct.Struct(f'<{KEY_BYTES}sQQ')
+RECORD_DTYPE = np.dtype([('day', '<i4'), ('value', '<f8')])
+
+EPOCH = date(1970, 1, 1)
+
+
+def to_day(value: str) -> int:
+    """Convert 'YYYY-MM-DD' or 'YYYY-MM' to days since the epoch"""
+    if len(value) == 7:
+        value = f'{value}-01'
+    return (datetime.strptime(value, '%Y-%m-%d').date() - EPOCH).days
+
+
+def from_day(day: int) -> str:
+    """Convert days since the epoch to 'YYYY-MM-DD'"""
+    return (EPOCH + timedelta(days=int(day))).isoformat()
+
+
+def write_series_store(
+    series: Dict[str, Tuple[Sequence[str], Sequence[float]]],
+    path: Optional[Path] = None
+):
+    """
+    Write a complete store atomically.
+
+    The new file is written beside the old one and renamed over it, so
+    readers holding a mapping of the old file are never disturbed.
+
+    Args:
+        series: Series key -> (dates, values); dates as 'YYYY-MM-DD' or 'YYYY-MM'
+        path: Destination file, default STORE_FILE
+    """
+    path = path or STORE_FILE
+    blocks = []
+    for key, (dates, values) in series.items():
+        encoded = key.encode('utf-8')
+        if len(encoded) > KEY_BYTES:
+            raise ValueError(f"Series key too long: {key}")
+        records = np.empty(len(dates), dtype=RECORD_DTYPE)
+        records['day'] = [to_day(d) for d in dates]
+        records['value'] = values
+        records.sort(order='day')
+        blocks.append((encoded, records))
+
+    header_size = HEADER.size + INDEX_ENTRY.size * len(blocks)
+    # Align the record section so numpy views start on an 8-byte boundary
+    header_size += -header_size % 8
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(blocks)))
+            first = 0
+            for encoded, records in blocks:
+                f.write(INDEX_ENTRY.pack(encoded, first, len(records)))
+                first += len(records)
+            f.write(b'\0' * (header_size - f.tell()))
+            for _, records in blocks:
+                f.write(records.tobytes())
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+
+class SeriesStore:
+    """Read-only, memory-mapped view of a series store file"""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or STORE_FILE
+        self._records: Optional[np.ndarray] = None
+        self._index: Dict[str, Tuple[int, int]] = {}
+        self._stat: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        """Re-map the file if it has been replaced since the last read"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self._records, self._index, self._stat = None, {}, None
+            return
+
+        signature = (stat.st_ino, stat.st_mtime_ns)
+        if signature == self._stat:
+            return
+
+        with open(self.path, 'rb') as f:
+            magic, version, count = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError(f"Unsupported series store format in {self.path}")
+            index = {}
+            for _ in range(count):
+                key, first, n = INDEX_ENTRY.unpack(f.read(INDEX_ENTRY.size))
+                index[key.rstrip(b'\0').decode('utf-8')] = (first, n)
+
+        header_size = HEADER.size + INDEX_ENTRY.size * count
+        header_size += -header_size % 8
+        total = sum(n for _, n in index.values())
+        records = (
+            np.memmap(self.path, dtype=RECORD_DTYPE, mode='r', offset=header_size, shape=(total,))
+            if total else np.empty(0, dtype=RECORD_DTYPE)
+        )
+        self._records, self._index, self._stat = records, index, signature
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            self._refresh()
+            return list(self._index)
+
+    def modified_at(self) -> Optional[datetime]:
+        """When the store file was last written, or None if missing"""
+        try:
+            return datetime.fromtimestamp(os.stat(self.path).st_mtime)
+        except FileNotFoundError:
+            return None
+
+    def get_range(
+        self,
+        key: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Get records for a series within [start, end].
+
+        Args:
+            key: Series key
+            start: First date (inclusive), 'YYYY-MM-DD' or 'YYYY-MM'
+            end: Last date (inclusive)
+
+        Returns:
+            Zero-copy structured array view with 'day' and 'value' fields,
+            or None if the series is not stored
+        """
+        with self._lock:
+            self._refresh()
+            if key not in self._index:
+                return None
+            first, n = self._index[key]
+            records = self._records[first:first + n]
+
+        days = records['day']
+        lo = np.searchsorted(days, to_day(start), side='left') if start else 0
+        hi = np.searchsorted(days, to_day(end), side='right') if end else n
+        return records[lo:hi]
+
+    def get_observations(
+        self,
+        key: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> Optional[List[Dict]]:
+        """Like get_range, as a list of {'date', 'value'} dicts"""
+        records = self.get_range(key, start, end)
+        if records is None:
+            return None
+        return [
+            {'date': from_day(day), 'value': float(value)}
+            for day, value in zip(records['day'].tolist(), records['value'].tolist())
+        ]
+
+
+_store: Optional[SeriesStore] = None
+_store_lock = threading.Lock()
+
+
+def get_series_store() -> SeriesStore:
+    """Get the process-wide series store reader"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SeriesStore()
+    return _store
@@ -0,0 +1,170 @@
+"""
+Request Coalescing
+Singleflight helpers so concurrent cache misses for the same key trigger
+one upstream fetch, within a process and across processes
+"""
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process coalescing only
+    fcntl = None
+
+from data.cache import SingleFlight
+from data.storage import DATA_DIR
+
+
+LOCK_DIR = DATA_DIR / "locks"
+
+# How long a result file is reused. It exists to hand the leader's result
+# to processes that waited on the lock, not as a cache; callers keep their
+# own caches for that.
+HANDOFF_MAX_AGE = timedelta(seconds=30)
+
+# Longest a process waits for another's fetch before fetching itself, in
+# case the holder is hung; the lock is polled with growing intervals
+LOCK_TIMEOUT = 30.0
+LOCK_POLL_MIN = 0.01
+LOCK_POLL_MAX = 0.25
+
+
+class FileSingleFlight:
+    """
+    Coalesces calls across processes with per-key lock files.
+
+    The first process to take a key's lock runs the fetch and leaves its
+    JSON-serializable result beside the lock; processes that were waiting
+    on the lock read that result instead of fetching again. Threads within
+    a process are coalesced first, so only one thread per process ever
+    waits on the file lock, and never for longer than LOCK_TIMEOUT.
+    """
+
+    def __init__(self, directory: Optional[Path] = None):
+        self.directory = directory or LOCK_DIR
+        self._local = SingleFlight()
+
+    def _paths(self, key: str):
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return self.directory / f"{digest}.lock", self.directory / f"{digest}.json"
+
+    def _read_result(self, path: Path, max_age: timedelta) -> Any:
+        try:
+            if time.time() - os.stat(path).st_mtime > max_age.total_seconds():
+                return None
+            return json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+
+    def _write_result(self, path: Path, result: Any):
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(result, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            os.unlink(tmp_path)
+            print(f"Error sharing result for {path.name}: {e}")
+
+    def _acquire(self, lock_file) -> bool:
+        """Take the lock without blocking, retrying until LOCK_TIMEOUT"""
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        poll = LOCK_POLL_MIN
+        while True:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True
+            except BlockingIOError:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(poll, remaining))
+            poll = min(poll * 2, LOCK_POLL_MAX)
+
+    def _locked(self, key: str, fn: Callable[[], Any], max_age: timedelta) -> Any:
+        if fcntl is None:
+            return fn()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        lock_path, result_path = self._paths(key)
+        with open(lock_path, 'a') as lock_file:
+            if not self._acquire(lock_file):
+                print(f"Timed out waiting for {lock_path.name}; fetching without it")
+                shared = self._read_result(result_path, max_age)
+                return shared if shared is not None else fn()
+            try:
+                shared = self._read_result(result_path, max_age)
+                if shared is not None:
+                    return shared
+                result = fn()
+                if result is not None:
+                    self._write_result(result_path, result)
+                return result
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def last_result(self, key: str) -> Any:
+        """Most recent result any process shared for key, however old, or None"""
+        _, result_path = self._paths(key)
+        try:
+            return json.loads(result_path.read_text())
+        except (OSError, ValueError):
+            return None
+
+    def do(self, key: str, fn: Callable[[], Any], max_age: timedelta = HANDOFF_MAX_AGE) -> Any:
+        """
+        Run fn once across threads and processes for key.
+
+        Args:
+            key: Coalescing key
+            fn: Zero-argument callable; its result must be JSON-serializable
+                and is not shared when None
+            max_age: How long a result left by another process is reused;
+                the default only covers handing it to waiters
+
+        Returns:
+            fn's result, or a recent result from another process
+        """
+        return self._local.do(key, lambda: self._locked(key, fn, max_age))
+
+    async def do_async(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        max_age: timedelta = HANDOFF_MAX_AGE
+    ) -> Any:
+        """
+        Like do, for a zero-argument coroutine function.
+
+        Waiting on the lock happens in a worker thread so the event loop
+        keeps running; the leader's fn runs back on the calling loop.
+        """
+        loop = asyncio.get_running_loop()
+
+        def run() -> Any:
+            return asyncio.run_coroutine_threadsafe(fn(), loop).result()
+
+        return await asyncio.to_thread(self.do, key, run, max_age)
+
+
+_flight: Optional[FileSingleFlight] = None
+_flight_lock = threading.Lock()
+
+
+def get_singleflight() -> FileSingleFlight:
+    """Get the process-wide cross-process singleflight"""
+    global _flight
+    if _flight is None:
+        with _flight_lock:
+            if _flight is None:
+                _flight = FileSingleFlight()
+    return _flight
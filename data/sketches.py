@@ -0,0 +1,189 @@
+"""
+Streaming Quantile Sketches
+Mergeable per-(month, region) distribution sketches for survey answers
+"""
+import math
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from data.storage import add_save_listener, get_storage
+
+
+# Answer domain per survey question (inclusive). Every question is an
+# integer on a small fixed scale, so a counting sketch over the domain is
+# exact, O(1) per update and trivially mergeable.
+QUESTION_DOMAINS = {
+    'parts_lead_time': (1, 60),
+    'call_volume': (1, 5),
+    'hiring_difficulty': (1, 5),
+    'business_sentiment': (1, 5),
+}
+
+# Quantiles are only reported with at least this many answers (k-anonymity)
+MIN_SKETCH_RESPONSES = 10
+
+
+class HistogramSketch:
+    """Exact, mergeable quantile sketch for integers in a fixed range"""
+
+    def __init__(self, low: int, high: int):
+        self.low = low
+        self.high = high
+        self.counts = [0] * (high - low + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value: float):
+        """Add one answer; values outside the domain are clamped"""
+        bucket = min(max(int(round(value)), self.low), self.high) - self.low
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total += value
+
+    def merge(self, other: "HistogramSketch") -> "HistogramSketch":
+        """Return a new sketch combining this one and other"""
+        merged = HistogramSketch(self.low, self.high)
+        merged.update(self)
+        merged.update(other)
+        return merged
+
+    def update(self, other: "HistogramSketch"):
+        """Merge other into this sketch in place"""
+        if (self.low, self.high) != (other.low, other.high):
+            raise ValueError("Cannot merge sketches with different domains")
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.count += other.count
+        self.total += other.total
+
+    def quantile(self, q: float) -> Optional[int]:
+        """
+        Nearest-rank quantile.
+
+        Args:
+            q: Quantile in [0, 1], e.g. 0.5 for the median
+
+        Returns:
+            Answer value at that quantile, or None if the sketch is empty
+        """
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for offset, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return self.low + offset
+        return self.high
+
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+
+def _new_sketches() -> Dict[str, HistogramSketch]:
+    return {q: HistogramSketch(low, high) for q, (low, high) in QUESTION_DOMAINS.items()}
+
+
+class SketchStore:
+    """Per-(month, region) sketches for every survey question"""
+
+    def __init__(self):
+        self._sketches: Dict[Tuple[str, str], Dict[str, HistogramSketch]] = {}
+        # Ids of reports already added, so a report seen twice counts once
+        self._ids: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def add(self, report: Dict):
+        """Fold one field report into its (month, region) sketches (once per id)"""
+        key = (report.get('month'), report.get('region'))
+        with self._lock:
+            report_id = report.get('id')
+            if report_id is not None:
+                if report_id in self._ids:
+                    return
+                self._ids.add(report_id)
+            sketches = self._sketches.get(key)
+            if sketches is None:
+                sketches = self._sketches[key] = _new_sketches()
+            for question, sketch in sketches.items():
+                if report.get(question) is not None:
+                    sketch.add(report[question])
+
+    def merged(
+        self,
+        question: str,
+        months: Optional[Iterable[str]] = None,
+        regions: Optional[Iterable[str]] = None
+    ) -> HistogramSketch:
+        """
+        Merge sketches for a question across months and regions.
+
+        Args:
+            question: Survey question key (see QUESTION_DOMAINS)
+            months: Months to include, all if omitted
+            regions: Regions to include, all if omitted
+
+        Returns:
+            Combined sketch
+        """
+        months = set(months) if months is not None else None
+        regions = set(regions) if regions is not None else None
+        low, high = QUESTION_DOMAINS[question]
+        result = HistogramSketch(low, high)
+        with self._lock:
+            for (month, region), sketches in self._sketches.items():
+                if months is not None and month not in months:
+                    continue
+                if regions is not None and region not in regions:
+                    continue
+                result.update(sketches[question])
+        return result
+
+
+_store: Optional[SketchStore] = None
+_store_lock = threading.Lock()
+
+
+def get_sketch_store() -> SketchStore:
+    """
+    Get the process-wide sketch store.
+
+    Built from stored reports on first use, then updated by a save listener.
+    The listener is registered before the load, so a report saved meanwhile
+    is never missed; the store ignores it if the load returns it too.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                store = SketchStore()
+                add_save_listener(store.add)
+                for report in get_storage().get_field_reports():
+                    store.add(report)
+                _store = store
+    return _store
+
+
+def get_quantiles(
+    question: str,
+    quantiles: Tuple[float, ...] = (0.5, 0.9),
+    months: Optional[List[str]] = None,
+    regions: Optional[List[str]] = None
+) -> Optional[Dict[float, int]]:
+    """
+    Get quantiles for a survey question across the selected months/regions.
+
+    Args:
+        question: Survey question key, e.g. 'parts_lead_time'
+        quantiles: Quantiles to report
+        months: Months to include, all if omitted
+        regions: Regions to include, all if omitted
+
+    Returns:
+        Dict mapping each quantile to its value, or None when fewer than
+        MIN_SKETCH_RESPONSES answers are available
+    """
+    sketch = get_sketch_store().merged(question, months=months, regions=regions)
+    if sketch.count < MIN_SKETCH_RESPONSES:
+        return None
+    return {q: sketch.quantile(q) for q in quantiles}
@@ -5,10 +5,14 @@ Supports both local JSON (dev) and Supabase (production)
 """
 import os
 import json
-from typing import Dict, List, Optional
-from datetime import datetime
+import threading
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+from datetime import datetime, timedelta
 from pathlib import Path
 
+from data.cache import LRUCache, StripedCache
+
 # Try Streamlit secrets first (for Streamlit Cloud), then env vars
 def get_secret(key: str) -> Optional[str]:
     try:
@@ -25,6 +29,28 @@ USE_SUPABASE = bool(get_secret('SUPABASE_URL'))
 DATA_DIR = Path(__file__).parent / "local_data"
 REPORTS_FILE = DATA_DIR / "field_reports.json"
 CACHE_FILE = DATA_DIR / "indicator_cache.json"
+SNAPSHOTS_FILE = DATA_DIR / "index_snapshots.json"
+
+# Regions a field report can be filed under
+REGIONS = [
+    "Northeast",
+    "Southeast",
+    "Midwest",
+    "Southwest",
+    "West Coast",
+    "Mountain West",
+    "Canada",
+]
+
+# How long index snapshots are reused before re-reading them
+SNAPSHOT_TTL = timedelta(hours=1)
+# How long report counts and aggregates are reused. Saves in this process
+# invalidate them immediately; this bounds how long reports saved by other
+# processes, replicas or directly in the database take to show up.
+AGGREGATE_TTL = timedelta(minutes=5)
+# How long the shared data stamp is reused, so however many sessions poll
+# it a process asks the backend at most once per interval
+DATA_STAMP_TTL = timedelta(seconds=15)
 
 
 def _ensure_local_storage():
@@ -34,6 +60,175 @@ def _ensure_local_storage():
         REPORTS_FILE.write_text("[]")
     if not CACHE_FILE.exists():
         CACHE_FILE.write_text("{}")
+    if not SNAPSHOTS_FILE.exists():
+        SNAPSHOTS_FILE.write_text("[]")
+
+
+# Process-wide aggregate caches shared by every session, keyed on (month, region).
+# A None component means "all months" / "all regions". Striped so concurrent
+# sessions compute each aggregate once, and a save can't be overtaken by an
+# aggregate that was computed before it.
+_metrics_cache = StripedCache(maxsize=256)
+_count_cache = StripedCache(maxsize=256)
+# Holds a single (expires_at, snapshots) entry
+_snapshot_cache = LRUCache(maxsize=1)
+# Holds a single (expires_at, stamp) entry
+_stamp_cache = LRUCache(maxsize=1)
+_data_version = 0
+# Last data stamp seen, to detect changes made by other processes
+_last_stamp: Optional[str] = None
+# Guards _data_version, _last_stamp and _save_listeners
+_state_lock = threading.Lock()
+
+# Callables notified with each successfully saved report
+_save_listeners: List[Callable[[Dict], None]] = []
+
+
+def get_data_version() -> int:
+    """
+    Get a counter that increases every time this process saves a field
+    report or refresh_data_version() sees another process's change
+    """
+    return _data_version
+
+
+def refresh_data_version() -> int:
+    """
+    Check the shared storage for changes made by any process.
+
+    Compares the backend's data stamp (latest report and snapshot writes)
+    with the last one seen. When it moved, every cached aggregate and
+    snapshot is dropped and the data version is bumped, so callers keyed
+    on get_data_version() reload too.
+
+    Returns:
+        The data version after the check
+    """
+    global _data_version, _last_stamp
+    cached = _stamp_cache.get('stamp')
+    if cached is not None and datetime.now() < cached[0]:
+        stamp = cached[1]
+    else:
+        stamp = get_storage().get_data_stamp()
+        _stamp_cache.set('stamp', (datetime.now() + DATA_STAMP_TTL, stamp))
+    
+    with _state_lock:
+        changed = stamp is not None and _last_stamp is not None and stamp != _last_stamp
+        if stamp is not None:
+            _last_stamp = stamp
+        if changed:
+            _data_version += 1
+    
+    if changed:
+        _metrics_cache.invalidate()
+        _count_cache.invalidate()
+        _snapshot_cache.invalidate()
+    return _data_version
+
+
+def add_save_listener(listener: Callable[[Dict], None]):
+    """Register a callable to be notified of every saved field report"""
+    with _state_lock:
+        if listener not in _save_listeners:
+            _save_listeners.append(listener)
+
+
+def _on_report_saved(report: Dict):
+    """Write-through invalidation of every cached aggregate the report affects"""
+    global _data_version
+    with _state_lock:
+        _data_version += 1
+        listeners = list(_save_listeners)
+    
+    month, region = report.get('month'), report.get('region')
+    
+    def affected(key) -> bool:
+        key_month, key_region = key
+        return key_month in (None, month) and key_region in (None, region)
+    
+    _metrics_cache.invalidate(affected)
+    _count_cache.invalidate(affected)
+    
+    for listener in listeners:
+        try:
+            listener(report)
+        except Exception as e:
+            print(f"Save listener error: {e}")
+
+
+def _with_id(report: Dict) -> Dict:
+    """Copy of a report with a client-side id, so listeners can tell saves apart"""
+    return dict(report, id=report.get('id') or str(uuid.uuid4()))
+
+
+def _cached_aggregate(cache: StripedCache, key, compute: Callable[[], Any]) -> Any:
+    """Read a count or aggregate through a shared cache, recomputing after AGGREGATE_TTL"""
+    _, value = cache.get_or_compute(
+        key,
+        lambda: (datetime.now() + AGGREGATE_TTL, compute()),
+        valid=lambda entry: datetime.now() < entry[0],
+    )
+    return value
+
+
+def _cached_snapshots(load: Callable[[], List[Dict]]) -> List[Dict]:
+    """Read index snapshots through the shared cache"""
+    cached = _snapshot_cache.get('all')
+    if cached is not None and datetime.now() < cached[0]:
+        return list(cached[1])
+    snapshots = sorted(load(), key=lambda s: s['month'])
+    _snapshot_cache.set('all', (datetime.now() + SNAPSHOT_TTL, snapshots))
+    return list(snapshots)
+
+
+# Aggregate key -> key counting the reports that actually answered the
+# question; averages with no answers hold a neutral placeholder instead
+ANSWER_COUNT_KEYS = {
+    'call_volume_sentiment_avg': 'call_volume_answered',
+    'parts_lead_time_avg': 'parts_lead_time_answered',
+    'business_sentiment_avg': 'business_sentiment_answered',
+    'hiring_difficulty_avg': 'hiring_difficulty_answered',
+}
+
+
+def aggregate_reports(reports: List[Dict]) -> Dict:
+    """
+    Average the survey answers across a list of field reports.
+
+    Questions nobody answered get a neutral placeholder average; the
+    ANSWER_COUNT_KEYS entries say how many real answers each average has.
+    """
+    if not reports:
+        return {}
+    
+    def answers(question: str) -> List[float]:
+        return [r[question] for r in reports if r.get(question) is not None]
+    
+    call_volumes = answers('call_volume')
+    lead_times = answers('parts_lead_time')
+    sentiments = answers('business_sentiment')
+    difficulties = answers('hiring_difficulty')
+    
+    return {
+        'call_volume_sentiment_avg': sum(call_volumes) / len(call_volumes) if call_volumes else 3.0,
+        'parts_lead_time_avg': sum(lead_times) / len(lead_times) if lead_times else 7.0,
+        'business_sentiment_avg': sum(sentiments) / len(sentiments) if sentiments else 3.0,
+        'hiring_difficulty_avg': sum(difficulties) / len(difficulties) if difficulties else 3.0,
+        'call_volume_answered': len(call_volumes),
+        'parts_lead_time_answered': len(lead_times),
+        'business_sentiment_answered': len(sentiments),
+        'hiring_difficulty_answered': len(difficulties),
+        'report_count': len(reports)
+    }
+
+
+def aggregate_by_month(reports: List[Dict]) -> Dict[str, Dict]:
+    """Aggregate field reports per month (YYYY-MM), skipping undated ones"""
+    by_month: Dict[str, List[Dict]] = {}
+    for report in reports:
+        if report.get('month'):
+            by_month.setdefault(report['month'], []).append(report)
+    return {month: aggregate_reports(month_reports) for month, month_reports in by_month.items()}
 
 
 class LocalStorage:
@@ -41,13 +236,18 @@ class LocalStorage:
     
     def __init__(self):
         _ensure_local_storage()
+        # Serializes read-modify-write of the JSON files
+        self._write_lock = threading.Lock()
     
     def save_field_report(self, report: Dict) -> bool:
         """Save a field report submission"""
+        report = _with_id(report)
         try:
-            reports = json.loads(REPORTS_FILE.read_text())
-            reports.append(report)
-            REPORTS_FILE.write_text(json.dumps(reports, indent=2))
+            with self._write_lock:
+                reports = json.loads(REPORTS_FILE.read_text())
+                reports.append(report)
+                REPORTS_FILE.write_text(json.dumps(reports, indent=2))
+            _on_report_saved(report)
             return True
         except Exception as e:
             print(f"Error saving report: {e}")
@@ -60,51 +260,58 @@ class LocalStorage:
     ) -> List[Dict]:
         """Get field reports, optionally filtered"""
         try:
-            reports = json.loads(REPORTS_FILE.read_text())
-            
-            if month:
-                reports = [r for r in reports if r.get('timestamp', '').startswith(month)]
-            if region:
-                reports = [r for r in reports if r.get('region') == region]
-            
-            return reports
+            return self._query_field_reports(month, region)
         except Exception:
             return []
     
-    def get_report_count(self, month: Optional[str] = None) -> int:
-        """Get count of reports"""
-        return len(self.get_field_reports(month=month))
-    
-    def get_aggregated_metrics(self, month: Optional[str] = None) -> Dict:
-        """Get aggregated metrics from field reports"""
-        reports = self.get_field_reports(month=month)
-        
-        if not reports:
-            return {}
+    def _query_field_reports(self, month: Optional[str], region: Optional[str]) -> List[Dict]:
+        """Read and filter reports, raising on I/O errors"""
+        reports = json.loads(REPORTS_FILE.read_text())
         
-        # Calculate averages
-        call_volumes = [r['call_volume'] for r in reports if 'call_volume' in r]
-        lead_times = [r['parts_lead_time'] for r in reports if 'parts_lead_time' in r]
-        sentiments = [r['business_sentiment'] for r in reports if 'business_sentiment' in r]
-        difficulties = [
-            r['hiring_difficulty'] for r in reports 
-            if r.get('hiring_difficulty') is not None
-        ]
+        if month:
+            reports = [r for r in reports if r.get('month') == month]
+        if region:
+            reports = [r for r in reports if r.get('region') == region]
         
-        return {
-            'call_volume_sentiment_avg': sum(call_volumes) / len(call_volumes) if call_volumes else 3.0,
-            'parts_lead_time_avg': sum(lead_times) / len(lead_times) if lead_times else 7.0,
-            'business_sentiment_avg': sum(sentiments) / len(sentiments) if sentiments else 3.0,
-            'hiring_difficulty_avg': sum(difficulties) / len(difficulties) if difficulties else 3.0,
-            'report_count': len(reports)
-        }
+        return reports
+    
+    def get_report_count(
+        self,
+        month: Optional[str] = None,
+        region: Optional[str] = None
+    ) -> int:
+        """Get count of reports (cached process-wide)"""
+        try:
+            return _cached_aggregate(
+                _count_cache,
+                (month, region),
+                lambda: len(self._query_field_reports(month, region))
+            )
+        except Exception:
+            return 0
+    
+    def get_aggregated_metrics(
+        self,
+        month: Optional[str] = None,
+        region: Optional[str] = None
+    ) -> Dict:
+        """Get aggregated metrics from field reports (cached process-wide)"""
+        try:
+            return dict(_cached_aggregate(
+                _metrics_cache,
+                (month, region),
+                lambda: aggregate_reports(self._query_field_reports(month, region))
+            ))
+        except Exception:
+            return {}
     
     def cache_indicator(self, key: str, value: float, timestamp: str):
         """Cache an indicator value"""
         try:
-            cache = json.loads(CACHE_FILE.read_text())
-            cache[key] = {'value': value, 'timestamp': timestamp}
-            CACHE_FILE.write_text(json.dumps(cache, indent=2))
+            with self._write_lock:
+                cache = json.loads(CACHE_FILE.read_text())
+                cache[key] = {'value': value, 'timestamp': timestamp}
+                CACHE_FILE.write_text(json.dumps(cache, indent=2))
         except Exception as e:
             print(f"Error caching indicator: {e}")
     
@@ -115,6 +322,35 @@ class LocalStorage:
             return cache.get(key)
         except Exception:
             return None
+    
+    def get_index_snapshots(self) -> List[Dict]:
+        """Get all monthly index snapshots, oldest first"""
+        try:
+            return _cached_snapshots(lambda: json.loads(SNAPSHOTS_FILE.read_text()))
+        except Exception:
+            return []
+    
+    def get_data_stamp(self) -> Optional[str]:
+        """Modification times of the report and snapshot files, shared by every local process"""
+        try:
+            return f"{REPORTS_FILE.stat().st_mtime_ns}:{SNAPSHOTS_FILE.stat().st_mtime_ns}"
+        except OSError:
+            return None
+    
+    def upsert_index_snapshots(self, snapshots: List[Dict]) -> bool:
+        """Insert or replace monthly index snapshots, keyed on month"""
+        try:
+            with self._write_lock:
+                by_month = {s['month']: s for s in json.loads(SNAPSHOTS_FILE.read_text())}
+                for snapshot in snapshots:
+                    by_month[snapshot['month']] = snapshot
+                rows = [by_month[month] for month in sorted(by_month)]
+                SNAPSHOTS_FILE.write_text(json.dumps(rows, indent=2))
+            _snapshot_cache.invalidate()
+            return True
+        except Exception as e:
+            print(f"Error saving snapshots: {e}")
+            return False
 
 
 class SupabaseStorage:
@@ -136,8 +372,10 @@ class SupabaseStorage:
         if not self.client:
             return False
         
+        report = _with_id(report)
         try:
             self.client.table('field_reports').insert(report).execute()
+            _on_report_saved(report)
             return True
         except Exception as e:
             print(f"Supabase save error: {e}")
@@ -153,70 +391,153 @@ class SupabaseStorage:
             return []
         
         try:
-            query = self.client.table('field_reports').select('*')
-            
-            if month:
-                query = query.gte('timestamp', f'{month}-01').lt('timestamp', f'{month}-32')
-            if region:
-                query = query.eq('region', region)
-            
-            result = query.execute()
-            return result.data or []
+            return self._query_field_reports(month, region)
         except Exception as e:
             print(f"Supabase query error: {e}")
             return []
     
-    def get_report_count(self, month: Optional[str] = None) -> int:
-        """Get count of reports from Supabase"""
+    def _query_field_reports(self, month: Optional[str], region: Optional[str]) -> List[Dict]:
+        """Run the field report query, raising on errors"""
+        query = self.client.table('field_reports').select('*')
+        
+        # Filter on the indexed month column (see idx_field_reports_month_region)
+        if month:
+            query = query.eq('month', month)
+        if region:
+            query = query.eq('region', region)
+        
+        result = query.execute()
+        return result.data or []
+    
+    def get_report_count(
+        self,
+        month: Optional[str] = None,
+        region: Optional[str] = None
+    ) -> int:
+        """
+        Get count of reports from Supabase.
+        
+        Uses a HEAD request so no rows are transferred. Month/region scoped
+        counts are exact index lookups; the unfiltered total uses the
+        planner estimate instead of a full table scan.
+        """
         if not self.client:
             return 0
         
         try:
-            query = self.client.table('field_reports').select('id', count='exact')
-            if month:
-                query = query.gte('timestamp', f'{month}-01').lt('timestamp', f'{month}-32')
-            result = query.execute()
-            return result.count or 0
-        except Exception:
+            return _cached_aggregate(
+                _count_cache,
+                (month, region),
+                lambda: self._query_report_count(month, region)
+            )
+        except Exception as e:
+            print(f"Supabase count error: {e}")
             return 0
     
-    def get_aggregated_metrics(self, month: Optional[str] = None) -> Dict:
-        """Get aggregated metrics from Supabase"""
-        # For now, fall back to fetching all and aggregating client-side
-        # Could optimize with database aggregation functions
-        reports = self.get_field_reports(month=month)
+    def _query_report_count(self, month: Optional[str], region: Optional[str]) -> int:
+        """Run the HEAD count query, raising on errors"""
+        count_mode = 'exact' if (month or region) else 'estimated'
+        query = self.client.table('field_reports').select('id', count=count_mode, head=True)
+        if month:
+            query = query.eq('month', month)
+        if region:
+            query = query.eq('region', region)
+        result = query.execute()
+        return result.count or 0
+    
+    def get_aggregated_metrics(
+        self,
+        month: Optional[str] = None,
+        region: Optional[str] = None
+    ) -> Dict:
+        """Get aggregated metrics from Supabase (cached process-wide)"""
+        if not self.client:
+            return {}
         
-        if not reports:
+        # For now, fetch matching rows and aggregate client-side; the shared
+        # cache means this runs once per (month, region) per data change
+        try:
+            return dict(_cached_aggregate(
+                _metrics_cache,
+                (month, region),
+                lambda: aggregate_reports(self._query_field_reports(month, region))
+            ))
+        except Exception as e:
+            print(f"Supabase query error: {e}")
             return {}
+    
+    def get_index_snapshots(self) -> List[Dict]:
+        """Get all monthly index snapshots from Supabase, oldest first"""
+        if not self.client:
+            return []
         
-        call_volumes = [r['call_volume'] for r in reports if 'call_volume' in r]
-        lead_times = [r['parts_lead_time'] for r in reports if 'parts_lead_time' in r]
-        sentiments = [r['business_sentiment'] for r in reports if 'business_sentiment' in r]
-        difficulties = [
-            r['hiring_difficulty'] for r in reports 
-            if r.get('hiring_difficulty') is not None
-        ]
+        try:
+            return _cached_snapshots(
+                lambda: self.client.table('index_snapshots').select('*').order('month').execute().data or []
+            )
+        except Exception as e:
+            print(f"Supabase snapshot query error: {e}")
+            return []
+    
+    def get_data_stamp(self) -> Optional[str]:
+        """
+        Latest report insert and snapshot write times, shared by every
+        process. Two single-row index scans (see idx_field_reports_created_at
+        and idx_index_snapshots_updated_at).
+        """
+        if not self.client:
+            return None
         
-        return {
-            'call_volume_sentiment_avg': sum(call_volumes) / len(call_volumes) if call_volumes else 3.0,
-            'parts_lead_time_avg': sum(lead_times) / len(lead_times) if lead_times else 7.0,
-            'business_sentiment_avg': sum(sentiments) / len(sentiments) if sentiments else 3.0,
-            'hiring_difficulty_avg': sum(difficulties) / len(difficulties) if difficulties else 3.0,
-            'report_count': len(reports)
-        }
+        try:
+            report = (
+                self.client.table('field_reports').select('created_at')
+                .order('created_at', desc=True).limit(1).execute().data
+            )
+            snapshot = (
+                self.client.table('index_snapshots').select('updated_at')
+                .order('updated_at', desc=True).limit(1).execute().data
+            )
+        except Exception as e:
+            print(f"Supabase data stamp error: {e}")
+            return None
+        
+        report_at = report[0]['created_at'] if report else ''
+        snapshot_at = snapshot[0]['updated_at'] if snapshot else ''
+        return f"{report_at}:{snapshot_at}"
+    
+    def upsert_index_snapshots(self, snapshots: List[Dict]) -> bool:
+        """
+        Bulk insert or replace monthly index snapshots, keyed on month.
+        
+        Requires a SUPABASE_KEY with write access to index_snapshots
+        (the anon role can only read it).
+        """
+        if not self.client:
+            return False
+        
+        try:
+            # Stamp the write so other processes see the change
+            updated_at = datetime.now().astimezone().isoformat()
+            snapshots = [dict(snapshot, updated_at=updated_at) for snapshot in snapshots]
+            self.client.table('index_snapshots').upsert(snapshots, on_conflict='month').execute()
+            _snapshot_cache.invalidate()
+            return True
+        except Exception as e:
+            print(f"Supabase snapshot upsert error: {e}")
+            return False
 
 
 # Storage singleton
 _storage = None
+_storage_lock = threading.Lock()
 
 
 def get_storage():
     """Get the appropriate storage backend"""
     global _storage
     if _storage is None:
-        if USE_SUPABASE:
-            _storage = SupabaseStorage()
-        else:
-            _storage = LocalStorage()
+        with _storage_lock:
+            if _storage is None:
+                _storage = SupabaseStorage() if USE_SUPABASE else LocalStorage()
     return _storage
 
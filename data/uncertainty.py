@@ -0,0 +1,158 @@
+"""
+Index Uncertainty Engine
+Bootstrap confidence bands for the Breakdown Index from field report sampling
+"""
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from data.cache import LRUCache
+from data.index_calculator import calculate_breakdown_index_vectorized
+from data.metrics_assembler import FIELD_REPORT_DEFAULTS, FIELD_REPORT_KEYS
+from data.storage import get_data_version, get_storage
+
+
+N_RESAMPLES = 2000
+CONFIDENCE = 0.90
+
+# Raw field report column -> (index input key, default when unanswered)
+REPORT_COLUMNS = {
+    'call_volume': ('call_volume_sentiment', FIELD_REPORT_DEFAULTS['call_volume_sentiment_avg']),
+    'parts_lead_time': ('parts_lead_time', FIELD_REPORT_DEFAULTS['parts_lead_time_avg']),
+    'hiring_difficulty': ('hiring_difficulty', FIELD_REPORT_DEFAULTS['hiring_difficulty_avg']),
+    'business_sentiment': ('business_sentiment', FIELD_REPORT_DEFAULTS['business_sentiment_avg']),
+}
+
+# (data version, month, ranges) -> bootstrap result
+_band_cache = LRUCache(maxsize=16)
+
+
+def _report_matrix(month: str) -> np.ndarray:
+    """Field reports for a month as an (n_reports, n_questions) float matrix"""
+    reports = get_storage().get_field_reports(month=month)
+    return np.array(
+        [[np.nan if r.get(col) is None else float(r[col]) for col in REPORT_COLUMNS] for r in reports],
+        dtype=float,
+    ).reshape(len(reports), len(REPORT_COLUMNS))
+
+
+def bootstrap_field_component(
+    month: str,
+    ranges: Optional[Dict[str, Tuple[float, float]]] = None,
+    n_resamples: int = N_RESAMPLES,
+    seed: Optional[int] = 0
+) -> Optional[np.ndarray]:
+    """
+    Bootstrap the field report contribution to the index for one month.
+
+    All resamples are drawn as one (n_resamples, n_reports) index matrix,
+    so the whole bootstrap is a handful of NumPy operations.
+
+    Args:
+        month: Month (YYYY-MM)
+        ranges: Normalization range overrides
+        n_resamples: Number of bootstrap resamples
+        seed: RNG seed; fixed by default so reruns show a stable band
+
+    Returns:
+        Array of n_resamples field-component scores, or None with fewer
+        than two reports
+    """
+    matrix = _report_matrix(month)
+    n = len(matrix)
+    if n < 2:
+        return None
+
+    rng = np.random.default_rng(seed)
+    samples = matrix[rng.integers(0, n, size=(n_resamples, n))]  # (B, n, q)
+
+    answered = ~np.isnan(samples)
+    counts = answered.sum(axis=1)
+    sums = np.where(answered, samples, 0.0).sum(axis=1)
+
+    inputs = {}
+    for i, (index_key, default) in enumerate(REPORT_COLUMNS.values()):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = sums[:, i] / counts[:, i]
+        inputs[index_key] = np.where(counts[:, i] > 0, means, default)
+
+    return calculate_breakdown_index_vectorized(inputs, ranges)
+
+
+def _field_point(metrics: Dict, ranges: Optional[Dict]) -> float:
+    """Field report contribution at the point estimate"""
+    inputs = {key: metrics[key] for key in FIELD_REPORT_KEYS.values() if key in metrics}
+    return float(calculate_breakdown_index_vectorized(inputs, ranges))
+
+
+def _previous_month(month: str) -> str:
+    first = datetime.strptime(f'{month}-01', '%Y-%m-%d')
+    return (first - timedelta(days=1)).strftime('%Y-%m')
+
+
+def get_index_band(
+    score: float,
+    change: float,
+    metrics: Dict,
+    ranges: Optional[Dict[str, Tuple[float, float]]] = None,
+    confidence: float = CONFIDENCE
+) -> Optional[Dict]:
+    """
+    Confidence band for the index score and its month-over-month change.
+
+    The FRED and industry components are treated as fixed; only the field
+    report component is resampled, so the band is centered on score and
+    widened by the sampling spread of this month's (and, for the change,
+    last month's) reports.
+
+    Args:
+        score: Current index score
+        change: Current month-over-month change
+        metrics: Assembled metrics the score was computed from
+        ranges: Normalization ranges the score was computed with
+        confidence: Two-sided confidence level
+
+    Returns:
+        Dict with 'score_low', 'score_high', 'change_low', 'change_high',
+        'confidence' and 'report_count', or None without enough reports
+    """
+    month = metrics.get('month') or datetime.now().strftime('%Y-%m')
+    key = (get_data_version(), month, tuple(sorted((ranges or {}).items())), confidence)
+
+    def compute() -> Optional[Dict]:
+        current = bootstrap_field_component(month, ranges)
+        if current is None:
+            return None
+        previous = bootstrap_field_component(_previous_month(month), ranges, seed=1)
+
+        tail = (1 - confidence) / 2 * 100
+        offsets = current - _field_point(metrics, ranges)
+        score_low, score_high = np.percentile(offsets, [tail, 100 - tail])
+
+        if previous is None:
+            change_low, change_high = score_low, score_high
+        else:
+            diff = current - previous
+            change_low, change_high = np.percentile(diff - diff.mean(), [tail, 100 - tail])
+
+        return {
+            'score_low': float(score_low),
+            'score_high': float(score_high),
+            'change_low': float(change_low),
+            'change_high': float(change_high),
+            'confidence': confidence,
+            'report_count': int(metrics.get('report_count', 0)),
+        }
+
+    offsets = _band_cache.get_or_compute(key, compute)
+    if offsets is None:
+        return None
+
+    return dict(
+        offsets,
+        score_low=round(max(0.0, score + offsets['score_low']), 1),
+        score_high=round(min(100.0, score + offsets['score_high']), 1),
+        change_low=round(change + offsets['change_low'], 1),
+        change_high=round(change + offsets['change_high'], 1),
+    )
@@ -0,0 +1,272 @@
+"""
+Bitemporal Vintage Store
+FRED observations keyed by both observation date and real-time (publication)
+period, for "as published on" reconstructions of the index
+
+Each series is one memory-mapped .npy file of (day, realtime_start,
+realtime_end, value) records sorted by (day, realtime_start). For a given
+observation the real-time periods of its vintages don't overlap, so the
+vintage in effect on any date is found with one binary search.
+"""
+import os
+import tempfile
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from data.cache import LRUCache
+from data.fred_client import FRED_SERIES, get_fred_client
+from data.indicator_adapters import adapt_observations, monthly_values
+from data.monthly_index import build_inputs, score_months
+from data.range_engine import ranges_from_history
+from data.series_store import from_day, to_day
+from data.storage import DATA_DIR, aggregate_by_month, get_data_version, get_storage
+
+
+VINTAGE_DIR = DATA_DIR / "vintages"
+
+VINTAGE_DTYPE = np.dtype([
+    ('day', '<i4'),
+    ('realtime_start', '<i4'),
+    ('realtime_end', '<i4'),
+    ('value', '<f8'),
+])
+
+# (day, realtime_start) are packed into one sortable int64 search key;
+# the offset keeps ALFRED's 1776-07-04 sentinel non-negative
+_KEY_OFFSET = 1 << 20
+
+
+def _pack(day: np.ndarray, realtime_start) -> np.ndarray:
+    day = np.asarray(day, dtype=np.int64) + _KEY_OFFSET
+    return (day << 32) | (np.asarray(realtime_start, dtype=np.int64) + _KEY_OFFSET)
+
+
+class VintageSeries:
+    """Interval index over the vintages of one series"""
+
+    def __init__(self, records: np.ndarray):
+        self.records = records
+        self._keys = _pack(records['day'], records['realtime_start'])
+        self.days, self._first = np.unique(records['day'], return_index=True)
+
+    def _lookup(self, as_of_day: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Record index in effect on as_of_day per observation, and a validity mask"""
+        idx = np.searchsorted(self._keys, _pack(self.days, as_of_day), side='right') - 1
+        valid = idx >= self._first
+        valid &= self.records['realtime_end'][np.maximum(idx, 0)] >= as_of_day
+        return idx, valid
+
+    def as_of(self, as_of: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Observations as they were published on a date.
+
+        Args:
+            as_of: Real-time date (YYYY-MM-DD), default today
+
+        Returns:
+            (days, values) arrays of every observation known on that date
+        """
+        as_of_day = to_day(as_of or date.today().isoformat())
+        idx, valid = self._lookup(as_of_day)
+        return self.days[valid], self.records['value'][idx[valid]]
+
+    def first_release(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(days, values) of each observation's first published value"""
+        return self.days, self.records['value'][self._first]
+
+
+def write_vintages(series_id: str, observations: List[Dict], directory: Optional[Path] = None):
+    """
+    Write all vintages of a series atomically.
+
+    Args:
+        series_id: FRED series identifier
+        observations: Rows from FREDClient.get_series_vintages
+        directory: Destination directory, default VINTAGE_DIR
+    """
+    directory = directory or VINTAGE_DIR
+    records = np.empty(len(observations), dtype=VINTAGE_DTYPE)
+    records['day'] = [to_day(obs['date']) for obs in observations]
+    records['realtime_start'] = [to_day(obs['realtime_start']) for obs in observations]
+    records['realtime_end'] = [to_day(obs['realtime_end']) for obs in observations]
+    records['value'] = [obs['value'] for obs in observations]
+    records.sort(order=['day', 'realtime_start'])
+
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{series_id}.npy"
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=path.name, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, records)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+
+class VintageStore:
+    """Read-only view of the vintage files, re-mapped when a file is replaced"""
+
+    def __init__(self, directory: Optional[Path] = None):
+        self.directory = directory or VINTAGE_DIR
+        self._series: Dict[str, Tuple[Tuple[int, int], VintageSeries]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, series_id: str) -> Optional[VintageSeries]:
+        """Interval index for a series, or None if no vintages are stored"""
+        path = self.directory / f"{series_id}.npy"
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+
+        signature = (stat.st_ino, stat.st_mtime_ns)
+        with self._lock:
+            cached = self._series.get(series_id)
+            if cached and cached[0] == signature:
+                return cached[1]
+            series = VintageSeries(np.load(path, mmap_mode='r'))
+            self._series[series_id] = (signature, series)
+            return series
+
+    def signature(self) -> Tuple:
+        """Changes whenever any vintage file is rewritten"""
+        if not self.directory.exists():
+            return ()
+        return tuple(sorted(
+            (entry.name, entry.stat().st_mtime_ns) for entry in os.scandir(self.directory)
+            if entry.name.endswith('.npy')
+        ))
+
+
+_store: Optional[VintageStore] = None
+_store_lock = threading.Lock()
+
+
+def get_vintage_store() -> VintageStore:
+    """Get the process-wide vintage store reader"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = VintageStore()
+    return _store
+
+
+def refresh_vintages(series_ids: Optional[List[str]] = None) -> Dict[str, int]:
+    """
+    Download and store the full vintage history of FRED series.
+
+    Args:
+        series_ids: Series to refresh, default every FRED_SERIES entry
+
+    Returns:
+        Series ID -> number of vintage records written
+    """
+    client = get_fred_client()
+    written = {}
+    for series_id in series_ids or FRED_SERIES.values():
+        observations = client.get_series_vintages(series_id)
+        if observations:
+            write_vintages(series_id, observations)
+            written[series_id] = len(observations)
+    return written
+
+
+def get_observations_as_of(series_id: str, as_of: Optional[str] = None) -> Optional[List[Dict]]:
+    """
+    Observations of a series as published on a date.
+
+    Args:
+        series_id: FRED series identifier
+        as_of: Real-time date (YYYY-MM-DD), default today (latest revisions)
+
+    Returns:
+        List of {'date', 'value'} dicts, or None if no vintages are stored
+    """
+    series = get_vintage_store().get(series_id)
+    if series is None:
+        return None
+    days, values = series.as_of(as_of)
+    return [
+        {'date': from_day(day), 'value': float(value)}
+        for day, value in zip(days.tolist(), values.tolist())
+    ]
+
+
+# (month, as_of, data version, vintage files) -> index row
+_index_cache = LRUCache(maxsize=128)
+
+
+def _field_as_of(as_of: Optional[str]) -> Dict[str, Dict]:
+    """Field report aggregates per month from reports submitted by as_of"""
+    return aggregate_by_month([
+        report for report in get_storage().get_field_reports()
+        if not (as_of and report.get('created_at') and report['created_at'][:10] > as_of)
+    ])
+
+
+def get_index_as_of(month: str, as_of: Optional[str] = None) -> Optional[Dict]:
+    """
+    Reconstruct a month's index from the data available on a date.
+
+    With as_of set this is the index "as published" then; with as_of
+    omitted it is the same month scored on today's revised data. The
+    normalization ranges are rebuilt from the same vintages and reports,
+    so a past month is scored against the ranges its data implied then,
+    not today's.
+    Only stored vintages are read, nothing is downloaded.
+
+    Args:
+        month: Index month (YYYY-MM)
+        as_of: Real-time date (YYYY-MM-DD), default today
+
+    Returns:
+        Row with 'month', 'score', component scores, 'report_count' and
+        'metrics' (see backfill.score_months), or None if no vintages are
+        stored for any FRED series
+    """
+    store = get_vintage_store()
+    key = (month, as_of, get_data_version(), store.signature())
+
+    def compute() -> Optional[Dict]:
+        history = {}
+        for name, series_id in FRED_SERIES.items():
+            observations = get_observations_as_of(series_id, as_of)
+            if observations:
+                history[name] = adapt_observations(name, observations)
+        if not history:
+            return None
+
+        field = _field_as_of(as_of)
+        fred = {name: monthly_values(observations) for name, observations in history.items()}
+        inputs = build_inputs(fred, field, month, month)
+        if inputs.empty:
+            return None
+        return score_months(inputs, ranges_from_history(history, field))[0]
+
+    return _index_cache.get_or_compute(key, compute)
+
+
+def get_index_revision(month: str, as_of: str) -> Optional[Dict]:
+    """
+    Compare a month's index as published on as_of with today's revised data.
+
+    Returns:
+        Dict with 'month', 'published', 'revised' and 'revision' (revised
+        minus published), or None if either can't be reconstructed
+    """
+    published = get_index_as_of(month, as_of)
+    revised = get_index_as_of(month)
+    if published is None or revised is None:
+        return None
+    return {
+        'month': month,
+        'published': published['score'],
+        'revised': revised['score'],
+        'revision': round(revised['score'] - published['score'], 1),
+    }
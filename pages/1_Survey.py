@@ -4,7 +4,7 @@ Anonymous monthly survey for servicers to contribute real-world data
 """
 import streamlit as st
 from datetime import datetime
-from data.storage import get_storage
+from data.storage import REGIONS, get_storage
 
 st.set_page_config(
     page_title="Submit Field Report | Break-down Breakdown",
@@ -113,15 +113,7 @@ with st.form("field_report"):
     st.markdown("### Your Region")
     region = st.selectbox(
         "Where are you located?",
-        options=[
-            "Northeast",
-            "Southeast",
-            "Midwest",
-            "Southwest",
-            "West Coast",
-            "Mountain West",
-            "Canada"
-        ],
+        options=REGIONS,
         key="q6"
     )
     
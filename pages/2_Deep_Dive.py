@@ -3,8 +3,19 @@ Deep Dive Page
 Detailed breakdown of all indicators contributing to the index
 """
 import streamlit as st
+import numpy as np
 import plotly.graph_objects as go
-from data.fred_client import get_fred_client, FRED_SERIES
+from datetime import datetime
+from typing import Optional
+from components.history_chart import render_history_chart
+from data.deep_dive import load_deep_dive
+from data.fred_client import FRED_SERIES
+from data.regional_index import get_regional_matrix, MIN_REGIONAL_RESPONSES
+from data.rollup_cube import MIN_CELL_RESPONSES
+from data.sketches import get_quantiles
+from data.index_calculator import calculate_breakdown_index, NORMALIZATION_RANGES
+from data.range_engine import get_normalization_ranges
+from data.scenario_engine import evaluate_scenarios, sweep, tornado
 
 st.set_page_config(
     page_title="Deep Dive | Break-down Breakdown",
@@ -26,10 +37,34 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# Tabs for sections
-tab1, tab2, tab3 = st.tabs(["Economic Indicators", "Industry Metrics", "Field Reports"])
+# One batched load feeds every section
+data = load_deep_dive()
+indicators = data['indicators']
 
-with tab1:
+
+def format_period(period: str) -> str:
+    """'2025-11-20' -> 'Nov 20', '2025-11' -> 'Nov 2025'"""
+    if len(period) == 7:
+        return datetime.strptime(period, '%Y-%m').strftime('%b %Y')
+    return datetime.strptime(period, '%Y-%m-%d').strftime('%b %d')
+
+
+def indicator_metric(name: str, label: str, fmt: str, delta_fmt: str, delta_color: str = "normal"):
+    """st.metric for an indicator, with its change since the previous reading"""
+    change = indicators.get(name)
+    if change is None:
+        st.metric(label=label, value="—")
+        return
+    
+    delta = None
+    if change['delta'] is not None:
+        delta = delta_fmt.format(change['delta'])
+        if change['previous_date']:
+            delta += f" since {format_period(change['previous_date'])}"
+    st.metric(label=label, value=fmt.format(change['value']), delta=delta, delta_color=delta_color)
+
+
+def render_economic_indicators():
     st.markdown("## Economic Indicators")
     st.markdown("*Data from Federal Reserve Economic Data (FRED)*")
     
@@ -37,23 +72,14 @@ with tab1:
     
     with col1:
         st.markdown("### Consumer Confidence")
-        st.metric(
-            label="U of Michigan Consumer Sentiment",
-            value="68.5",
-            delta="-2.1 from last month"
-        )
+        indicator_metric('consumer_confidence', "U of Michigan Consumer Sentiment", "{:.1f}", "{:+.1f}")
         st.caption("""
         **What it means:** Consumer confidence affects spending decisions. 
         When confidence is lower, people repair instead of replace.
         """)
         
         st.markdown("### 30-Year Mortgage Rate")
-        st.metric(
-            label="Weekly Average",
-            value="6.8%",
-            delta="+0.2%",
-            delta_color="inverse"
-        )
+        indicator_metric('mortgage_rate', "Weekly Average", "{:.2f}%", "{:+.2f}%", delta_color="inverse")
         st.caption("""
         **What it means:** Higher rates = less home turnover = more repairs. 
         People stay put and maintain what they have.
@@ -61,126 +87,267 @@ with tab1:
     
     with col2:
         st.markdown("### Existing Home Sales")
-        st.metric(
-            label="Annual Rate (Millions)",
-            value="4.1M",
-            delta="-0.3M from last month"
-        )
+        indicator_metric('existing_home_sales', "Annual Rate (Millions)", "{:.2f}M", "{:+.2f}M")
         st.caption("""
         **What it means:** Low turnover is good for repair. 
         New homeowners often replace; long-term owners repair.
         """)
         
         st.markdown("### Major Appliance CPI")
-        st.metric(
-            label="Price Index",
-            value="108.5",
-            delta="+1.2"
-        )
+        indicator_metric('appliance_cpi', "Price Index", "{:.1f}", "{:+.1f}")
         st.caption("""
         **What it means:** Rising new appliance prices make repair more attractive. 
         Consumers do the math.
         """)
+    
+    indicator_history()
 
-with tab2:
+
+@st.fragment
+def indicator_history():
+    """Full-history chart; changing indicator or range reruns only this panel"""
+    st.markdown("### Full History")
+    name = st.selectbox(
+        "Indicator",
+        options=list(FRED_SERIES),
+        format_func=lambda key: key.replace('_', ' ').title(),
+        key="history_indicator",
+    )
+    render_history_chart(name, FRED_SERIES[name], name.replace('_', ' ').title(), key="history_chart")
+
+
+def render_industry_metrics():
     st.markdown("## Industry-Specific Metrics")
     
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown("### Appliance Shipments")
-        st.metric(
-            label="AHAM Monthly (Millions)",
-            value="8.2M",
-            delta="-0.5M"
-        )
+        indicator_metric('appliance_shipments', "AHAM Monthly (Millions)", "{:.1f}M", "{:+.1f}M")
         st.caption("""
         **What it means:** Lower shipments = less replacement activity = more repair demand.
         """)
         
         st.markdown("### Job Posting Volume")
-        st.metric(
-            label="Repair Tech Listings (Index)",
-            value="62",
-            delta="+8"
-        )
+        indicator_metric('job_posting_volume', "Repair Tech Listings (Index)", "{:.0f}", "{:+.0f}")
         st.caption("""
         **What it means:** More job postings = tighter labor market = harder to hire.
         """)
     
     with col2:
         st.markdown("### Tech Wage Growth")
-        st.metric(
-            label="YoY Change",
-            value="+4.5%",
-            delta="+0.5%"
-        )
+        indicator_metric('tech_wage_growth', "YoY Change", "{:+.1f}%", "{:+.1f}%")
         st.caption("""
         **What it means:** Wage pressure indicates competition for talent.
         """)
         
         st.markdown("### Right to Repair Progress")
-        st.info("🔧 **2 states** passed R2R legislation this year")
+        r2r_laws = data['metrics'].get('r2r_laws_passed_this_year', 0)
+        st.info(f"🔧 **{r2r_laws} state{'' if r2r_laws == 1 else 's'}** passed R2R legislation this year")
         st.caption("""
         **What it means:** Expanding access to parts, manuals, and diagnostic tools.
         """)
 
-with tab3:
+
+def render_field_reports():
     st.markdown("## Field Report Data")
     st.markdown("*Crowd-sourced from working servicers like you*")
     
-    st.info("📊 **Based on 147 field reports this month**")
+    this_month = data['month']
+    current = data['field']['current']
+    previous = data['field']['previous']
+    
+    def field_delta(question: str) -> Optional[str]:
+        """Change in a question's average from last month, if both are shown"""
+        if current['suppressed'] or previous['suppressed']:
+            return None
+        if question not in current['means'] or question not in previous['means']:
+            return None
+        return f"{current['means'][question] - previous['means'][question]:+.1f}"
+    
+    st.info(f"📊 **Based on {current['count']} field reports this month**")
+    
+    if current['suppressed'] and current['count'] < MIN_CELL_RESPONSES:
+        st.caption(f"Averages are shown once at least {MIN_CELL_RESPONSES} reports are in for the month.")
+    elif current['suppressed']:
+        st.caption("Averages are withheld this month so smaller months' answers can't be worked out from the totals.")
+    else:
+        means = current['means']
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("### Call Volume Sentiment")
+            
+            fig = go.Figure(go.Bar(
+                x=['Down a lot', 'Down some', 'Same', 'Up some', 'Up a lot'],
+                y=current['histograms']['call_volume'],
+                marker_color=['#B7410E', '#CC5500', '#DAA520', '#8FBC8F', '#6B8E23']
+            ))
+            fig.update_layout(
+                height=200,
+                margin=dict(l=20, r=20, t=20, b=40),
+                paper_bgcolor='rgba(0,0,0,0)',
+                plot_bgcolor='rgba(0,0,0,0)',
+            )
+            st.plotly_chart(fig, use_container_width=True)
+            
+            st.metric(
+                label="Average Score",
+                value=f"{means['call_volume']:.1f} / 5",
+                delta=field_delta('call_volume')
+            )
+            
+            st.markdown("### Hiring Difficulty")
+            if 'hiring_difficulty' in means:
+                st.metric(
+                    label="Average Score (1=Easy, 5=Impossible)",
+                    value=f"{means['hiring_difficulty']:.1f}",
+                    delta=field_delta('hiring_difficulty'),
+                    delta_color="inverse"
+                )
+            else:
+                st.caption("No one reported hiring this month.")
+        
+        with col2:
+            st.markdown("### Parts Lead Time")
+            st.metric(
+                label="Average Days",
+                value=f"{means['parts_lead_time']:.1f}",
+                delta=field_delta('parts_lead_time'),
+                delta_color="inverse"
+            )
+            lead_time_share = min(means['parts_lead_time'] / 30, 1.0)
+            st.progress(lead_time_share, text="Normal range is 1-30 days")
+            lead_time_quantiles = get_quantiles('parts_lead_time', months=[this_month])
+            if lead_time_quantiles:
+                st.caption(
+                    f"Median {lead_time_quantiles[0.5]} days · "
+                    f"90% of parts arrive within {lead_time_quantiles[0.9]} days"
+                )
+            
+            st.markdown("### Business Sentiment")
+            st.metric(
+                label="Average Score (1=Brutal, 5=Excellent)",
+                value=f"{means['business_sentiment']:.1f}",
+                delta=field_delta('business_sentiment')
+            )
+    
+    st.markdown("### Regional Breakdown Index")
+    regional = get_regional_matrix()
+    if regional.empty:
+        st.caption("No regional data yet.")
+    else:
+        st.dataframe(
+            regional.sort_index(ascending=False).head(6),
+            use_container_width=True,
+        )
+        st.caption(f"Regions with fewer than {MIN_REGIONAL_RESPONSES} reports in a month are hidden for privacy.")
+
+
+# Indicator -> (slider label, min change, max change, step)
+SCENARIO_SLIDERS = {
+    'mortgage_rate': ("30-Year Mortgage Rate change (points)", -3.0, 3.0, 0.25),
+    'consumer_confidence': ("Consumer Sentiment change", -20.0, 20.0, 1.0),
+    'existing_home_sales': ("Existing Home Sales change (millions)", -1.5, 1.5, 0.1),
+    'appliance_cpi': ("Appliance CPI change", -15.0, 15.0, 1.0),
+}
+
+
+def render_what_if():
+    st.markdown("## What If?")
+    st.markdown("*Move an indicator and see how the index responds*")
+    
+    base = data['metrics']
+    ranges = get_normalization_ranges()
+    base_score = calculate_breakdown_index(base, ranges)
     
     col1, col2 = st.columns(2)
     
     with col1:
-        st.markdown("### Call Volume Sentiment")
-        
-        # Mock distribution chart
-        fig = go.Figure(go.Bar(
-            x=['Down a lot', 'Down some', 'Same', 'Up some', 'Up a lot'],
-            y=[8, 22, 45, 67, 12],
-            marker_color=['#B7410E', '#CC5500', '#DAA520', '#8FBC8F', '#6B8E23']
+        st.markdown("### Scenario")
+        # Only indicators with a current value can be moved
+        deltas = {
+            key: st.slider(label, low, high, 0.0, step)
+            for key, (label, low, high, step) in SCENARIO_SLIDERS.items()
+            if key in base
+        }
+        scenario_score = float(evaluate_scenarios(base, deltas, ranges))
+        st.metric(
+            label="Scenario Index",
+            value=f"{scenario_score:.1f}",
+            delta=f"{scenario_score - base_score:+.1f} vs today"
+        )
+    
+    with col2:
+        st.markdown("### What Moves the Needle")
+        sensitivities = tornado(base, ranges=ranges)[:8]
+        fig = go.Figure()
+        labels = [s['indicator'].replace('_', ' ').title() for s in sensitivities]
+        fig.add_trace(go.Bar(
+            y=labels,
+            x=[s['low_score'] - base_score for s in sensitivities],
+            orientation='h',
+            name='Down',
+            marker_color='#CC5500'
+        ))
+        fig.add_trace(go.Bar(
+            y=labels,
+            x=[s['high_score'] - base_score for s in sensitivities],
+            orientation='h',
+            name='Up',
+            marker_color='#6B8E23'
         ))
         fig.update_layout(
-            height=200,
+            barmode='overlay',
+            height=300,
             margin=dict(l=20, r=20, t=20, b=40),
             paper_bgcolor='rgba(0,0,0,0)',
             plot_bgcolor='rgba(0,0,0,0)',
+            yaxis=dict(autorange='reversed'),
         )
         st.plotly_chart(fig, use_container_width=True)
-        
-        st.metric(
-            label="Average Score",
-            value="3.4 / 5",
-            delta="Stable demand"
-        )
-        
-        st.markdown("### Hiring Difficulty")
-        st.metric(
-            label="Average Score (1=Easy, 5=Impossible)",
-            value="3.8",
-            delta="+0.3",
-            delta_color="inverse"
-        )
-        st.caption("Getting harder to find qualified techs.")
+        st.caption("Index change when each indicator moves 10% of its historical range.")
     
-    with col2:
-        st.markdown("### Parts Lead Time")
-        st.metric(
-            label="Average Days",
-            value="8.5",
-            delta="-1.2"
-        )
-        st.progress(0.28, text="Within normal range (1-30 days)")
-        
-        st.markdown("### Business Sentiment")
-        st.metric(
-            label="Average Score (1=Brutal, 5=Excellent)",
-            value="3.2",
-            delta="+0.1"
-        )
-        st.caption("Most servicers report 'okay' to 'good' conditions.")
+    st.markdown("### Sweep One Indicator")
+    indicator = st.selectbox(
+        "Indicator",
+        options=[key for key in NORMALIZATION_RANGES if key in base],
+        format_func=lambda key: key.replace('_', ' ').title()
+    )
+    low, high = ranges.get(indicator, NORMALIZATION_RANGES[indicator][:2])
+    values = np.linspace(low, high, 200)
+    fig = go.Figure(go.Scatter(
+        x=values,
+        y=sweep(base, indicator, values, ranges),
+        mode='lines',
+        line=dict(color='#8B0000', width=2)
+    ))
+    fig.add_vline(x=base[indicator], line_dash='dot', line_color='#4A4A4A')
+    fig.update_layout(
+        height=250,
+        margin=dict(l=20, r=20, t=20, b=40),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        yaxis=dict(range=[0, 100], title='Index'),
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+
+# Only the open section is computed; hidden st.tabs bodies would all run
+SECTIONS = {
+    "Economic Indicators": render_economic_indicators,
+    "Industry Metrics": render_industry_metrics,
+    "Field Reports": render_field_reports,
+    "What If?": render_what_if,
+}
+section = st.radio(
+    "Section",
+    options=list(SECTIONS),
+    horizontal=True,
+    label_visibility="collapsed",
+    key="deep_dive_section",
+)
+SECTIONS[section]()
 
 st.divider()
 
@@ -0,0 +1,272 @@
+"""
+Static Dashboard Export
+Renders the dashboard (gauge, sparkline, error codes, news, footer) to
+static HTML, JSON and SVG files that any static host or CDN can serve,
+leaving Streamlit for interactive pages like the Survey
+
+Usage:
+    python static_export.py [--out DIR] [--force]
+
+Exports are skipped when the rendered data hasn't changed, so this is
+cheap to run on a schedule, and a schedule is the supported way to keep
+the export fresh, e.g. every 15 minutes from cron:
+
+    */15 * * * * cd /path/to/app && python static_export.py
+
+As a shortcut, the dashboard calls enable_auto_export() at startup so
+its server process re-exports once saved field reports settle, and the
+backfill CLI exports after writing snapshots. Reports saved by other
+processes or replicas only reach the export through the schedule.
+"""
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+from html import escape
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from components.appliance_icons import appliance_strip_html, header_with_icons_html
+from components.error_codes import error_code_html
+from components.gauge import get_zone_info, score_display_html
+from components.news_feed import NEWS_HEADER_HTML, get_news_items, news_card_html
+from components.survey import survey_cta_html
+from components.svg_charts import gauge_svg, sparkline_svg
+from data.error_code_engine import get_active_error_codes
+from data.index_calculator import get_current_index, get_index_history
+from data.metrics_assembler import get_current_metrics
+from data.storage import DATA_DIR, add_save_listener, get_secret
+
+
+EXPORT_DIR = Path(get_secret('STATIC_EXPORT_DIR') or DATA_DIR / "static")
+STYLESHEET = Path(__file__).parent / "styles" / "main.css"
+
+# Public URL of the Streamlit app, for links to interactive pages. The
+# static page is served from another host, so links must be absolute;
+# without the secret they point at Streamlit's default local address.
+DEFAULT_APP_URL = 'http://localhost:8501'
+APP_URL = (get_secret('APP_URL') or DEFAULT_APP_URL).rstrip('/')
+
+# Seconds without a new save before exporting, so a burst of reports
+# produces one export
+EXPORT_DELAY = 10.0
+# Longest an export waits behind a steady stream of saves
+EXPORT_MAX_DELAY = 60.0
+
+_timer: Optional[threading.Timer] = None
+# time.monotonic() of the first save the pending export covers
+_pending_since: Optional[float] = None
+_timer_lock = threading.Lock()
+_export_lock = threading.Lock()
+
+
+def build_snapshot() -> Dict:
+    """
+    Gather everything the static dashboard shows.
+
+    Returns:
+        JSON-serializable dict with 'index', 'history', 'error_codes',
+        'news' and 'report_count'
+    """
+    metrics = get_current_metrics()
+    current_index = get_current_index(metrics)
+    return {
+        'index': {
+            'score': float(current_index['score']),
+            'change': float(current_index['change']),
+            'date': current_index['date'],
+            'zone': current_index['zone'],
+            'band': current_index['band'],
+        },
+        'history': get_index_history(),
+        'error_codes': get_active_error_codes(metrics),
+        'news': get_news_items(),
+        'report_count': int(metrics['report_count']),
+    }
+
+
+def _write_atomic(path: Path, content: str):
+    """Write beside the target and rename, so readers never see a partial file"""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def render_html(snapshot: Dict, stylesheet: str) -> str:
+    """
+    Render the static dashboard page.
+
+    Args:
+        snapshot: Output of build_snapshot
+        stylesheet: Stylesheet file name, relative to the page
+
+    Returns:
+        Complete HTML document
+    """
+    index = snapshot['index']
+    zone = get_zone_info(index['score'])
+    codes_html = ''.join(error_code_html(code) for code in snapshot['error_codes'])
+    news_html = ''.join(news_card_html(item) for item in snapshot['news'])
+    survey_url = f"{APP_URL}/Survey"
+    generated = datetime.strptime(snapshot['generated_at'], '%Y-%m-%dT%H:%M:%S')
+
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>The Break-down Breakdown</title>
+<meta name="description" content="Breakdown Index {index['score']:.1f}: {escape(index['zone'])}">
+<link rel="stylesheet" href="{stylesheet}">
+</head>
+<body class="stApp static-dashboard">
+{header_with_icons_html()}
+<div class="static-columns">
+    <div>
+        <div class="gauge-svg">{gauge_svg(index['score'])}</div>
+        {score_display_html(zone, index['change'], index['band'])}
+        <div class="sparkline-container">{sparkline_svg(snapshot['history'])}</div>
+    </div>
+    <div>
+        <div class="error-codes-panel">
+            <div class="error-codes-title">Current Diagnostics</div>
+            {codes_html}
+        </div>
+        {survey_cta_html(survey_url)}
+    </div>
+</div>
+{appliance_strip_html()}
+{NEWS_HEADER_HTML}
+<div class="static-news-grid">{news_html}</div>
+<div class="footer">
+    <p>Based on data from <strong>{snapshot['report_count']}</strong> field reports this month</p>
+    <p class="last-updated">Last updated: {generated:%B %d, %Y}</p>
+</div>
+</body>
+</html>
+"""
+
+
+def export_snapshot(directory: Optional[Path] = None, force: bool = False) -> bool:
+    """
+    Export the dashboard if its data changed since the last export.
+
+    Writes a content-hashed stylesheet, gauge.svg, sparkline.svg,
+    dashboard.json and index.html. index.html is written last, so it never
+    references files that aren't there yet. Stylesheets older than the
+    previous export's are then removed; the previous one stays for pages
+    a CDN may still be serving.
+
+    Args:
+        directory: Output directory, default EXPORT_DIR
+        force: Export even if nothing changed
+
+    Returns:
+        True if files were written
+    """
+    directory = directory or EXPORT_DIR
+    with _export_lock:
+        snapshot = build_snapshot()
+        version = hashlib.sha1(
+            json.dumps(snapshot, sort_keys=True, default=str).encode('utf-8')
+        ).hexdigest()[:16]
+
+        manifest_path = directory / "dashboard.json"
+        try:
+            previous = json.loads(manifest_path.read_text())
+        except (OSError, ValueError):
+            previous = {}
+        if not force and previous.get('version') == version:
+            return False
+
+        directory.mkdir(parents=True, exist_ok=True)
+
+        css = STYLESHEET.read_text()
+        stylesheet = f"main.{hashlib.sha1(css.encode('utf-8')).hexdigest()[:12]}.css"
+        if not (directory / stylesheet).exists():
+            _write_atomic(directory / stylesheet, css)
+        snapshot = dict(
+            snapshot,
+            version=version,
+            stylesheet=stylesheet,
+            generated_at=datetime.now().isoformat(timespec='seconds'),
+        )
+
+        _write_atomic(directory / "gauge.svg", gauge_svg(snapshot['index']['score']))
+        _write_atomic(directory / "sparkline.svg", sparkline_svg(snapshot['history']))
+        _write_atomic(manifest_path, json.dumps(snapshot, indent=2, default=str))
+        _write_atomic(directory / "index.html", render_html(snapshot, stylesheet))
+
+        keep = {stylesheet, previous.get('stylesheet')}
+        for path in directory.glob("main.*.css"):
+            if path.name not in keep:
+                try:
+                    path.unlink()
+                except OSError as e:
+                    print(f"Error removing old stylesheet {path}: {e}")
+        return True
+
+
+def _export_in_background():
+    global _timer, _pending_since
+    with _timer_lock:
+        # A save may have rescheduled after this timer fired
+        if _timer is threading.current_thread():
+            _timer = None
+            _pending_since = None
+    try:
+        export_snapshot()
+    except Exception as e:
+        print(f"Error exporting static dashboard: {e}")
+
+
+def _schedule_export(report: Dict):
+    """
+    Save listener: export once no report has been saved for EXPORT_DELAY,
+    or EXPORT_MAX_DELAY after the first unexported save, whichever is first
+    """
+    global _timer, _pending_since
+    now = time.monotonic()
+    with _timer_lock:
+        if _timer is not None:
+            _timer.cancel()
+        if _pending_since is None:
+            _pending_since = now
+        delay = min(EXPORT_DELAY, _pending_since + EXPORT_MAX_DELAY - now)
+        _timer = threading.Timer(max(delay, 0.0), _export_in_background)
+        _timer.daemon = True
+        _timer.start()
+
+
+def enable_auto_export():
+    """
+    Re-export the static dashboard after field reports saved in this
+    process settle. Safe to call on every script run.
+    """
+    add_save_listener(_schedule_export)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Export the dashboard as static files")
+    parser.add_argument('--out', type=Path, default=EXPORT_DIR, help="Output directory")
+    parser.add_argument('--force', action='store_true', help="Export even if nothing changed")
+    args = parser.parse_args(argv)
+
+    if export_snapshot(args.out, force=args.force):
+        print(f"Exported dashboard to {args.out}")
+    else:
+        print("Dashboard unchanged; nothing exported")
+
+
+if __name__ == '__main__':
+    main()
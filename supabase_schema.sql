@@ -23,6 +23,12 @@ CREATE TABLE field_reports (
 CREATE INDEX idx_field_reports_month ON field_reports(month);
 CREATE INDEX idx_field_reports_region ON field_reports(region);
 
+-- Composite index for month + region scoped queries and counts
+CREATE INDEX idx_field_reports_month_region ON field_reports(month, region);
+
+-- Latest submission lookup for the dashboard's change polling
+CREATE INDEX idx_field_reports_created_at ON field_reports(created_at);
+
 -- Email Subscribers Table (stored separately from survey data)
 CREATE TABLE email_subscribers (
     id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
@@ -53,9 +59,14 @@ CREATE TABLE index_snapshots (
     report_count INTEGER,
     metrics JSONB,
     
-    created_at TIMESTAMPTZ DEFAULT NOW()
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    -- Set on every upsert so other processes can detect rewrites
+    updated_at TIMESTAMPTZ DEFAULT NOW()
 );
 
+-- Latest snapshot write lookup for the dashboard's change polling
+CREATE INDEX idx_index_snapshots_updated_at ON index_snapshots(updated_at);
+
 -- Row Level Security (RLS)
 -- Enable RLS on all tables
 ALTER TABLE field_reports ENABLE ROW LEVEL SECURITY;
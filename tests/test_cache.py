@@ -0,0 +1,33 @@
+"""
+A StripedCache result computed while an invalidate ran must be returned
+to its caller but never stored
+"""
+import threading
+
+from data.cache import StripedCache
+
+
+def test_result_computed_across_invalidate_is_not_stored():
+    cache = StripedCache(maxsize=8, stripes=2)
+    started = threading.Event()
+    release = threading.Event()
+    results = []
+
+    def slow_compute():
+        started.set()
+        release.wait(5)
+        return 'stale'
+
+    worker = threading.Thread(
+        target=lambda: results.append(cache.get_or_compute('key', slow_compute))
+    )
+    worker.start()
+    assert started.wait(5)
+    cache.invalidate()
+    release.set()
+    worker.join(5)
+
+    assert results == ['stale']
+    assert 'key' not in cache
+    assert cache.get_or_compute('key', lambda: 'fresh') == 'fresh'
+    assert cache.get('key') == 'fresh'
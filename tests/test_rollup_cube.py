@@ -0,0 +1,54 @@
+"""
+Rollup cube suppression must hide enough complementary cells that no
+suppressed cell can be recovered from its visible siblings and their total
+"""
+from data.rollup_cube import MIN_CELL_RESPONSES, RollupCube
+
+
+def _report(i: int, region: str, call_volume: int) -> dict:
+    return {
+        'id': f'{region}-{i}',
+        'month': '2025-12',
+        'region': region,
+        'company_size': 'small',
+        'trying_to_hire': False,
+        'call_volume': call_volume,
+    }
+
+
+def _build_cube() -> RollupCube:
+    cube = RollupCube()
+    # Only C is under the threshold on its own
+    for region, count, call_volume in (('A', 30, 5), ('B', 25, 3), ('C', 3, 1)):
+        for i in range(count):
+            cube.add(_report(i, region, call_volume))
+    return cube
+
+
+def test_single_small_sibling_hides_a_complement():
+    cube = _build_cube()
+    regions = cube.drill_down('region', month='2025-12')
+
+    assert regions['C']['suppressed']
+    assert regions['B']['suppressed']
+    assert not regions['A']['suppressed']
+    assert not cube.slice(month='2025-12')['suppressed']
+
+
+def test_suppressed_cell_cannot_be_recovered_from_total():
+    cube = _build_cube()
+    total = cube.slice(month='2025-12')
+    regions = cube.drill_down('region', month='2025-12')
+
+    hidden = [r for r in regions.values() if r['suppressed']]
+    visible = [r for r in regions.values() if not r['suppressed']]
+    assert len(hidden) >= 2
+    assert sum(r['count'] for r in hidden) >= MIN_CELL_RESPONSES
+
+    # The best subtraction can do is the mean of all hidden cells combined
+    residual_count = total['count'] - sum(r['count'] for r in visible)
+    residual_sum = total['means']['call_volume'] * total['count'] - sum(
+        r['means']['call_volume'] * r['count'] for r in visible
+    )
+    assert residual_count == sum(r['count'] for r in hidden)
+    assert abs(residual_sum / residual_count - 1) > 0.5